@@ -0,0 +1,98 @@
+"""Benchmark the command hot paths against seeded datasets.
+
+Usage: python -m benchmarks [--sizes 1000 100000 1000000] [--iterations 50]
+                            [--commands pom poms ...]
+
+The benchmarks drive the command coroutines directly through the mocks in
+`tests.helpers.mock_discord`, so no Discord connection is needed, but a MySQL
+server is. Like the unit tests, they run against the TEST_DATABASE from your
+.env file. EVERY ROW IN THAT DATABASE IS DELETED before each dataset is
+seeded, so point it at a throwaway schema.
+"""
+# Importing unittest makes `Secrets.MYSQL_DATABASE` select the TEST_DATABASE
+# and allows `Storage` to bulk-insert poms with many descriptions.
+import unittest  # pylint: disable=unused-import
+import argparse
+import asyncio
+import random
+from datetime import timedelta
+
+import pombot
+import pombot.commands.pom_wars
+from benchmarks import datasets
+from benchmarks.harness import REPORT_HEADER, Scenario, measure
+from pombot.config import Config, Debug
+from pombot.lib.pom_wars.scoreboard import Scoreboard
+from pombot.lib.storage import Storage
+from pombot.state import State
+from tests.helpers.mock_discord import MockBot, MockContext
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def _context(invoked_with: str) -> MockContext:
+    ctx = MockContext(author=datasets.benchmark_member())
+    ctx.invoked_with = invoked_with
+
+    return ctx
+
+
+async def _add_poms_to_session():
+    await Storage.add_poms_to_user_session(datasets.benchmark_member(), "bench", 3)
+
+
+def _scenarios() -> list:
+    commands = pombot.commands
+    war_commands = pombot.commands.pom_wars
+
+    return [
+        Scenario("pom",        lambda: commands.do_pom(_context("pom"), "bench")),
+        Scenario("poms",       lambda: commands.do_poms(_context("poms"))),
+        Scenario("bank",       lambda: commands.do_bank(_context("bank")),
+                 prepare=_add_poms_to_session),
+        Scenario("undo",       lambda: commands.do_undo(_context("undo")),
+                 prepare=_add_poms_to_session),
+        Scenario("total",      lambda: commands.do_total(_context("total"))),
+        Scenario("attack",     lambda: war_commands.do_attack(_context("attack"), "bench")),
+        Scenario("defend",     lambda: war_commands.do_defend(_context("defend"), "bench")),
+        Scenario("scoreboard", lambda: State.scoreboard.update()),
+    ]
+
+
+async def _main(sizes: list, iterations: int, commands: list):
+    Debug.disable()
+    # Measure the write itself rather than the wait for others to merge with.
+    Config.POM_COALESCE_WINDOW = timedelta(0)
+    State.scoreboard = Scoreboard(MockBot(), [])
+    scenarios = [s for s in _scenarios() if not commands or s.name in commands]
+
+    print(REPORT_HEADER)
+
+    for size in sizes:
+        await datasets.seed(size)
+        random.seed(size)
+
+        for scenario in scenarios:
+            result = await measure(scenario, size, iterations)
+            print(result.as_row(), flush=True)
+
+    await Storage.delete_all_rows_from_all_tables()
+
+
+def main():
+    """Parse arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark command hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Number of poms in each seeded dataset.")
+    parser.add_argument("--iterations", type=int, default=50,
+                        help="Number of timed runs per command and dataset.")
+    parser.add_argument("--commands", nargs="+", default=[],
+                        help="Only benchmark these commands.")
+    args = parser.parse_args()
+
+    asyncio.run(_main(args.sizes, args.iterations, args.commands))
+
+
+if __name__ == "__main__":
+    main()
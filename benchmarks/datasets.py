@@ -0,0 +1,121 @@
+import random
+from datetime import datetime, timedelta
+from itertools import islice
+
+from pombot.config import Config, Pomwars
+from pombot.lib.storage import Storage, _mysql_database_cursor
+from pombot.lib.types import ActionType
+from tests.helpers.mock_discord import MockMember, MockRole
+
+BENCHMARK_USER_ID = 1_000_000_001
+NUM_BACKGROUND_USERS = 49
+NUM_DESCRIPTIONS = 500
+DAYS_OF_HISTORY = 30
+CHUNK_SIZE = 10_000
+
+
+def benchmark_member() -> MockMember:
+    """Return a fresh Discord member for the benchmarked user.
+
+    A new mock is used for every invocation so that recorded calls don't
+    pile up and skew the allocation figures.
+    """
+    return MockMember(
+        id=BENCHMARK_USER_ID,
+        name="benchmark",
+        roles=[MockRole(name=Pomwars.KNIGHT_ROLE, position=2)],
+    )
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def _seed_poms(user: MockMember, num_poms: int, descripts: list):
+    """Give a user `num_poms` poms spread over the last month, with the
+    first half of them banked.
+    """
+    now = datetime.now()
+    banked, current = num_poms // 2, num_poms - num_poms // 2
+
+    for num_to_add, bank_afterwards in ((banked, True), (current, False)):
+        for chunk in _chunks(range(num_to_add), CHUNK_SIZE):
+            await Storage.add_poms_to_user_session(
+                user,
+                [random.choice(descripts) for _ in chunk],
+                1,
+                time_set=now - timedelta(days=random.randrange(DAYS_OF_HISTORY)),
+            )
+
+        if bank_afterwards:
+            await Storage.bank_user_session_poms(user)
+
+
+async def _seed_users_and_actions(num_actions: int):
+    users_query = f"""
+        INSERT INTO {Config.USERS_TABLE} (userID, timezone, team)
+        VALUES (%s, %s, %s);
+    """
+    actions_query = f"""
+        INSERT INTO {Config.ACTIONS_TABLE} (
+            userID, team, type, was_successful, was_critical, items_dropped,
+            damage, time_set
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+    """
+    teams = [Pomwars.KNIGHT_ROLE, Pomwars.VIKING_ROLE]
+    user_ids = [BENCHMARK_USER_ID + i for i in range(NUM_BACKGROUND_USERS + 1)]
+    now = datetime.now()
+
+    async with _mysql_database_cursor() as cursor:
+        await cursor.executemany(users_query, [
+            (user_id, "+0000", teams[i % 2]) for i, user_id in enumerate(user_ids)])
+
+    for chunk in _chunks(range(num_actions), CHUNK_SIZE):
+        rows = []
+
+        for _ in chunk:
+            user_index = random.randrange(len(user_ids))
+            rows.append((
+                user_ids[user_index],
+                teams[user_index % 2],
+                random.choice(list(ActionType)).value,
+                random.random() < 0.8,
+                random.random() < Pomwars.BASE_CHANCE_FOR_CRITICAL,
+                "",
+                random.choice([1000, 4000, 1350]),
+                now - timedelta(minutes=random.randrange(DAYS_OF_HISTORY * 24 * 60)),
+            ))
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.executemany(actions_query, rows)
+
+
+async def seed(num_poms: int):
+    """Empty the test database and fill it with roughly `num_poms` poms.
+
+    One tenth of the poms (and as many actions) belong to the benchmarked
+    user, the rest are shared among background users on both teams.
+    """
+    random.seed(num_poms)
+
+    await Storage.create_tables_if_not_exists()
+    await Storage.delete_all_rows_from_all_tables()
+
+    descripts = [f"description {n}" for n in range(NUM_DESCRIPTIONS)] + [None]
+    num_user_poms = num_poms // 10
+    num_background_poms = num_poms - num_user_poms
+
+    await _seed_poms(benchmark_member(), num_user_poms, descripts)
+
+    for offset in range(1, NUM_BACKGROUND_USERS + 1):
+        await _seed_poms(
+            MockMember(id=BENCHMARK_USER_ID + offset),
+            num_background_poms // NUM_BACKGROUND_USERS,
+            descripts,
+        )
+
+    await _seed_users_and_actions(num_poms // 10)
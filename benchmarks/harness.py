@@ -0,0 +1,96 @@
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+
+from pombot.lib.metrics import Metrics
+from tests.helpers.mock_discord import MockContext
+
+
+@dataclass
+class Scenario:
+    """A single command hot path to benchmark.
+
+    @param name Name shown in the report.
+    @param run Coroutine function which performs the measured work.
+    @param prepare Optional coroutine function run (unmeasured) before each
+        iteration, e.g. to give `!undo` something to undo.
+    """
+    name: str
+    run: Callable[[], Awaitable]
+    prepare: Optional[Callable[[], Awaitable]] = None
+
+
+@dataclass
+class Result:
+    """Measurements for one scenario against one dataset."""
+    name: str
+    dataset_size: int
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    allocations: List[int] = field(default_factory=list)
+
+    def percentile(self, pct: int) -> float:
+        """Return the `pct`th percentile latency in milliseconds."""
+        if len(self.latencies) < 2:
+            return (self.latencies or [0.0])[0] * 1000
+
+        cut_points = statistics.quantiles(self.latencies, n=100, method="inclusive")
+        return cut_points[pct - 1] * 1000
+
+    def as_row(self) -> str:
+        """Format this result as a line of the report table."""
+        return "{:<12} {:>9,} {:>10.2f} {:>10.2f} {:>10.2f} {:>8.1f} {:>12,.1f}".format(
+            self.name,
+            self.dataset_size,
+            self.percentile(50),
+            self.percentile(95),
+            self.percentile(99),
+            statistics.mean(self.queries or [0]),
+            statistics.mean(self.allocations or [0]) / 1024,
+        )
+
+
+REPORT_HEADER = "{:<12} {:>9} {:>10} {:>10} {:>10} {:>8} {:>12}".format(
+    "command", "poms", "p50 (ms)", "p95 (ms)", "p99 (ms)", "queries", "alloc (KiB)")
+
+
+async def measure(scenario: Scenario, dataset_size: int, iterations: int) -> Result:
+    """Run a scenario repeatedly and collect its latency, query count and
+    allocation figures.
+
+    Latency and allocations are measured in separate passes because tracing
+    allocations slows the interpreter down considerably.
+    """
+    result = Result(name=scenario.name, dataset_size=dataset_size)
+    ctx = MockContext()
+
+    for _ in range(iterations):
+        if scenario.prepare:
+            await scenario.prepare()
+
+        # Count the queries the same way the bot does in production.
+        async with Metrics.track_command(scenario.name, ctx) as stats:
+            start = time.perf_counter()
+            await scenario.run()
+            result.latencies.append(time.perf_counter() - start)
+
+        result.queries.append(stats.db_round_trips)
+
+    tracemalloc.start()
+
+    try:
+        for _ in range(max(1, iterations // 10)):
+            if scenario.prepare:
+                await scenario.prepare()
+
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await scenario.run()
+            _, peak = tracemalloc.get_traced_memory()
+            result.allocations.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return result
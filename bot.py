@@ -1,53 +1,76 @@
 import logging
+import multiprocessing
 import sys
+import threading
+import time
 from functools import partial
+from typing import List, Optional
 
 from discord.message import Message
-from discord.ext.commands import Bot
+from discord.ext.commands import AutoShardedBot, Bot
 
 from pombot import commands
 from pombot import handlers
-from pombot.config import Config, Pomwars, Secrets
+from pombot.config import Config, Debug, Pomwars, Secrets
+from pombot.lib.help_index import HelpIndex
+from pombot.lib.loop_monitor import LoopMonitor
+from pombot.lib.metrics import Metrics
+from pombot.lib.shards import ShardCoordinator, distribute_shards
 from pombot.lib.tiny_tools import BotCommand
 
 _log = logging.getLogger(__name__)
-bot = Bot(command_prefix=Config.PREFIX, case_insensitive=True)
 
 
-@bot.event
-async def on_message(message: Message):
-    """Global on_message handler.
+def create_bot(shard_ids: Optional[List[int]] = None, shard_count: Optional[int] = None) -> Bot:
+    """Create a bot with all commands and event handlers loaded.
 
-    This is a special event.
-
-    The handler for the "on_message" event must be a bot-decorated function
-    due to the special property that Discord.py applies wherein the default
-    handler for "on_message" is applied, even when `bot.add_listener` is
-    called before the default handler is created. This means that without
-    this special, bot-decorated handler, the default handler would still be
-    applied, causing the bot to bypass all the restrictions we lay out in
-    `handlers.on_message`.
+    @param shard_ids The shards to run in this process, or None to run a
+        single, unsharded bot.
+    @param shard_count The total number of shards across all processes.
     """
-    await handlers.on_message(bot, message)
-
-
-def main():
-    """Load cogs and start bot."""
-    # Set log level asap to record discord.py messages.
-    logging.basicConfig(level=logging.INFO)
-
-    if sys.version_info < Config.MINIMUM_PYTHON_VERSION:
-        raise RuntimeError("Please update Python to at least {}".format(
-            ".".join(str(i) for i in Config.MINIMUM_PYTHON_VERSION)))
+    if shard_ids is None:
+        bot = Bot(command_prefix=Config.PREFIX, case_insensitive=True)
+    else:
+        bot = AutoShardedBot(command_prefix=Config.PREFIX,
+                             case_insensitive=True,
+                             shard_ids=shard_ids,
+                             shard_count=shard_count)
+
+    @bot.event
+    async def on_message(message: Message):
+        """Global on_message handler.
+
+        This is a special event.
+
+        The handler for the "on_message" event must be a bot-decorated
+        function due to the special property that Discord.py applies wherein
+        the default handler for "on_message" is applied, even when
+        `bot.add_listener` is called before the default handler is created.
+        This means that without this special, bot-decorated handler, the
+        default handler would still be applied, causing the bot to bypass all
+        the restrictions we lay out in `handlers.on_message`.
+        """
+        await handlers.on_message(bot, message)
 
     # Discord.py breaks debuggers and logging when loading event handlers in
     # the `setup` function of an extension, so load them here.
     for event, handler in [
         ("on_ready",         partial(handlers.on_ready, bot)),
         ("on_command_error", handlers.on_command_error),
+        *((event, partial(handlers.on_guild_channels_changed, bot)) for event in [
+            "on_guild_channel_create",
+            "on_guild_channel_update",
+            "on_guild_channel_delete",
+            "on_guild_join",
+            "on_guild_remove",
+        ]),
+        ("on_raw_reaction_add",    partial(handlers.on_raw_reaction_changed, bot)),
+        ("on_raw_reaction_remove", partial(handlers.on_raw_reaction_changed, bot)),
     ]:
         bot.add_listener(handler, event)
 
+    extensions = list(Config.EXTENSIONS)
+
     if Pomwars.LOAD_POM_WARS:
         for event, handler in [
             ("on_ready", partial(handlers.pom_wars.on_ready, bot)),
@@ -55,20 +78,109 @@ def main():
         ]:
             bot.add_listener(handler, event)
 
-        Config.EXTENSIONS.append("pombot.extensions.pom_wars")
+        extensions.append("pombot.extensions.pom_wars")
 
-    for extension in Config.EXTENSIONS:
+    for extension in extensions:
         _log.info("Loading extension: %s", extension)
         bot.load_extension(extension)
 
     # Replace the default help command which marks every command as
     # "Uncategorized" and does no extension separation.
     bot.remove_command("help")
-    bot.add_command(
-        BotCommand(commands.do_help, name="help", aliases=Config.PUBLIC_HELP_ALIASES))
+    help_command = BotCommand(commands.do_help, name="help", aliases=Config.PUBLIC_HELP_ALIASES)
+    bot.add_command(help_command)
+    HelpIndex.add(help_command)
+
+    # Count Discord API calls made on behalf of each command.
+    Metrics.instrument_http(bot.http)
+
+    if Debug.MONITOR_EVENT_LOOP:
+        LoopMonitor.start(bot.loop)
+
+    return bot
+
+
+def _run_shards(
+    index: int,
+    shard_ids: List[int],
+    shard_count: int,
+    inbox: multiprocessing.Queue,
+    outbox: multiprocessing.Queue,
+):
+    """Entry point of a shard process started by `_supervise`."""
+    logging.basicConfig(level=logging.INFO,
+                        format="%(processName)s:%(levelname)s:%(name)s:%(message)s")
+
+    bot = create_bot(shard_ids, shard_count)
+    ShardCoordinator.connect(index, inbox, outbox, bot.loop)
 
     bot.run(Secrets.TOKEN)
 
 
+def _supervise(shard_count: int, num_processes: int):
+    """Run the shards in separate processes, restarting any that exit, and
+    relay notifications between them.
+    """
+    mp_context = multiprocessing.get_context("spawn")
+    shard_groups = distribute_shards(shard_count, num_processes)
+    inboxes = [mp_context.Queue() for _ in shard_groups]
+    outbox = mp_context.Queue()
+
+    def _relay_forever():
+        while True:
+            sender, topic, payload = outbox.get()
+
+            for index, inbox in enumerate(inboxes):
+                if index != sender:
+                    inbox.put((topic, payload))
+
+    threading.Thread(target=_relay_forever, name="shard-relay", daemon=True).start()
+
+    def _start(index: int) -> multiprocessing.Process:
+        shard_ids = shard_groups[index]
+        process = mp_context.Process(
+            target=_run_shards,
+            name="shards-" + "-".join(str(i) for i in shard_ids),
+            args=(index, shard_ids, shard_count, inboxes[index], outbox),
+        )
+        process.start()
+        _log.info("Started %s (pid %s)", process.name, process.pid)
+
+        return process
+
+    processes = [_start(index) for index in range(len(shard_groups))]
+
+    try:
+        while True:
+            time.sleep(Config.SHARD_RESTART_DELAY.total_seconds())
+
+            for index, process in enumerate(processes):
+                if not process.is_alive():
+                    _log.error("%s exited with code %s; restarting",
+                               process.name, process.exitcode)
+                    processes[index] = _start(index)
+    finally:
+        for process in processes:
+            process.terminate()
+
+        for process in processes:
+            process.join()
+
+
+def main():
+    """Load cogs and start bot, or start the shard processes."""
+    # Set log level asap to record discord.py messages.
+    logging.basicConfig(level=logging.INFO)
+
+    if sys.version_info < Config.MINIMUM_PYTHON_VERSION:
+        raise RuntimeError("Please update Python to at least {}".format(
+            ".".join(str(i) for i in Config.MINIMUM_PYTHON_VERSION)))
+
+    if Config.SHARD_COUNT:
+        _supervise(Config.SHARD_COUNT, Config.SHARD_PROCESSES)
+    else:
+        create_bot().run(Secrets.TOKEN)
+
+
 if __name__ == "__main__":
     main()
@@ -9,7 +9,10 @@ from pombot.commands.newleaf import *
 from pombot.commands.pom import *
 from pombot.commands.pom_wars import *
 from pombot.commands.poms import *
+from pombot.commands.profile import *
+from pombot.commands.queries import *
 from pombot.commands.remove_event import *
 from pombot.commands.reset import *
+from pombot.commands.stats import *
 from pombot.commands.total import *
 from pombot.commands.undo import *
@@ -1,6 +1,7 @@
 from discord.ext.commands import Context
 
 from pombot.config import Reactions
+from pombot.lib.outbound import Outbound
 from pombot.lib.tiny_tools import PolyStr
 
 
@@ -18,7 +19,7 @@ async def do_ambiguous_command(ctx: Context, *_):
 
         matches += [possible_match]
 
-    await ctx.reply(PolyStr("`{}` is ambiguous. You might have meant {}") \
+    await Outbound.reply(ctx, PolyStr("`{}` is ambiguous. You might have meant {}") \
         .format(ctx.invoked_with, ", ".join(f"`{m}`" for m in matches)) \
         .replace_final_occurence(", ", "or"))
-    await ctx.message.add_reaction(Reactions.ROBOT)
+    await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
@@ -4,6 +4,7 @@ from discord.ext.commands import Context
 
 from pombot.config import Config, Reactions
 from pombot.lib.messages import send_embed_message
+from pombot.lib.outbound import Outbound
 from pombot.lib.rename_poms import rename_poms
 from pombot.lib.storage import Storage
 from pombot.lib.tiny_tools import normalize_and_dedent
@@ -42,7 +43,7 @@ async def do_bank(ctx: Context, *args):
                 Please specify exactly two descriptions (the old one followed
                 by the new one) inside of double quotes. See `!help bank`.
             """))
-            await ctx.message.add_reaction(Reactions.ROBOT)
+            await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
             return
 
         await rename_poms(ctx, old, new, SessionType.BANKED)
@@ -50,7 +51,7 @@ async def do_bank(ctx: Context, *args):
 
     if ctx.invoked_with in Config.RESET_POMS_IN_BANK:
         await Storage.delete_poms(user=ctx.author, session=SessionType.BANKED)
-        await ctx.message.add_reaction(Reactions.WASTEBASKET)
+        await Outbound.add_reaction(ctx.message, Reactions.WASTEBASKET)
         return
 
     reply_with_embed = partial(send_embed_message, ctx=None, _func=ctx.reply)
@@ -62,7 +63,7 @@ async def do_bank(ctx: Context, *args):
                 n=num_poms_banked,
                 s="s" if num_poms_banked != 1 else "",
             ))
-        await ctx.message.add_reaction(Reactions.BANK)
+        await Outbound.add_reaction(ctx.message, Reactions.BANK)
     else:
         await reply_with_embed(
             title="Oops!",
@@ -6,9 +6,10 @@ from discord.ext.commands import Context
 import pombot
 from pombot.config import Reactions
 from pombot.lib.messages import send_embed_message
+from pombot.lib.outbound import Outbound
+from pombot.lib.shared_state import GOAL_REACHED, SharedState
 from pombot.lib.storage import Storage
 from pombot.lib.types import DateRange
-from pombot.state import State
 
 
 async def do_create_event(ctx: Context, *args):
@@ -33,13 +34,13 @@ async def do_create_event(ctx: Context, *args):
     try:
         *name, pom_goal, start_month, start_day, end_month, end_day = args
     except ValueError:
-        await ctx.reply("Your args are out of order or something.")
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.reply(ctx, "Your args are out of order or something.")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return
 
     if not (event_name := " ".join(name)):  # pylint: disable=superfluous-parens
-        await ctx.reply("Please specify an event name.")
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.reply(ctx, "Please specify an event name.")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return
 
     try:
@@ -48,31 +49,31 @@ async def do_create_event(ctx: Context, *args):
         if pom_goal <= 0:
             raise ValueError("Goal must be a positive number.")
     except ValueError as exc:
-        await ctx.reply(f"Invalid goal: `{pom_goal}`, {exc}")
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.reply(ctx, f"Invalid goal: `{pom_goal}`, {exc}")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return
 
     try:
         date_range = DateRange(start_month, start_day, end_month, end_day)
     except ValueError as exc:
-        await ctx.reply(exc)
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.reply(ctx, exc)
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return
 
     if overlapping_events := await Storage.get_overlapping_events(date_range):
-        await ctx.reply("Found overlapping events: {}".format(", ".join(
+        await Outbound.reply(ctx, "Found overlapping events: {}".format(", ".join(
             event.event_name for event in overlapping_events)))
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return
 
     try:
         await Storage.add_new_event(event_name, pom_goal, date_range)
     except pombot.lib.errors.EventCreationError as exc:
-        await ctx.reply(f"Failed to create event: {exc}")
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.reply(ctx, f"Failed to create event: {exc}")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return
 
-    State.goal_reached = False
+    await SharedState.set(GOAL_REACHED, False)
     fmt = lambda dt: datetime.strftime(dt, "%B %d, %Y")
 
     await send_embed_message(
@@ -1,13 +1,13 @@
 from typing import Any, Iterator, List, Optional, Tuple
 
 from discord.ext.commands import Context
-from discord.ext.commands.errors import MissingAnyRole, NoPrivateMessage
 
 from pombot.config import Config, Reactions
-from pombot.lib.messages import EmbedField, send_embed_message
-from pombot.lib.tiny_tools import PolyStr, normalize_newlines
+from pombot.lib.help_index import HelpIndex
+from pombot.lib.messages import EmbedField, Overflow, send_embed_message
+from pombot.lib.outbound import Outbound
+from pombot.lib.tiny_tools import PolyStr
 
-OFFSET = " " * 2
 
 def _uniq(iterator: Iterator) -> Any:
     already_yielded = set()
@@ -27,31 +27,8 @@ def _get_help_for_all_commands(ctx: Context) -> Tuple[Optional[str],
     @param ctx Message context.
     @return Tuple of (Response string, Intended footer).
     """
-    groups = {}
-
-    for command in ctx.bot.commands:
-        if command.hidden:
-            continue
-
-        try:
-            for func in command.checks:
-                func(ctx)
-        except NoPrivateMessage:
-            return (None, None)
-        except MissingAnyRole:
-            continue
-
-        try:
-            groups[command.extension] |= {command.name: command.short_doc}
-        except KeyError:
-            groups[command.extension] = {command.name: command.short_doc}
-
-    response_lines = []
-
-    for group in sorted(groups):
-        response_lines.append(f"\n{group} commands:".title().replace("_", " "))
-        response_lines.extend(f"{OFFSET}{cmd}: {groups[group][cmd]}"
-                              for cmd in sorted(groups[group]))
+    if (response_lines := HelpIndex.get_overview_lines(ctx)) is None:
+        return (None, None)
 
     response = "```{}```".format("\n".join(response_lines))
     footer = "Type a command to get more information! (e.g. !help pom)"
@@ -72,34 +49,23 @@ def _get_help_for_commands(
     """
     # Remove "dot-alias", but preserve order of user-supplied values.
     requested_commands = tuple(cmd.rsplit(".", 1)[0].casefold() for cmd in commands)
-    existing_commands = {c.name.casefold() for c in ctx.bot.commands}
+    user_roles = HelpIndex.get_user_roles(ctx)
 
     fields = []
-    if command_names_found := set(requested_commands) & existing_commands:
-        for command in _uniq(requested_commands):
-
-            # If we simply iterate over command_names_found, then they won't
-            # appear in the order requested by the user.
-            if command not in command_names_found:
-                continue
-
-            checks = next(c.checks for c in ctx.bot.commands
-                          if c.name == command)
+    for command in _uniq(requested_commands):
+        if (help_ := HelpIndex.get(command)) is None:
+            continue
 
-            try:
-                for func in checks:
-                    func(ctx)
-            except NoPrivateMessage:
+        if help_.is_restricted():
+            if user_roles is None:
                 return (None, None)
-            except MissingAnyRole:
+
+            if not help_.is_available(ctx, user_roles):
                 continue
 
-            fields += [
-                EmbedField(name=Config.PREFIX + cmd.name,
-                           value="```" + normalize_newlines(cmd.help) + "```",
-                           inline=False)
-                    for cmd in ctx.bot.commands if cmd.name == command
-            ]
+        fields.append(help_.field)
+
+    existing_commands = {c for c in requested_commands if HelpIndex.get(c)}
 
     if unknowns := set(requested_commands) - existing_commands:
         footer = PolyStr("I can't help you with {} though.") \
@@ -149,7 +115,7 @@ async def do_help(ctx: Context, *args):
         return
 
     if not public_response:
-        await ctx.message.add_reaction(Reactions.CHECKMARK)
+        await Outbound.add_reaction(ctx.message, Reactions.CHECKMARK)
 
     await send_embed_message(
         None,
@@ -157,5 +123,6 @@ async def do_help(ctx: Context, *args):
         description=response,
         fields=fields,
         footer=footer,
+        overflow=Overflow.SPLIT,
         _func=ctx.reply if public_response else ctx.author.send,
     )
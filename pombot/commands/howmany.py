@@ -4,6 +4,7 @@ import textwrap
 from discord.ext.commands import Context
 
 from pombot.config import Reactions
+from pombot.lib.outbound import Outbound
 
 
 async def do_howmany(ctx: Context):
@@ -12,7 +13,7 @@ async def do_howmany(ctx: Context):
     This command is disabled and will be removed soon. See `!help poms`
     instead.
     """
-    await ctx.reply(textwrap.dedent("""\
+    await Outbound.reply(ctx, textwrap.dedent("""\
         This command has been disabled. See `!help poms` instead.
     """))
-    await ctx.message.add_reaction(Reactions.ROBOT)
+    await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
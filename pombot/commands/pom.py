@@ -2,10 +2,14 @@ from discord.ext.commands import Context
 
 import pombot.lib.errors
 from pombot.config import Config, Reactions
+from pombot.lib.event_goal import EventGoal
 from pombot.lib.messages import send_embed_message
+from pombot.lib.outbound import Outbound
+from pombot.lib.shared_state import GOAL_REACHED, SharedState
 from pombot.lib.storage import Storage
+from pombot.lib.throttling import PomCoalescer
 from pombot.lib.types import DateRange
-from pombot.state import State
+from pombot.lib.undo_stack import UndoStack
 
 
 async def do_pom(ctx: Context, *description):
@@ -29,26 +33,27 @@ async def do_pom(ctx: Context, *description):
             pass
         else:
             if not 0 < count <= Config.POM_TRACK_LIMIT:
-                await ctx.message.add_reaction(Reactions.WARNING)
-                await ctx.send("You can only add between 1 and "
-                                f"{Config.POM_TRACK_LIMIT} poms at once.")
+                await Outbound.add_reaction(ctx.message, Reactions.WARNING)
+                await Outbound.send(ctx, "You can only add between 1 and "
+                                         f"{Config.POM_TRACK_LIMIT} poms at once.")
                 return
 
             description = " ".join(tail)
 
         if len(description) > Config.DESCRIPTION_LIMIT:
-            await ctx.message.add_reaction(Reactions.WARNING)
-            await ctx.send("Your pom description must be fewer than "
-                            f"{Config.DESCRIPTION_LIMIT} characters.")
+            await Outbound.add_reaction(ctx.message, Reactions.WARNING)
+            await Outbound.send(ctx, "Your pom description must be fewer than "
+                                     f"{Config.DESCRIPTION_LIMIT} characters.")
             return
 
     if description is not None:
         description = description.replace("\n", " ")
 
-    await Storage.add_poms_to_user_session(ctx.author, description, count)
-    await ctx.message.add_reaction(Reactions.TOMATO)
+    pom_ids = await PomCoalescer.add_poms_to_user_session(ctx.author, description, count)
+    UndoStack.push(ctx.author, [(pom_id, count) for pom_id in pom_ids])
+    await Outbound.add_reaction(ctx.message, Reactions.TOMATO)
 
-    if State.goal_reached:
+    if SharedState.get(GOAL_REACHED, False):
         return
 
     try:
@@ -61,11 +66,11 @@ async def do_pom(ctx: Context, *description):
         msg = "Only one ongoing event supported."
         raise pombot.lib.errors.TooManyEventsError(msg)
 
-    current_poms_for_event = await Storage.get_poms(date_range=DateRange(
+    current_poms_for_event = await EventGoal.count_poms(DateRange(
         ongoing_event.start_date, ongoing_event.end_date))
 
-    if len(current_poms_for_event) >= ongoing_event.pom_goal:
-        State.goal_reached = True
+    if current_poms_for_event >= ongoing_event.pom_goal:
+        await SharedState.set(GOAL_REACHED, True)
 
         await send_embed_message(
             ctx,
@@ -1,12 +1,16 @@
 from datetime import datetime, timedelta
+from functools import partial
 
 import discord.errors
 from discord.ext.commands import Context
+from discord.user import User as DiscordUser
 
 from pombot.config import Debug, IconUrls, Pomwars, Reactions
 from pombot.lib.messages import send_embed_message
+from pombot.lib.outbound import Outbound
 from pombot.lib.storage import Storage
 from pombot.lib.types import DateRange
+from pombot.lib.user_cache import UserCache
 
 
 async def do_actions(ctx: Context, *args):
@@ -31,7 +35,29 @@ async def do_actions(ctx: Context, *args):
             today = datetime.today()
             date_range = descriptive_dates["today"]
 
-    actions = await Storage.get_actions(user=ctx.author, date_range=date_range)
+    description = await UserCache.get(
+        ctx.author.id,
+        ("actions", date_range.start_date, date_range.end_date),
+        partial(_describe_actions, ctx.author, date_range))
+
+    try:
+        await send_embed_message(
+            ctx,
+            title=f"Actions for {date_range}",
+            description=description,
+            thumbnail=IconUrls.ATTACK,
+            colour=Pomwars.ACTION_COLOUR,
+            private_message=not Debug.POMS_COMMAND_IS_PUBLIC,
+        )
+        await Outbound.add_reaction(ctx.message, Reactions.CHECKMARK)
+    except discord.errors.Forbidden:
+        # User disallows DM's from server members.
+        await Outbound.add_reaction(ctx.message, Reactions.WARNING)
+
+
+async def _describe_actions(user: DiscordUser, date_range: DateRange) -> str:
+    """Summarize the user's actions within the date range."""
+    actions = await Storage.get_actions(user=user, date_range=date_range)
 
     if not actions:
         description = "*No recorded actions.*"
@@ -65,16 +91,4 @@ async def do_actions(ctx: Context, *args):
 
         description = "\n".join(d for d in descripts if d)
 
-    try:
-        await send_embed_message(
-            ctx,
-            title=f"Actions for {date_range}",
-            description=description,
-            thumbnail=IconUrls.ATTACK,
-            colour=Pomwars.ACTION_COLOUR,
-            private_message=not Debug.POMS_COMMAND_IS_PUBLIC,
-        )
-        await ctx.message.add_reaction(Reactions.CHECKMARK)
-    except discord.errors.Forbidden:
-        # User disallows DM's from server members.
-        await ctx.message.add_reaction(Reactions.WARNING)
+    return description
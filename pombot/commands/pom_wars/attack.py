@@ -1,5 +1,6 @@
 import random
 from datetime import datetime, timedelta
+from functools import partial
 
 from discord.ext.commands import Context
 
@@ -8,15 +9,17 @@ from pombot.config import Debug, Pomwars, Reactions
 from pombot.data.pom_wars.actions import Attacks
 from pombot.lib.errors import DescriptionTooLongError
 from pombot.lib.messages import send_embed_message
+from pombot.lib.outbound import Outbound
 from pombot.lib.pom_wars.action_chances import is_action_successful
 from pombot.lib.pom_wars.dedup_tools import check_user_add_pom
 from pombot.lib.pom_wars.team import get_user_team
 from pombot.lib.storage import Storage
 from pombot.lib.types import ActionType, DateRange
-from pombot.state import State
 
 
 async def _get_defensive_multiplier(team: str, timestamp: datetime) -> float:
+    # Whole seconds let concurrent attacks share the same read.
+    timestamp = timestamp.replace(microsecond=0)
     defend_actions = await Storage.get_actions(
         action_type=ActionType.DEFEND,
         team=team,
@@ -59,12 +62,12 @@ async def do_attack(ctx: Context, *args):
     if not await is_action_successful(ctx.author, timestamp, heavy_attack):
         emote = random.choice(["¯\\_(ツ)_/¯", "(╯°□°）╯︵ ┻━┻"])
         await Storage.add_pom_war_action(**action)
-        await ctx.send(f"<@{ctx.author.id}>'s attack missed! {emote}")
+        await Outbound.send(ctx, f"<@{ctx.author.id}>'s attack missed! {emote}")
         return
 
     action["was_successful"] = True
     action["was_critical"] = random.random() <= Pomwars.BASE_CHANCE_FOR_CRITICAL
-    await ctx.message.add_reaction(Reactions.BOOM)
+    await Outbound.add_reaction(ctx.message, Reactions.BOOM)
 
     attack = Attacks.get_random(
         team=action["team"],
@@ -85,10 +88,8 @@ async def do_attack(ctx: Context, *args):
         description=attack.get_message(action["damage"]),
         icon_url=None,
         colour=attack.colour,
-        _func=ctx.reply,
+        _func=partial(Outbound.reply, ctx),
     )
 
-    await State.scoreboard.update()
-
     if Debug.BENCHMARK_POMWAR_ATTACK:
         print(f"!attack took: {datetime.now() - timestamp}")
@@ -3,6 +3,7 @@ from datetime import datetime
 from discord.ext.commands import Context
 
 from pombot.data.pom_wars.actions import Bribes
+from pombot.lib.outbound import Outbound
 from pombot.lib.pom_wars.team import get_user_team
 from pombot.lib.storage import Storage
 from pombot.lib.types import ActionType
@@ -25,4 +26,4 @@ async def do_bribe(ctx: Context):
     }
 
     await Storage.add_pom_war_action(**action)
-    await ctx.reply(bribe.get_message(ctx.author, ctx.bot))
+    await Outbound.reply(ctx, bribe.get_message(ctx.author, ctx.bot))
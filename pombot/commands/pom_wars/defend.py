@@ -1,5 +1,6 @@
 import random
 from datetime import datetime
+from functools import partial
 
 from discord.ext.commands import Context
 
@@ -8,6 +9,7 @@ from pombot.config import Pomwars, Reactions
 from pombot.data.pom_wars.actions import Defends
 from pombot.lib.errors import DescriptionTooLongError
 from pombot.lib.messages import send_embed_message
+from pombot.lib.outbound import Outbound
 from pombot.lib.pom_wars.action_chances import is_action_successful
 from pombot.lib.pom_wars.dedup_tools import check_user_add_pom
 from pombot.lib.pom_wars.team import get_user_team
@@ -38,12 +40,12 @@ async def do_defend(ctx: Context, *args):
 
     if not await is_action_successful(ctx.author, timestamp):
         emote = random.choice(["¯\\_(ツ)_/¯", "(╯°□°）╯︵ ┻━┻"])
-        await ctx.send(f"<@{ctx.author.id}> defence failed! {emote}")
+        await Outbound.send(ctx, f"<@{ctx.author.id}> defence failed! {emote}")
         await Storage.add_pom_war_action(**action)
         return
 
     action["was_successful"] = True
-    await ctx.message.add_reaction(Reactions.SHIELD)
+    await Outbound.add_reaction(ctx.message, Reactions.SHIELD)
 
     defend = Defends.get_random(team=action["team"])
 
@@ -57,5 +59,5 @@ async def do_defend(ctx: Context, *args):
         description=defend.get_message(defender),
         colour=Pomwars.DEFEND_COLOUR,
         icon_url=None,
-        _func=ctx.reply,
+        _func=partial(Outbound.reply, ctx),
     )
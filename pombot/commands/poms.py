@@ -1,21 +1,25 @@
 import textwrap
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta
 from functools import partial
-from typing import Callable, Iterator, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
+from discord.embeds import Embed
 from discord.ext.commands import Context
-from discord.message import Message
-from discord.errors import HTTPException
+from discord.user import User as DiscordUser
 
 from pombot.config import Config, Debug, Reactions
 from pombot.data import Limits
-from pombot.lib.messages import EmbedField, send_embed_message
+from pombot.lib.messages import EmbedField, create_embed, send_embed_message
+from pombot.lib.outbound import Outbound
+from pombot.lib.paginator import Paginator
 from pombot.lib.rename_poms import rename_poms
+from pombot.lib.render_pool import RenderPool
 from pombot.lib.storage import Storage
 from pombot.lib.tiny_tools import normalize_and_dedent
 from pombot.lib.types import Pom, SessionType
+from pombot.lib.user_cache import UserCache
 
 ZERO_WIDTH_SPACE = "\u200b"
 LIGHT_HORIZONTAL = "\u2500"
@@ -68,18 +72,18 @@ async def do_poms(ctx: Context, *args):
                 Please specify exactly two descriptions (the old one followed
                 by the new one) inside of double quotes. See `!help poms`.
             """))
-            await ctx.message.add_reaction(Reactions.ROBOT)
+            await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
 
         await rename_poms(ctx, old, new, SessionType.CURRENT)
         return
 
     if ctx.invoked_with in Config.RESET_POMS_IN_SESSION:
         await Storage.delete_poms(user=ctx.author, session=SessionType.CURRENT)
-        await ctx.message.add_reaction(Reactions.WASTEBASKET)
+        await Outbound.add_reaction(ctx.message, Reactions.WASTEBASKET)
         return
 
     description = " ".join(args)
-    poms = await Storage.get_poms(user=ctx.author, descript=description)
+    banked_summary, current_summary = await _get_session_summaries(ctx.author, description)
 
     response_is_public = ctx.invoked_with in Config.PUBLIC_POMS_ALIASES
 
@@ -87,157 +91,150 @@ async def do_poms(ctx: Context, *args):
                       description=description,
                       public_response=response_is_public)
 
-    banked_session = session(
-        session_type=SessionType.BANKED,
-        poms=[p for p in poms if not p.is_current_session()],
-    )
+    banked_session = session(session_type=SessionType.BANKED, summary=banked_summary)
+    current_session = session(session_type=SessionType.CURRENT, summary=current_summary)
 
-    current_session = session(
-        session_type=SessionType.CURRENT,
-        poms=[p for p in poms if p.is_current_session()],
-    )
+    rendered = await UserCache.get(
+        ctx.author.id,
+        ("poms.rendered", description, response_is_public),
+        partial(_render_sessions, banked_session, current_session),
+        size=lambda _: len(banked_summary.counts) + len(current_summary.counts) + 1)
 
     if response_is_public:
-        try:
-            await send_embed_message(
-                None,
-                title=f"Pom statistics for {ctx.author.display_name}",
-                description=current_session.get_session_started_message(),
-                thumbnail=ctx.author.avatar_url,
-                fields=[current_session.get_message_field()],
-                footer=current_session.get_duration_message(),
-                _func=ctx.message.reply)
-        except HTTPException:
-            await ctx.author.send(normalize_and_dedent("""\
-                The combined length of the pom descriptions in your current
-                session are over Discord's embed character limit. Use !poms
-                (without `.show`) to see them and rename a few.
-            """))
-            await ctx.message.add_reaction(Reactions.ROBOT)
+        await send_embed_message(
+            None,
+            title=f"Pom statistics for {ctx.author.display_name}",
+            description=rendered.description,
+            thumbnail=ctx.author.avatar_url,
+            fields=rendered.fields,
+            footer=rendered.footer,
+            _func=ctx.message.reply)
         return
 
-    if description:
-        footer = "Total time spent on {description}: {duration}".format(
-            description=description,
-            duration=_dynamic_duration(len(poms) * Config.POM_LENGTH))
+    send = ctx.send if Debug.POMS_COMMAND_IS_PUBLIC else ctx.author.send
+
+    await send_embed_message(
+        None,
+        title=f"Your pom statistics",
+        description=rendered.description,
+        thumbnail=ctx.author.avatar_url,
+        fields=rendered.fields,
+        footer=rendered.footer,
+        _func=send,
+    )
+
+    # List the descriptions of the sessions which didn't fit, a page at a
+    # time.
+    for session in (banked_session, current_session):
+        if num_hidden := rendered.hidden_descripts.get(session.type):
+            await Paginator.send(
+                send,
+                user_id=ctx.author.id,
+                key=session.type.value,
+                num_pages=session.get_num_pages(num_hidden),
+                render=partial(session.render_page, num_hidden),
+            )
+
+    await Outbound.add_reaction(ctx.message, Reactions.CHECKMARK)
+
+
+class _RenderedSessions(NamedTuple):
+    """The text of a !poms response, as sent in its embed."""
+    description: Optional[str]
+    fields: List[EmbedField]
+    footer: str
+    hidden_descripts: Dict[SessionType, int]  # Left out of each session's field.
+
+
+async def _render_sessions(banked_session: "_Session", current_session: "_Session") -> _RenderedSessions:
+    """Render the !poms response for a user's sessions.
+
+    Only the current session is shown publicly.
+    """
+    if current_session.is_public:
+        current_field = await RenderPool.run(current_session.get_message_field,
+                                             size=len(current_session))
+
+        return _RenderedSessions(
+            description=current_session.get_session_started_message(),
+            fields=[current_field],
+            footer=current_session.get_duration_message(),
+            hidden_descripts={},
+        )
+
+    total_duration = _dynamic_duration(
+        len(banked_session + current_session) * Config.POM_LENGTH)
+
+    if description := current_session.desc:
+        footer = f"Total time spent on {description}: {total_duration}"
     else:
         footer = "\n".join([
-            "Total time spent pomming: {}".format(
-                _dynamic_duration(
-                    len(banked_session + current_session) *
-                    Config.POM_LENGTH)),
+            f"Total time spent pomming: {total_duration}",
             current_session.get_duration_message(),
         ])
 
-    try:
-        await send_embed_message(
-            None,
-            title=f"Your pom statistics",
-            description=current_session.get_session_started_message(),
-            thumbnail=ctx.author.avatar_url,
-            fields=[
-                banked_session.get_message_field(),
-                SPACER,
-                current_session.get_message_field(),
-            ],
-            footer=footer,
-            _func=(ctx.send if Debug.POMS_COMMAND_IS_PUBLIC else ctx.author.send),
-        )
-    except HTTPException:
-        for response in generate_message_too_long_responses(
-                ctx, footer, (current_session, banked_session)):
-            await response.send()
+    fields = await RenderPool.run(
+        lambda: [banked_session.get_message_field(), SPACER, current_session.get_message_field()],
+        size=len(banked_session.summary.counts) + len(current_session.summary.counts))
+
+    return _RenderedSessions(
+        description=current_session.get_session_started_message(),
+        fields=fields,
+        footer=footer,
+        hidden_descripts={session.type: session.num_hidden_descripts
+                          for session in (banked_session, current_session)
+                          if session.num_hidden_descripts},
+    )
 
-        await ctx.message.add_reaction(Reactions.ROBOT)
-    else:
-        await ctx.message.add_reaction(Reactions.CHECKMARK)
 
+async def _get_session_summaries(
+    user: DiscordUser,
+    description: str,
+) -> Tuple["_SessionSummary", "_SessionSummary"]:
+    """Return the summaries of the user's banked and current sessions,
+    read through the user's cache.
+    """
+    async def load():
+        poms = await Storage.get_poms(user=user, descript=description)
+        banked_summary, current_summary = _SessionSummary(), _SessionSummary()
 
-@dataclass
-class _Response:
-    is_embed_message: bool
-    args: tuple = None
-    kwargs: dict = None
-    _func: Callable = None
+        for pom in poms:
+            (current_summary if pom.is_current_session() else banked_summary).add(pom)
 
-    async def send(self) -> Message:
-        """Send this message.
+        return banked_summary, current_summary
 
-        @raises TypeError if is_embed_message False and _func is None.
-        @return The Discord message delivered.
-        """
-        args = self.args or tuple()
-        kwargs = self.kwargs or dict()
+    return await UserCache.get(
+        user.id,
+        ("poms", description),
+        load,
+        size=lambda summaries: sum(len(summary.counts) for summary in summaries) + 1)
 
-        if self.is_embed_message:
-            return await send_embed_message(*args, **kwargs)
 
-        return await self._func(*args, **kwargs)
+@dataclass
+class _SessionSummary:
+    """The description counts, total and first pom of a session, built in a
+    single pass over its poms.
+    """
+    counts: Counter = field(default_factory=Counter)
+    total: int = 0
+    first_pom: Optional[Pom] = None
 
+    def add(self, pom: Pom):
+        """Count `pom` in this summary."""
+        self.counts[pom.descript] += pom.quantity
+        self.total += pom.quantity
 
-def generate_message_too_long_responses(
-    ctx: Context,
-    footer: str,
-    sessions: Tuple,
-) -> List[_Response]:
-    """Generate an ordered list of messages to be sent instead of a single
-    embed when the !poms embed is too long.
+        if self.first_pom is None or pom.pom_id < self.first_pom.pom_id:
+            self.first_pom = pom
 
-    The "current session" is determined automatically.
+    def __add__(self, other: "_SessionSummary") -> "_SessionSummary":
+        first_poms = [p for p in (self.first_pom, other.first_pom) if p is not None]
 
-    @param ctx The context originally sent to the callback.
-    @param footer The footer to be included in the new embed(s).
-    @param session Tuple of _Session objects representing the embed fields that
-           were too long.
-    @return Ordered list of _Response objects.
-    """
-    responses: List[_Response] = []
-    current_session = next(s for s in sessions if s.type == SessionType.CURRENT)
-    normal_response = lambda msg: _Response(
-        is_embed_message=False,
-        args=(msg, ),
-        _func=(ctx.author.send
-               if not Debug.POMS_COMMAND_IS_PUBLIC else ctx.send))
-
-    for session in sessions:
-        field = session.get_message_field()
-
-        if len(field.value) <= Limits.MAX_EMBED_FIELD_VALUE:
-            responses.append(_Response(
-                is_embed_message=True,
-                args=(None,),
-                kwargs={
-                    "title": "Your pom statistics",
-                    "description": current_session.get_session_started_message(),
-                    "thumbnail": ctx.author.avatar_url,
-                    "fields": [session.get_message_field()],
-                    "footer": footer,
-                    "_func": (ctx.author.send
-                              if not Debug.POMS_COMMAND_IS_PUBLIC else ctx.send),
-                }
-            ))
-            continue
-
-        message = normalize_and_dedent("""
-            ```fix
-
-            The combined length of all the pom descriptions in your
-            {session_type} is longer than the maximum embed message field
-            size for Discord embeds ({length}, Max is {max_length}). Please
-            rename a few with !{cmd}.rename (see !help {cmd}).```
-        """.format(
-            session_type=session.type.value.lower(),
-            length=len(session.get_message_field().value),
-            max_length=Limits.MAX_EMBED_FIELD_VALUE,
-            cmd="poms" if session.type == SessionType.CURRENT else "bank",
-        ))
-        responses.append(normal_response(message))
-
-        for message in session.iter_message_field(
-                max_length=Limits.MAX_CHARACTERS_PER_MESSAGE - 100):
-            responses.append(normal_response(message))
-
-    return sorted(responses, key=lambda r: not r.is_embed_message)
+        return _SessionSummary(
+            counts=self.counts + other.counts,
+            total=self.total + other.total,
+            first_pom=min(first_poms, key=lambda p: p.pom_id, default=None),
+        )
 
 
 class _Session:
@@ -246,23 +243,24 @@ class _Session:
     There are effectively two different durations of sessions according to
     the `poms` table: those that are in the current session and those that
     are not. This class builds and returns messages for either given a type
-    and an iterator.
+    and a summary of its poms.
     """
     def __init__(
         self,
         *,
         session_type: SessionType,
-        poms: List[Pom],
+        summary: _SessionSummary,
         description: str,
         public_response: bool,
     ):
         self.type = session_type
-        self.poms = sorted(poms)
+        self.summary = summary
         self.desc = description
         self.is_public = public_response
+        self.num_hidden_descripts = 0
 
     def __len__(self):
-        return len(self.poms)
+        return self.summary.total
 
     def __add__(self, other):
         if not isinstance(other, self.__class__):
@@ -270,23 +268,20 @@ class _Session:
 
         return self.__class__(
             session_type=SessionType.COMBINED,
-            poms=self.poms + other.poms,
+            summary=self.summary + other.summary,
             description=self.desc,
             public_response=self.is_public,
         )
 
-    def get_message_field(self) -> EmbedField:
-        """Get the stats of this session as an EmbedField."""
-        pom_counts = Counter(pom.descript for pom in self.poms)
-
-        designated_poms = [f"{k}: *{v:,}*" for k, v in pom_counts.most_common() if k is not None]
-        num_undesignated_poms = pom_counts.get(None) or 0
+    def get_message_field(self, max_length: int = Limits.MAX_EMBED_FIELD_VALUE) -> EmbedField:
+        """Get the stats of this session as an EmbedField.
 
-        if designated_lines := designated_poms:
-            if not self.desc:
-                designated_lines += [ZERO_WIDTH_SPACE]
-        else:
-            designated_lines = ["*No designated poms!*", ""]
+        When the descriptions don't all fit in `max_length` characters, only
+        the most common are listed and `num_hidden_descripts` is set to the
+        number left out.
+        """
+        designated_poms = [f"{k}: *{v:,}*" for k, v in self._get_designated_counts()]
+        num_undesignated_poms = self.summary.counts.get(None) or 0
 
         if not designated_poms and num_undesignated_poms == 0:
             if self.type == SessionType.BANKED:
@@ -307,24 +302,64 @@ class _Session:
                     """)]
         else:
             if self.desc:
-                detail_lines = designated_lines
+                totals_lines = []
             else:
-                detail_lines = [
-                    *designated_lines,
+                totals_lines = [
                     f"*Undesignated*: *{num_undesignated_poms}*",
                     TOTALS_SEPARATOR,
-                    f"Total: *{len(self.poms)}*\n",
+                    f"Total: *{self.summary.total}*\n",
                 ]
 
+            if designated_poms:
+                spacer = [] if self.desc else [ZERO_WIDTH_SPACE]
+                room = max_length - len("\n".join(["", *spacer, *totals_lines]))
+                designated_lines = [*self._fit_lines(designated_poms, room), *spacer]
+            else:
+                designated_lines = ["*No designated poms!*", ""]
+
+            detail_lines = [*designated_lines, *totals_lines]
+
         return EmbedField(
             name=f"**{self.type}**",
             value="\n".join(detail_lines)
         )
 
+    def _get_designated_counts(self) -> List[Tuple[str, int]]:
+        """Return the number of poms of each description, most common first
+        and then by description.
+        """
+        return sorted(((descript, count) for descript, count in self.summary.counts.items()
+                       if descript is not None),
+                      key=lambda item: (-item[1], item[0]))
+
+    def _fit_lines(self, lines: List[str], max_length: int) -> List[str]:
+        """Return as many of `lines` as fit in `max_length` characters, with
+        a final line counting those left out.
+        """
+        length = -1
+
+        for num_lines, line in enumerate(lines):
+            length += len(line) + 1
+
+            if length > max_length:
+                break
+        else:
+            self.num_hidden_descripts = 0
+            return lines
+
+        more = lambda shown: f"*...and {len(lines) - shown:,} more*"
+
+        while num_lines and len("\n".join([*lines[:num_lines], more(num_lines)])) > max_length:
+            num_lines -= 1
+
+        self.num_hidden_descripts = len(lines) - num_lines
+
+        return [*lines[:num_lines], more(num_lines)]
+
     def get_duration_message(self) -> str:
         """Return the time spent pomming this session as a dynamic string."""
         return "Time pommed this session: {}".format(
-            _dynamic_duration(len(self.poms) * Config.POM_LENGTH))
+            _dynamic_duration(self.summary.total * Config.POM_LENGTH))
 
     def get_session_started_message(self) -> Optional[str]:
         """Return a user-facing timestamp of when this session started, or
@@ -333,37 +368,37 @@ class _Session:
         if self.is_public:
             return None
 
-        if not self.poms:
+        if self.summary.first_pom is None:
             return "*Session not yet started.*"
 
         return "Current session started {}".format(
-            self.poms[0].time_set.strftime("%B %d, %Y (%H:%M UTC)"))
+            self.summary.first_pom.time_set.strftime("%B %d, %Y (%H:%M UTC)"))
 
-    def iter_message_field(self, max_length: int) -> Iterator[str]:
-        """Generate the list of poms in the field as a plain string of at most
-        `max_length` characters.
+    @staticmethod
+    def get_num_pages(num_hidden: int) -> int:
+        """Return the number of pages needed to list the descriptions left
+        out of the field.
         """
-        code_block_join = lambda s, n="\n": f"```{n.join(s)}```"
-        pom_counts = Counter(pom.descript for pom in self.poms if pom.descript is not None)
-        descripts_and_counts: List[str] = []
-
-        for descript in sorted(pom_counts, key=str.casefold):
-            count = pom_counts[descript]
-            descripts_and_counts += [f"{descript} ({count})"]
-
-            if len(candidate := code_block_join(descripts_and_counts)) < max_length:
-                continue
-
-            # Last item put response candidate just over the limit.
-            last_item = descripts_and_counts.pop()
+        return max(1, -(-num_hidden // Config.POMS_PAGE_SIZE))
 
-            yield code_block_join(descripts_and_counts)
+    async def render_page(self, num_hidden: int, page: int) -> Embed:
+        """Render a page of the descriptions left out of this session's
+        field, which are its least common.
 
-            descripts_and_counts = [last_item]
-
-        # Finally, we need to yield the most recent candidate because the
-        # length of an embed field value is probably smaller than `max_length`.
-        yield candidate
+        @param num_hidden Number of descriptions left out of the field.
+        @param page Index of the page.
+        """
+        hidden_counts = self._get_designated_counts()[-num_hidden:]
+        descript_counts = hidden_counts[page * Config.POMS_PAGE_SIZE:
+                                        (page + 1) * Config.POMS_PAGE_SIZE]
+
+        return create_embed(
+            title=f"{self.type.value} ({page + 1}/{self.get_num_pages(num_hidden)})",
+            description="```{}```".format("\n".join(
+                f"{descript} ({count:,})" for descript, count in descript_counts)),
+            footer=f"React with {Reactions.PREVIOUS_PAGE} or {Reactions.NEXT_PAGE} "
+                   "to see other pages.",
+        )
 
 
 def _dynamic_duration(delta: timedelta) -> str:
@@ -0,0 +1,54 @@
+import copy
+
+from discord.ext.commands import Context
+
+from pombot.config import Reactions
+from pombot.data import Limits
+from pombot.lib.loop_monitor import SamplingProfiler
+from pombot.lib.messages import send_embed_message
+from pombot.lib.outbound import Outbound
+
+NUM_LOCATIONS = 25
+
+
+async def do_profile(ctx: Context, *args):
+    """Run a command under the sampling profiler and DM the results.
+
+    Usage: !profile <command> [<args>...]
+
+    The command is run as though you had typed it yourself, so it will
+    respond, write to the database, etc. as normal. The report lists the
+    source locations seen in the most samples, with the percentage of
+    samples in which they were anywhere on the stack (total) and at the top
+    of it (self).
+
+    This is an admin-only command.
+    """
+    if not args:
+        await Outbound.reply(ctx, "Usage: `!profile <command> [<args>...]`")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
+        return
+
+    message = copy.copy(ctx.message)
+    message.content = ctx.prefix + " ".join(args)
+    profiled_ctx = await ctx.bot.get_context(message)
+
+    if profiled_ctx.command is None or profiled_ctx.command == ctx.command:
+        await Outbound.reply(ctx, f"Cannot profile `{args[0]}`")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
+        return
+
+    with SamplingProfiler() as profiler:
+        await profiled_ctx.command.invoke(profiled_ctx)
+
+    description = "```{}```".format("\n".join(profiler.get_report_lines(NUM_LOCATIONS)))
+
+    if len(description) > Limits.MAX_EMBED_DESCRIPTION:
+        description = description[:Limits.MAX_EMBED_DESCRIPTION - 6] + "...```"
+
+    await send_embed_message(
+        None,
+        title=f"Profile of !{profiled_ctx.command.name}",
+        description=description,
+        _func=ctx.author.send,
+    )
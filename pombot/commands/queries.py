@@ -0,0 +1,57 @@
+from discord.ext.commands import Context
+
+from pombot.config import Reactions
+from pombot.data import Limits
+from pombot.lib.messages import send_embed_message
+from pombot.lib.metrics import QueryStats
+from pombot.lib.outbound import Outbound
+
+DEFAULT_NUM_SHAPES = 10
+MAX_SHAPE_LENGTH = 150
+
+
+async def do_queries(ctx: Context, *args):
+    """Show the database queries taking the most time.
+
+    Usage: !queries [<count>]
+
+    Queries are grouped by their shape, i.e. the SQL statement with all of
+    its arguments removed. For each of the top <count> shapes (default 10)
+    by total time, show the number of calls, total and maximum time, and the
+    number of rows read or written.
+
+    This is an admin-only command.
+    """
+    try:
+        count = int(args[0]) if args else DEFAULT_NUM_SHAPES
+    except ValueError:
+        await Outbound.reply(ctx, f"Invalid count: `{args[0]}`")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
+        return
+
+    entries = []
+
+    for shape in QueryStats.get_top_shapes(count):
+        sql = shape.shape if len(shape.shape) <= MAX_SHAPE_LENGTH \
+            else shape.shape[:MAX_SHAPE_LENGTH - 3] + "..."
+
+        entries.append("{calls:,} calls, {total:.0f} ms total, {max:.0f} ms max, "
+                       "{rows:,} rows\n{sql}".format(
+                           calls=shape.calls,
+                           total=shape.total_time * 1000,
+                           max=shape.max_time * 1000,
+                           rows=shape.rows,
+                           sql=sql))
+
+    description = "```{}```".format("\n\n".join(entries) or "No queries recorded yet.")
+
+    if len(description) > Limits.MAX_EMBED_DESCRIPTION:
+        description = description[:Limits.MAX_EMBED_DESCRIPTION - 6] + "...```"
+
+    await send_embed_message(
+        None,
+        title="Query Shapes",
+        description=description,
+        _func=ctx.author.send,
+    )
+    await Outbound.add_reaction(ctx.message, Reactions.CHECKMARK)
@@ -3,6 +3,7 @@ import textwrap
 from discord.ext.commands.context import Context
 
 from pombot.config import Reactions
+from pombot.lib.outbound import Outbound
 from pombot.lib.storage import Storage
 
 
@@ -25,4 +26,4 @@ async def do_remove_event(ctx: Context, *args):
 
     name = " ".join(args).strip()
     await Storage.delete_event(name)
-    await ctx.message.add_reaction(Reactions.CHECKMARK)
+    await Outbound.add_reaction(ctx.message, Reactions.CHECKMARK)
@@ -0,0 +1,71 @@
+from typing import List
+
+from discord.ext.commands import Context
+
+from pombot.config import Reactions
+from pombot.data import Limits
+from pombot.lib.event_bus import EventBus
+from pombot.lib.messages import EmbedField, Overflow, send_embed_message
+from pombot.lib.metrics import Metrics
+from pombot.lib.read_cache import ReadCache
+from pombot.lib.startup import Startup
+from pombot.lib.outbound import Outbound
+
+
+async def do_stats(ctx: Context):
+    """Show rolling latency and usage stats for each command.
+
+    Times are percentiles over each command's most recent invocations; "db",
+    "rows" and "api" are the mean number of database round-trips, rows
+    fetched and Discord API calls per invocation. Below them, the share of
+    calls to each memoized database read served from its cache or by joining
+    an identical read in flight, how the queued subscribers of `EventBus`
+    keep up and how long each phase of the last startup took.
+
+    Each table is its own field, so that the stats are sent in as many
+    messages as they need.
+
+    This is an admin-only command.
+    """
+    command_lines = Metrics.get_summary_lines()
+
+    if len(command_lines) == 1:
+        command_lines += ["No commands recorded yet."]
+
+    fields = _get_fields("Commands", command_lines)
+
+    for name, lines in (
+        ("Reads",   ReadCache.get_summary_lines()),
+        ("Queues",  EventBus.get_summary_lines()),
+        ("Startup", Startup.get_summary_lines()),
+    ):
+        if len(lines) > 1:
+            fields += _get_fields(name, lines)
+
+    await send_embed_message(
+        None,
+        title="Command Stats",
+        description=None,
+        fields=fields,
+        overflow=Overflow.SPLIT,
+        _func=ctx.author.send,
+    )
+    await Outbound.add_reaction(ctx.message, Reactions.CHECKMARK)
+
+
+def _get_fields(name: str, lines: List[str]) -> List[EmbedField]:
+    """Return the lines as code blocks, split between lines into as many
+    fields as they need.
+    """
+    chunks, chunk = [], []
+    max_length = Limits.MAX_EMBED_FIELD_VALUE - len("``````")
+
+    for line in lines:
+        if chunk and len("\n".join([*chunk, line])) > max_length:
+            chunks.append(chunk)
+            chunk = []
+
+        chunk.append(line[:max_length])
+
+    return [EmbedField(name, "```{}```".format("\n".join(chunk_lines)), False)
+            for chunk_lines in [*chunks, chunk]]
@@ -1,6 +1,7 @@
 from discord.ext.commands import Context
 
 from pombot.config import Reactions
+from pombot.lib.outbound import Outbound
 from pombot.lib.storage import Storage
 from pombot.lib.types import DateRange
 
@@ -26,14 +27,14 @@ async def do_total(ctx: Context, *args):
         try:
             date_range = DateRange(*args[-4:])
         except ValueError as exc:
-            await ctx.reply(exc)
-            await ctx.message.add_reaction(Reactions.ROBOT)
+            await Outbound.reply(ctx, exc)
+            await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
             return
 
-        poms = await Storage.get_poms(date_range=date_range)
-        msg = f"Total amount of poms in range {date_range}: {len(poms)}"
+        num_poms = await Storage.count_poms(date_range=date_range)
+        msg = f"Total amount of poms in range {date_range}: {num_poms}"
     else:
-        poms = await Storage.get_poms()
-        msg = f"Total amount of poms since ever: {len(poms)}"
+        num_poms = await Storage.count_poms()
+        msg = f"Total amount of poms since ever: {num_poms}"
 
-    await ctx.reply(msg)
+    await Outbound.reply(ctx, msg)
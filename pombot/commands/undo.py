@@ -1,26 +1,36 @@
 from discord.ext.commands import Context
 
+from pombot.lib.outbound import Outbound
 from pombot.lib.storage import Storage
+from pombot.lib.undo_stack import UndoStack
 from pombot.config import Reactions
 
 
 async def do_undo(ctx: Context):
     """Undo/remove your latest pom(s)."""
-    try:
-        last_pom, = await Storage.get_poms(user=ctx.author, limit=1)
-    except ValueError:
-        await ctx.send("You don't have any poms to undo!")
-        await ctx.message.add_reaction(Reactions.ROBOT)
+    removed = []
+
+    # Poms on the stack may already be gone, e.g. after !poms.reset.
+    while not removed and (poms := UndoStack.pop(ctx.author)) is not None:
+        removed = await Storage.delete_poms_by_id(user=ctx.author, quantities=dict(poms))
+
+    if not removed:
+        if last_poms := await Storage.get_poms(user=ctx.author, limit=1):
+            removed = await Storage.delete_poms_by_id(
+                user=ctx.author, quantities={pom.pom_id: pom.quantity for pom in last_poms})
+
+    if not removed:
+        await Outbound.send(ctx, "You don't have any poms to undo!")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return
 
-    num_removed = await Storage.delete_poms(user=ctx.author,
-                                            time_set=last_pom.time_set)
+    num_removed = sum(pom.quantity for pom in removed)
 
     msg = "Removed {count} {description} pom{s}.".format(
         count=num_removed,
-        description=last_pom.descript or "*undesignated*",
+        description=removed[0].descript or "*undesignated*",
         s="" if num_removed == 1 else "s"
     )
 
-    await ctx.send(msg)
-    await ctx.message.add_reaction(Reactions.UNDO)
+    await Outbound.send(ctx, msg)
+    await Outbound.add_reaction(ctx.message, Reactions.UNDO)
@@ -30,9 +30,15 @@ class Config:
 
     # Embeds
     EMBED_COLOUR = 0xff6347
+    # Descriptions per page of !poms. Each line is at most DESCRIPTION_LIMIT
+    # characters plus a count, so a page fits in an embed description.
+    POMS_PAGE_SIZE = 40
+    PAGINATOR_TTL = timedelta(minutes=10)
 
     # Errors
     ERRORS_CHANNEL_NAME = os.getenv("ERRORS_CHANNEL_NAME")
+    ERRORS_QUEUE_SIZE = 100
+    ERRORS_BATCH_WINDOW = timedelta(seconds=5)
 
     # Extensions
     EXTENSIONS = [
@@ -42,12 +48,78 @@ class Config:
     # Logging
     LOGFILE = "./errors.txt"
 
+    # Metrics
+    METRICS_WINDOW = 500
+    METRICS_FILE = os.getenv("METRICS_FILE")
+    METRICS_FILE_INTERVAL = timedelta(seconds=15)
+    SNAPSHOT_FILE = os.getenv("SNAPSHOT_FILE")
+    SNAPSHOT_INTERVAL = timedelta(minutes=1)
+    SLOW_QUERY_THRESHOLD = timedelta(
+        milliseconds=int(os.getenv("SLOW_QUERY_THRESHOLD_MS") or 250))
+
+    # Event loop monitor (see Debug.MONITOR_EVENT_LOOP)
+    LOOP_MONITOR_INTERVAL = timedelta(milliseconds=50)
+    LOOP_STALL_THRESHOLD = timedelta(
+        milliseconds=int(os.getenv("LOOP_STALL_THRESHOLD_MS") or 200))
+    LOOP_LAG_REPORT_INTERVAL = timedelta(minutes=5)
+    PROFILER_SAMPLE_INTERVAL = timedelta(milliseconds=1)
+
     # MySQL
     LIVE_DATABASE = os.getenv("MYSQL_DATABASE")
     POMS_TABLE = "poms"
+    SESSIONS_TABLE = "sessions"
+    DESCRIPTIONS_TABLE = "descriptions"
     EVENTS_TABLE = "events"
     USERS_TABLE = "users"
     ACTIONS_TABLE = "actions"
+    SHARED_STATE_TABLE = "shared_state"
+    USER_WRITES_TABLE = "user_writes"
+    MYSQL_POOL_SIZE = 10
+    MYSQL_POOL_RECYCLE = timedelta(hours=1)
+    DESCRIPTION_CACHE_SIZE = 10_000
+    MIGRATION_LOCK_TIMEOUT = timedelta(minutes=10)
+
+    # Memoized Storage reads (see pombot.lib.read_cache). Writes from other
+    # processes are only seen once the TTL expires.
+    READ_CACHE_SIZE = 1_000
+    ACTIONS_READ_TTL = timedelta(seconds=2)
+    USERS_READ_TTL = timedelta(seconds=10)
+    EVENTS_READ_TTL = timedelta(minutes=1)
+
+    # Queued subscribers of Storage's writes (see pombot.lib.event_bus).
+    EVENT_QUEUE_SIZE = 100
+
+    # Rolled-up Pom Wars totals (see pombot.lib.pom_wars.action_totals).
+    # Actions set longer ago than this are assumed to be committed.
+    ACTIONS_SETTLE_TIME = timedelta(minutes=1)
+
+    # Rate limits
+    # Command name: (uses allowed at once, time to regain one use)
+    DEFAULT_RATE_LIMIT = (5, timedelta(seconds=3))
+    COMMAND_RATE_LIMITS = {
+        "pom":    (10, timedelta(seconds=1)),
+        "attack": (3,  timedelta(seconds=5)),
+        "defend": (3,  timedelta(seconds=5)),
+    }
+    POM_COALESCE_WINDOW = timedelta(milliseconds=250)
+
+    # !undo (see pombot.lib.undo_stack)
+    UNDO_STACK_DEPTH = 10
+    UNDO_STACK_USERS = 10_000
+
+    # Per-user cache of !poms data (see pombot.lib.user_cache). Sizes are
+    # counted in descriptions.
+    USER_CACHE_USERS = 10_000
+    USER_CACHE_SIZE = 200_000
+
+    # Outbound messages
+    OUTBOUND_IDLE_TIMEOUT = timedelta(minutes=1)
+    OUTBOUND_QUEUE_SIZE = 100
+
+    # Rendering (see pombot.lib.render_pool)
+    RENDER_OFFLOAD_THRESHOLD = 1000
+    RENDER_WORKERS = 2
+    EMBED_CACHE_SIZE = 256
 
     # Restrictions
     ADMIN_ROLES = os.getenv("ADMIN_ROLES").split(",")
@@ -57,6 +129,17 @@ class Config:
         for channel in os.getenv("POM_CHANNEL_NAMES").split(",")
     ]
 
+    # Sharding
+    SHARD_COUNT = int(os.getenv("SHARD_COUNT") or 0)
+    SHARD_PROCESSES = int(os.getenv("SHARD_PROCESSES") or os.cpu_count() or 1)
+    SHARD_RESTART_DELAY = timedelta(seconds=5)
+    SHARD_NOTIFY_DELAY = timedelta(seconds=1)
+
+    # Shared state (see pombot.lib.shared_state). Always on when sharded.
+    SHARE_STATE = SHARD_COUNT > 0 or str2bool(os.getenv("SHARE_STATE", "no"))
+    SHARED_STATE_POLL_INTERVAL = timedelta(seconds=2)
+    USER_WRITES_OVERLAP = 1000  # IDs below the latest seen which are re-read.
+
     # Testing
     TEST_DATABASE = os.getenv("TEST_DATABASE")
 
@@ -67,6 +150,7 @@ class Debug:
     DROP_TABLES_ON_RESTART = str2bool(os.getenv("DROP_TABLES_ON_RESTART", "no"))
     BENCHMARK_POMWAR_ATTACK = str2bool(os.getenv("BENCHMARK_POMWAR_ATTACK", "no"))
     POMS_COMMAND_IS_PUBLIC = str2bool(os.getenv("POMS_COMMAND_IS_PUBLIC", "no"))
+    MONITOR_EVENT_LOOP = str2bool(os.getenv("MONITOR_EVENT_LOOP", "no"))
 
     @classmethod
     def disable(cls) -> None:
@@ -160,6 +244,9 @@ class Reactions:
     CHECKMARK = "✅"
     CROSSED_SWORDS= "⚔"
     ERROR = "🐛"
+    HOURGLASS = "⏳"
+    NEXT_PAGE = "➡️"
+    PREVIOUS_PAGE = "⬅️"
     ROBOT = "🤖"
     SHIELD = "🛡"
     TOMATO = "🍅"
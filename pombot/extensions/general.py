@@ -5,13 +5,14 @@ from discord.ext.commands import Bot
 
 from pombot import commands
 from pombot.config import Config
+from pombot.lib.help_index import HelpIndex
 from pombot.lib.tiny_tools import BotCommand, has_any_role
 
 _log = logging.getLogger(__name__)
 
 
 def setup(bot: Bot):
-    """Load general commands.
+    """Load general commands and index their help.
 
     Do not use this to add event handlers as basic and essential debugging
     and logging will be broken. Instead, add them in bot.main.
@@ -38,6 +39,9 @@ def setup(bot: Bot):
         BotCommand(commands.do_total,        name="total",        **admin),
         BotCommand(commands.do_create_event, name="create_event", **admin),
         BotCommand(commands.do_remove_event, name="remove_event", **admin),
+        BotCommand(commands.do_stats,        name="stats",        **admin),
+        BotCommand(commands.do_queries,      name="queries",      **admin),
+        BotCommand(commands.do_profile,      name="profile",      **admin),
 
         # Tech debt: These commands are slated for removal.
         BotCommand(commands.do_howmany,      name="howmany"),
@@ -45,7 +49,10 @@ def setup(bot: Bot):
         BotCommand(commands.do_reset,        name="reset", hidden=True),
     ]:
         for alias in command.duplicate_aliases:
-            bot.add_command(
-                BotCommand(commands.do_ambiguous_command, name=alias, hidden=True))
+            ambiguous_command = BotCommand(
+                commands.do_ambiguous_command, name=alias, hidden=True)
+            bot.add_command(ambiguous_command)
+            HelpIndex.add(ambiguous_command)
 
         bot.add_command(command)
+        HelpIndex.add(command)
@@ -1,11 +1,12 @@
 from discord.ext.commands.bot import Bot
 
 import pombot.commands.pom_wars as commands
+from pombot.lib.help_index import HelpIndex
 from pombot.lib.tiny_tools import BotCommand
 
 
 def setup(bot: Bot):
-    """Load Pom Wars commands.
+    """Load Pom Wars commands and index their help.
 
     Do not use this to add event handlers as basic and essential debugging
     and logging will be broken. Instead, add them in bot.main.
@@ -17,3 +18,4 @@ def setup(bot: Bot):
         BotCommand(commands.do_defend,  name="defend"),
     ]:
         bot.add_command(command)
+        HelpIndex.add(command)
@@ -1,4 +1,6 @@
 from pombot.handlers.on_command_error import *
+from pombot.handlers.on_guild_channels_changed import *
 from pombot.handlers.on_message import *
+from pombot.handlers.on_raw_reaction_changed import *
 from pombot.handlers.on_ready import *
 from pombot.handlers import pom_wars
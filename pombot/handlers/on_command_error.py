@@ -4,7 +4,9 @@ from typing import Any
 
 from discord.ext.commands import Context, errors as discord_errors
 
-from pombot.config import Config, Reactions
+from pombot.config import Reactions
+from pombot.lib.error_reporter import ErrorReporter
+from pombot.lib.outbound import Outbound
 
 _log = logging.getLogger(__name__)
 
@@ -34,8 +36,8 @@ async def on_command_error(ctx: Context, error: Any):
             "(╯°□°）╯︵ ¡ƃuoɹʍ ʇuǝʍ ƃuıɥʇǝɯoS",
         ])
 
-        await ctx.message.add_reaction(Reactions.ROBOT)
-        await ctx.send(message)
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
+        await Outbound.send(ctx, message)
         return
 
     for message in error.args:
@@ -47,22 +49,6 @@ async def on_command_error(ctx: Context, error: Any):
         )
 
         _log.error("%s", error_message)
-        await _send_to_errors_channel(ctx, error_message)
+        ErrorReporter.report(ctx.guild, str(message), error_message)
 
-    await ctx.message.add_reaction(Reactions.ERROR)
-
-
-async def _send_to_errors_channel(ctx: Context, message: str):
-    if not Config.ERRORS_CHANNEL_NAME:
-        _log.info("ERRORS_CHANNEL_NAME not configured")
-        return
-
-    if ctx.guild is None:
-        return
-
-    for channel in ctx.guild.channels:
-        if channel.name == Config.ERRORS_CHANNEL_NAME:
-            await channel.send("```\n" + message + "```")
-            break
-    else:
-        _log.info("ERRORS_CHANNEL_NAME not found on context guild")
+    await Outbound.add_reaction(ctx.message, Reactions.ERROR)
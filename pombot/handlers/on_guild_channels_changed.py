@@ -0,0 +1,12 @@
+from discord.ext.commands import Bot
+
+from pombot.lib.error_reporter import ErrorReporter
+from pombot.lib.prefilter import CommandPrefilter
+
+
+async def on_guild_channels_changed(bot: Bot, *_):
+    """Re-resolve the pom and errors channels when a channel is created,
+    renamed or deleted, or when the bot joins or leaves a guild.
+    """
+    CommandPrefilter.update_channels(bot)
+    ErrorReporter.forget_channels()
@@ -0,0 +1,17 @@
+from discord import RawReactionActionEvent
+from discord.ext.commands import Bot
+
+from pombot.lib.paginator import Paginator
+
+
+async def on_raw_reaction_changed(bot: Bot, payload: RawReactionActionEvent):
+    """Flip the page of a paginated message when a reaction is added to or
+    removed from it.
+
+    Removing a reaction counts too, because the bot cannot remove users'
+    reactions in private messages, so users toggle them instead.
+    """
+    if payload.user_id == bot.user.id:
+        return
+
+    await Paginator.flip(payload)
@@ -1,18 +1,34 @@
 import asyncio
 import logging
 import textwrap
+from pathlib import Path
+from time import perf_counter
 
 from discord.ext.commands import Bot
 
 from pombot.state import State
 from pombot.config import Config, Debug, Secrets
+from pombot.lib.metrics import Metrics
+from pombot.lib.outbound import Outbound
+from pombot.lib.prefilter import CommandPrefilter
+from pombot.lib.shards import ShardCoordinator
+from pombot.lib.shared_state import SharedState
+from pombot.lib.snapshot import Snapshot
+from pombot.lib.startup import Startup
 from pombot.lib.storage import Storage
 
 _log = logging.getLogger(__name__)
 
 
 async def on_ready(bot: Bot):
-    """Startup procedure after bot has logged into Discord."""
+    """Startup procedure after bot has logged into Discord.
+
+    The independent phases of warming up run concurrently, and each is timed
+    by `Startup`. On reconnects, only the phases which depend on the guilds
+    the bot is in run again.
+    """
+    started = perf_counter()
+
     _log.info("MYSQL_DATABASE: %s", Secrets.MYSQL_DATABASE)
 
     State.event_loop = asyncio.get_event_loop()
@@ -21,6 +37,8 @@ async def on_ready(bot: Bot):
 
     _log.info("POM_CHANNEL_NAMES: %s", active_channels or "ALL CHANNELS")
 
+    Outbound.start()
+
     if debug_options_enabled := ", ".join([k for k, v in vars(Debug).items() if v is True]):
         debug_enabled_message = textwrap.dedent(f"""\
             ************************************************************
@@ -31,6 +49,30 @@ async def on_ready(bot: Bot):
         for line in debug_enabled_message.split("\n"):
             _log.info(line)
 
+    await asyncio.gather(
+        Startup.run("channels", _update_prefilter(bot), repeat=True),
+        Startup.run("database", _prepare_database(bot)),
+        Startup.run("caches", _preload_caches()),
+    )
+
+    SharedState.start()
+
+    if Config.METRICS_FILE:
+        path = ShardCoordinator.get_process_path(Path(Config.METRICS_FILE))
+        _log.info("METRICS_FILE: %s", path)
+        Metrics.start_prometheus_file_writer(path)
+
+    _log.info("READY ON DISCORD AS: %s (in %.2fs)", bot.user, perf_counter() - started)
+
+
+async def _update_prefilter(bot: Bot):
+    """Find the commands and pom channels which messages are filtered by."""
+    CommandPrefilter.update_commands(bot)
+    CommandPrefilter.update_channels(bot)
+
+
+async def _prepare_database(bot: Bot):
+    """Create and migrate the tables, and empty them if configured to."""
     await Storage.create_tables_if_not_exists()
 
     if Debug.DROP_TABLES_ON_RESTART:
@@ -44,4 +86,19 @@ async def on_ready(bot: Bot):
 
         await Storage.delete_all_rows_from_all_tables()
 
-    _log.info("READY ON DISCORD AS: %s", bot.user)
+
+async def _preload_caches():
+    """Restore the snapshot and read what the first commands will need, once
+    the tables are ready.
+    """
+    await Startup.wait_for("database")
+
+    preloads = [Storage.get_ongoing_events()]
+
+    if Config.SNAPSHOT_FILE:
+        path = ShardCoordinator.get_process_path(Path(Config.SNAPSHOT_FILE))
+        _log.info("SNAPSHOT_FILE: %s", path)
+        preloads.append(Snapshot.start(path,
+                                       restore=not Debug.DROP_TABLES_ON_RESTART))
+
+    await asyncio.gather(*preloads)
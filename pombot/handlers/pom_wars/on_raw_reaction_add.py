@@ -8,7 +8,6 @@ from discord.ext.commands import Bot
 from discord.guild import Guild
 
 import pombot.lib.pom_wars.errors as war_crimes
-from pombot.state import State
 from pombot.config import Pomwars, Reactions, TIMEZONES
 from pombot.lib.messages import send_embed_message
 from pombot.lib.pom_wars.team import Team
@@ -79,8 +78,6 @@ async def on_raw_reaction_add(bot: Bot, payload: RawReactionActionEvent):
         role, = [r for r in guild.roles if r.name == team.value]
         await payload.member.add_roles(role)
 
-        await State.scoreboard.update()
-
     if payload.emoji.name in TIMEZONES:
         user = await Storage.get_user_by_id(payload.user_id)
         if not user:
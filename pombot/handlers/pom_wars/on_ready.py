@@ -4,22 +4,41 @@ from discord.ext.commands import Bot
 
 from pombot.config import Pomwars
 from pombot.state import State
-from pombot.lib.pom_wars.scoreboard import Scoreboard
+from pombot.lib.event_bus import ActionRecorded, EventBus, TeamChanged, UserJoined
+from pombot.lib.pom_wars.scoreboard import SCOREBOARD_STATE, Scoreboard
+from pombot.lib.shared_state import SharedState
+from pombot.lib.startup import Startup
 
 _log = logging.getLogger(__name__)
 
 
 async def on_ready(bot: Bot):
-    """Find and remember the static scoreboard for all connected guilds."""
-    channels = []
-
-    for guild in bot.guilds:
-        for channel in guild.channels:
-            if channel.name == Pomwars.JOIN_CHANNEL_NAME:
-                channels.append(channel)
+    """Find and remember the static scoreboard for all connected guilds, and
+    update it once the caches are warm.
+    """
+    channels = [
+        channel
+        for guild in bot.guilds
+        for channel in guild.channels
+        if channel.name == Pomwars.JOIN_CHANNEL_NAME
+    ]
 
     State.scoreboard = Scoreboard(bot, channels)
-    full_channels, restricted_channels = await State.scoreboard.update()
+
+    SharedState.subscribe(
+        SCOREBOARD_STATE, lambda stats: State.scoreboard.update(stats, share=False))
+
+    # Each update recounts the totals, so a backlog of changes only needs one.
+    EventBus.subscribe_queue(
+        "scoreboard",
+        (ActionRecorded, UserJoined, TeamChanged),
+        lambda event: State.scoreboard.update(),
+        coalesce=True,
+    )
+
+    await Startup.wait_for("caches")
+    full_channels, restricted_channels = await Startup.run(
+        "scoreboard", State.scoreboard.update(share=False), repeat=True)
 
     for channel in full_channels:
         _log.error("Join channel '%s' on '%s' is not empty",
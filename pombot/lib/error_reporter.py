@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import discord
+from discord import Guild, TextChannel
+
+from pombot.config import Config
+from pombot.data import Limits
+
+_log = logging.getLogger(__name__)
+
+
+class ErrorReporter:
+    """Forward errors to each guild's ERRORS_CHANNEL_NAME without blocking
+    the command which hit them.
+
+    Reports are queued and sent by a single background task. Reports arriving
+    within ERRORS_BATCH_WINDOW of each other are sent as one message per
+    guild, with identical errors collapsed into a single line and a count.
+    When the queue is full, new reports are dropped (they are still in the
+    log) and the number dropped is included in the next message.
+    """
+    _queue: Optional[asyncio.Queue] = None
+    _worker: Optional[asyncio.Task] = None
+    _channel_ids: Dict[int, Optional[int]] = {}
+    dropped = 0
+    _dropped_since_last_send = 0
+
+    @classmethod
+    def report(cls, guild: Optional[Guild], error: str, details: str):
+        """Queue an error for the errors channel of `guild`.
+
+        @param guild The guild on which the error happened, if any.
+        @param error The error itself; used to de-duplicate reports.
+        @param details The full message to show for the first report of
+            this error in a batch.
+        """
+        if guild is None:
+            return
+
+        if not Config.ERRORS_CHANNEL_NAME:
+            _log.info("ERRORS_CHANNEL_NAME not configured")
+            return
+
+        if cls._worker is None or cls._worker.done():
+            cls._queue = asyncio.Queue(maxsize=Config.ERRORS_QUEUE_SIZE)
+            cls._worker = asyncio.create_task(cls._send_forever())
+
+        try:
+            cls._queue.put_nowait((guild, error, details))
+        except asyncio.QueueFull:
+            cls.dropped += 1
+            cls._dropped_since_last_send += 1
+
+    @classmethod
+    def get_errors_channel(cls, guild: Guild) -> Optional[TextChannel]:
+        """Return the errors channel on `guild`, resolving it only when it
+        is not cached or has since been renamed or deleted.
+
+        Guilds without an errors channel are cached too, until
+        `forget_channels` is called.
+        """
+        if guild.id in cls._channel_ids:
+            if (channel_id := cls._channel_ids[guild.id]) is None:
+                return None
+
+            channel = guild.get_channel(channel_id)
+
+            if channel is not None and channel.name == Config.ERRORS_CHANNEL_NAME:
+                return channel
+
+        channel = discord.utils.get(guild.text_channels, name=Config.ERRORS_CHANNEL_NAME)
+        cls._channel_ids[guild.id] = channel.id if channel else None
+
+        return channel
+
+    @classmethod
+    def forget_channels(cls):
+        """Resolve every errors channel again on its next use, e.g. when
+        channels have been created, renamed or deleted.
+        """
+        cls._channel_ids.clear()
+
+    @classmethod
+    async def _send_forever(cls):
+        window = Config.ERRORS_BATCH_WINDOW.total_seconds()
+
+        while True:
+            batch = [await cls._queue.get()]
+            deadline = time.monotonic() + window
+
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(cls._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            dropped, cls._dropped_since_last_send = cls._dropped_since_last_send, 0
+
+            for guild, reports in cls._group_by_guild(batch).items():
+                await cls._send_batch(guild, reports, dropped)
+
+    @staticmethod
+    def _group_by_guild(batch: List[Tuple[Guild, str, str]]) -> Dict[Guild, list]:
+        grouped: Dict[Guild, Dict[str, str]] = {}
+        counts: Dict[Guild, Counter] = {}
+
+        for guild, error, details in batch:
+            grouped.setdefault(guild, {}).setdefault(error, details)
+            counts.setdefault(guild, Counter())[error] += 1
+
+        return {
+            guild: [(details, counts[guild][error]) for error, details in errors.items()]
+            for guild, errors in grouped.items()
+        }
+
+    @classmethod
+    async def _send_batch(cls, guild: Guild, reports: List[Tuple[str, int]], dropped: int):
+        if (channel := cls.get_errors_channel(guild)) is None:
+            _log.info("ERRORS_CHANNEL_NAME not found on guild %s", guild)
+            return
+
+        lines = [details if count == 1 else f"{details} (x{count})"
+                 for details, count in reports]
+
+        if dropped:
+            lines.append(f"{dropped} more errors were dropped; see the log.")
+
+        message = "```\n" + "\n".join(lines) + "```"
+
+        if len(message) > Limits.MAX_CHARACTERS_PER_MESSAGE:
+            message = message[:Limits.MAX_CHARACTERS_PER_MESSAGE - 6] + "...```"
+
+        try:
+            await channel.send(message)
+        except discord.DiscordException as exc:
+            # Sending errors about failing to send errors helps nobody.
+            _log.error("Could not send to errors channel on %s: %s", guild, exc)
+            cls._channel_ids.pop(guild.id, None)
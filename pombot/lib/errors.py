@@ -25,3 +25,10 @@ class PomDescriptionError(Exception):
 
 class DescriptionTooLongError(PomDescriptionError):
     "Too many characters in pom description."
+
+
+class EmbedTooLargeError(Exception):
+    "Embed exceeds Discord's size limits."
+    def __init__(self, msg = None):
+        super().__init__(msg or self.__class__.__doc__)
+        self.msg = msg
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from pombot.config import Config
+from pombot.lib.types import ActionType
+
+_log = logging.getLogger(__name__)
+
+EventTypes = Union[Type, Tuple[Type, ...]]
+
+
+@dataclass(frozen=True)
+class PomsAdded:
+    """A user added poms to their current session."""
+    user_id: int
+    pom_ids: Tuple[int, ...]
+    count: int
+    time_set: datetime
+
+
+@dataclass(frozen=True)
+class SessionBanked:
+    """A user moved their current session to their bank."""
+    user_id: int
+    count: int
+
+
+@dataclass(frozen=True)
+class PomsDeleted:
+    """A user removed some of their poms."""
+    user_id: int
+    count: int
+
+
+@dataclass(frozen=True)
+class PomsRenamed:
+    """A user changed the description of some of their poms."""
+    user_id: int
+    count: int
+
+
+@dataclass(frozen=True)
+class ActionRecorded:
+    """A user attacked or defended during Pom Wars."""
+    user_id: int
+    team: str
+    action_type: ActionType
+    was_successful: bool
+    damage: float
+
+
+@dataclass(frozen=True)
+class UserJoined:
+    """A user joined a Pom Wars team."""
+    user_id: int
+    team: str
+
+
+@dataclass(frozen=True)
+class TeamChanged:
+    """A user was moved to another Pom Wars team."""
+    user_id: int
+    team: str
+
+
+@dataclass(frozen=True)
+class TimezoneChanged:
+    """A user set their timezone."""
+    user_id: int
+
+
+@dataclass(frozen=True)
+class PomEventsChanged:
+    """A pom event was scheduled or deleted."""
+
+
+@dataclass(frozen=True)
+class TablesCleared:
+    """Every row of every table was deleted."""
+
+
+# Events of writes to a user's data, which drop the values cached for them.
+USER_WRITES = (PomsAdded, SessionBanked, PomsDeleted, PomsRenamed, ActionRecorded)
+
+
+@dataclass
+class QueueStats:
+    """How one queued subscriber kept up with the events sent to it."""
+    delivered: int = 0
+    coalesced: int = 0  # Skipped in favour of a later event in the queue.
+    waits: int = 0      # Publishes which waited for room in the full queue.
+    max_depth: int = 0
+    errors: int = 0
+
+
+class _QueuedSubscriber:
+    """A coroutine subscriber, fed by a bounded queue and a worker task."""
+    def __init__(
+        self,
+        name: str,
+        event_types: EventTypes,
+        handler: Callable[[Any], Awaitable],
+        coalesce: bool,
+        maxsize: int,
+    ):
+        self.name = name
+        self.event_types = event_types
+        self.handler = handler
+        self.coalesce = coalesce
+        self.maxsize = maxsize
+        self.stats = QueueStats()
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+
+    async def put(self, event: Any):
+        """Queue an event, waiting for room if the queue is full."""
+        if (self.worker is None or self.worker.done() or
+                self.worker.get_loop() is not asyncio.get_running_loop()):
+            self.queue = asyncio.Queue(maxsize=self.maxsize)
+            self.worker = asyncio.create_task(self._work_forever(self.queue))
+
+        if self.queue.full():
+            self.stats.waits += 1
+
+        await self.queue.put(event)
+        self.stats.max_depth = max(self.stats.max_depth, self.queue.qsize())
+
+    def stop(self):
+        """Cancel the worker, dropping any events still queued."""
+        if self.worker is not None:
+            self.worker.cancel()
+
+    async def _work_forever(self, queue: asyncio.Queue):
+        while True:
+            event = await queue.get()
+
+            while self.coalesce and not queue.empty():
+                event = queue.get_nowait()
+                self.stats.coalesced += 1
+
+            try:
+                await self.handler(event)
+            except Exception:  # pylint: disable=broad-except
+                self.stats.errors += 1
+                _log.exception("Subscriber %s failed to handle %s", self.name, event)
+
+            self.stats.delivered += 1
+
+
+class EventBus:
+    """In-process publish/subscribe of the changes `Storage` makes.
+
+    Every `Storage` write publishes a typed event once it is committed.
+    Subscribers either:
+
+        - Handle it before `publish` returns, with `subscribe`. These must be
+          quick, in-memory updates, like invalidating a cache, which the
+          writer relies on when it reads again.
+
+        - Handle it later in a worker task, with `subscribe_queue`. Each such
+          subscriber has a bounded queue; when it is full, publishing waits
+          for room, which slows writers down to the pace of the subscriber
+          instead of buffering without limit.
+
+    Other processes don't see these events, so subscribers which need to
+    follow their writes still rely on `ShardCoordinator` or `SharedState`.
+    """
+    _handlers: List[Tuple[EventTypes, Callable[[Any], None]]] = []
+    _subscribers: Dict[str, _QueuedSubscriber] = {}
+
+    @classmethod
+    def subscribe(cls, event_types: EventTypes, handler: Callable[[Any], None]):
+        """Call `handler` with each event of these types as it is published.
+
+        @param event_types An event class, or a tuple of them.
+        @param handler A function taking the event.
+        """
+        cls._handlers.append((event_types, handler))
+
+    @classmethod
+    def subscribe_queue(
+        cls,
+        name: str,
+        event_types: EventTypes,
+        handler: Callable[[Any], Awaitable],
+        *,
+        coalesce: bool = False,
+        maxsize: int = None,
+    ):
+        """Await `handler` with each event of these types in a worker task.
+
+        A queued subscriber is identified by its name; subscribing again
+        replaces its handler and options, but keeps the events queued for it,
+        so that it is safe to subscribe from `on_ready`. The handler must not
+        publish events it subscribes to, or it could wait on its own full
+        queue.
+
+        @param name Name of the subscriber, as shown by `get_summary_lines`.
+        @param event_types An event class, or a tuple of them.
+        @param handler A coroutine function taking the event.
+        @param coalesce Whether to skip straight to the latest of the events
+            queued, for handlers which only need to know that something
+            changed, like a refresh.
+        @param maxsize Size of the queue; Config.EVENT_QUEUE_SIZE by default.
+            A queue already created keeps its size.
+        """
+        maxsize = maxsize or Config.EVENT_QUEUE_SIZE
+
+        if (subscriber := cls._subscribers.get(name)) is not None:
+            subscriber.event_types = event_types
+            subscriber.handler = handler
+            subscriber.coalesce = coalesce
+            subscriber.maxsize = maxsize
+            return
+
+        cls._subscribers[name] = _QueuedSubscriber(name, event_types, handler, coalesce, maxsize)
+
+    @classmethod
+    async def publish(cls, event: Any):
+        """Deliver an event to its subscribers."""
+        for event_types, handler in cls._handlers:
+            if isinstance(event, event_types):
+                handler(event)
+
+        for subscriber in list(cls._subscribers.values()):
+            if isinstance(event, subscriber.event_types):
+                await subscriber.put(event)
+
+    @classmethod
+    def unsubscribe_queues(cls):
+        """Remove every queued subscriber, dropping the events it has yet to
+        handle.
+        """
+        for subscriber in cls._subscribers.values():
+            subscriber.stop()
+
+        cls._subscribers = {}
+
+    @classmethod
+    def get_summary_lines(cls) -> List[str]:
+        """Return a human-readable table of how each queued subscriber kept
+        up.
+        """
+        lines = ["{:<14}{:>9}{:>7}{:>7}{:>7}{:>7}".format(
+            "subscriber", "events", "skip", "waits", "depth", "errors")]
+
+        for name in sorted(cls._subscribers):
+            stats = cls._subscribers[name].stats
+
+            lines.append("{:<14}{:>9,}{:>7,}{:>7,}{:>7,}{:>7,}".format(
+                name[:13],
+                stats.delivered,
+                stats.coalesced,
+                stats.waits,
+                stats.max_depth,
+                stats.errors,
+            ))
+
+        return lines
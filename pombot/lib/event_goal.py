@@ -0,0 +1,59 @@
+from time import monotonic
+from typing import Optional, Union
+
+from pombot.config import Config
+from pombot.lib.event_bus import EventBus, PomsAdded, PomsDeleted, TablesCleared
+from pombot.lib.storage import Storage
+from pombot.lib.types import DateRange
+
+
+class EventGoal:
+    """Running count of the poms added during an event, so that `!pom` does
+    not count every pom of the event again each time.
+
+    The count is read from the database when it is first needed, when the
+    event changes, after any poms are deleted and otherwise at least every
+    EVENTS_READ_TTL, which picks up the poms added by other processes. In
+    between, the poms added by this process are added to it as `EventBus`
+    publishes them.
+    """
+    _date_range: Optional[DateRange] = None
+    _count: Optional[int] = None
+    _counted_at = 0.0
+    _version = 0
+
+    @classmethod
+    async def count_poms(cls, date_range: DateRange) -> int:
+        """Return the number of poms of all users within the date range."""
+        if (cls._count is not None and cls._date_range == date_range and
+                monotonic() - cls._counted_at < Config.EVENTS_READ_TTL.total_seconds()):
+            return cls._count
+
+        version = cls._version
+        count = await Storage.count_poms(date_range=date_range)
+
+        if version == cls._version:
+            cls._date_range, cls._count, cls._counted_at = date_range, count, monotonic()
+        else:
+            # Poms were added or deleted while counting, which may or may not
+            # have counted them.
+            cls._count = None
+
+        return count
+
+    @classmethod
+    def _on_poms_added(cls, event: PomsAdded):
+        cls._version += 1
+
+        if (cls._count is not None and
+                cls._date_range.start_date <= event.time_set <= cls._date_range.end_date):
+            cls._count += event.count
+
+    @classmethod
+    def _on_poms_deleted(cls, _event: Union[PomsDeleted, TablesCleared]):
+        cls._version += 1
+        cls._count = None
+
+
+EventBus.subscribe(PomsAdded, EventGoal._on_poms_added)
+EventBus.subscribe((PomsDeleted, TablesCleared), EventGoal._on_poms_deleted)
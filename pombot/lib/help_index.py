@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import discord
+from discord.ext.commands import Command, Context
+from discord.ext.commands.errors import CheckFailure
+
+from pombot.config import Config
+from pombot.lib.messages import EmbedField
+from pombot.lib.tiny_tools import has_any_role, normalize_newlines
+
+OFFSET = " " * 2
+
+
+@dataclass(frozen=True)
+class CommandHelp:
+    """The pre-rendered help of a single command.
+
+    @param roles_needed Names or IDs of the roles of which the user needs
+        any to run the command, or None when no role is needed.
+    @param other_checks Any checks which could not be turned into role
+        requirements, to be run whenever the help is shown.
+    """
+    name: str
+    extension: str
+    hidden: bool
+    summary: str
+    field: EmbedField
+    roles_needed: Optional[FrozenSet]
+    other_checks: Tuple[Callable, ...]
+
+    @classmethod
+    def from_command(cls, command: Command) -> "CommandHelp":
+        """Render the help of `command` and extract its role requirements."""
+        roles_needed, other_checks = None, []
+
+        for check in command.checks:
+            if isinstance(check, partial) and check.func is has_any_role:
+                roles = frozenset(check.keywords.get("roles_needed") or [])
+                roles_needed = roles if roles_needed is None else roles_needed & roles
+            else:
+                other_checks.append(check)
+
+        return cls(
+            name=command.name,
+            extension=command.extension,
+            hidden=command.hidden,
+            summary=f"{OFFSET}{command.name}: {command.short_doc}",
+            field=EmbedField(name=Config.PREFIX + command.name,
+                             value="```" + normalize_newlines(command.help) + "```",
+                             inline=False),
+            roles_needed=roles_needed,
+            other_checks=tuple(other_checks),
+        )
+
+    def is_restricted(self) -> bool:
+        """Return whether only some users can see this command."""
+        return self.roles_needed is not None or bool(self.other_checks)
+
+    def is_available(self, ctx: Context, user_roles: FrozenSet) -> bool:
+        """Return whether the user of `ctx`, with the given role names and
+        IDs, can run this command.
+        """
+        if self.roles_needed is not None and not self.roles_needed & user_roles:
+            return False
+
+        try:
+            for check in self.other_checks:
+                check(ctx)
+        except CheckFailure:
+            return False
+
+        return True
+
+
+class HelpIndex:
+    """Help of every command, rendered once when the command is loaded."""
+    _commands: Dict[str, CommandHelp] = {}
+    _overview: Optional[List[Tuple[str, List[CommandHelp]]]] = None
+
+    @classmethod
+    def add(cls, command: Command):
+        """Render and index the help of a newly added command."""
+        cls._commands[command.name.casefold()] = CommandHelp.from_command(command)
+        cls._overview = None
+
+    @classmethod
+    def get(cls, name: str) -> Optional[CommandHelp]:
+        """Return the help of the command called `name`, if there is one."""
+        return cls._commands.get(name.casefold())
+
+    @staticmethod
+    def get_user_roles(ctx: Context) -> Optional[FrozenSet]:
+        """Return the names and IDs of the roles of the user of `ctx`, or None
+        in private messages, where users have no roles.
+        """
+        if not isinstance(ctx.channel, discord.abc.GuildChannel):
+            return None
+
+        return frozenset(attr
+                         for role in ctx.author.roles
+                         for attr in (role.name, role.id))
+
+    @classmethod
+    def get_overview_lines(cls, ctx: Context) -> Optional[List[str]]:
+        """Return the summaries of the commands available to the user of
+        `ctx`, grouped by extension, or None in private messages.
+        """
+        if cls._overview is None:
+            groups: Dict[str, List[CommandHelp]] = {}
+
+            for help_ in cls._commands.values():
+                if not help_.hidden:
+                    groups.setdefault(help_.extension, []).append(help_)
+
+            cls._overview = [
+                (f"\n{group} commands:".title().replace("_", " "),
+                 sorted(groups[group], key=lambda h: h.name))
+                for group in sorted(groups)
+            ]
+
+        if (user_roles := cls.get_user_roles(ctx)) is None:
+            if any(h.is_restricted() for _, helps in cls._overview for h in helps):
+                return None
+
+        lines = []
+
+        for title, helps in cls._overview:
+            if available := [h.summary for h in helps
+                             if not h.is_restricted() or h.is_available(ctx, user_roles)]:
+                lines += [title, *available]
+
+        return lines
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import List, Optional
+
+from pombot.config import Config
+from pombot.lib.metrics import RollingSummary
+
+_log = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Opt-in watchdog for the event loop.
+
+    A heartbeat task on the loop measures how late it wakes up (the loop
+    lag). A separate thread watches the heartbeat; when it stops beating for
+    longer than LOOP_STALL_THRESHOLD, the loop is stuck in a single callback
+    and the thread logs the loop's current stack, i.e. the culprit.
+    """
+    lag = RollingSummary(Config.METRICS_WINDOW)
+
+    _loop_thread_id: Optional[int] = None
+    _last_beat: float = 0.0
+    _heartbeat: Optional[asyncio.Task] = None
+
+    @classmethod
+    def start(cls, loop: asyncio.AbstractEventLoop):
+        """Start monitoring the loop. Has no effect if already started."""
+        if cls._heartbeat is not None:
+            return
+
+        cls._last_beat = time.monotonic()
+        cls._heartbeat = loop.create_task(cls._beat_forever())
+
+        threading.Thread(target=cls._watch_forever,
+                         name="loop-monitor",
+                         daemon=True).start()
+
+    @classmethod
+    async def _beat_forever(cls):
+        interval = Config.LOOP_MONITOR_INTERVAL.total_seconds()
+        last_report = time.monotonic()
+        cls._loop_thread_id = threading.get_ident()
+
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(interval)
+            cls._last_beat = now = time.monotonic()
+            cls.lag.add(max(0.0, now - before - interval))
+
+            if now - last_report >= Config.LOOP_LAG_REPORT_INTERVAL.total_seconds():
+                last_report = now
+                _log.info("Event loop lag: p50 %.1f ms, p99 %.1f ms",
+                          cls.lag.quantile(0.5) * 1000,
+                          cls.lag.quantile(0.99) * 1000)
+
+    @classmethod
+    def _watch_forever(cls):
+        threshold = Config.LOOP_STALL_THRESHOLD.total_seconds()
+        interval = Config.LOOP_MONITOR_INTERVAL.total_seconds()
+        stalled_since = None
+
+        while True:
+            time.sleep(interval)
+            last_beat = cls._last_beat
+            stalled_for = time.monotonic() - last_beat - interval
+
+            if stalled_for < threshold:
+                if stalled_since is not None:
+                    _log.warning("Event loop unblocked after %.0f ms",
+                                 (time.monotonic() - stalled_since) * 1000)
+                    stalled_since = None
+                continue
+
+            if stalled_since is not None:
+                # Already reported this stall.
+                continue
+
+            stalled_since = last_beat
+            frame = sys._current_frames().get(cls._loop_thread_id)  # pylint: disable=protected-access
+            stack = "".join(traceback.format_stack(frame)) if frame else "(unknown)\n"
+
+            _log.warning("Event loop blocked for over %.0f ms in:\n%s",
+                         stalled_for * 1000, stack)
+
+
+class SamplingProfiler:
+    """Statistical profiler for the code running on the current thread.
+
+    While active, a background thread samples the stack of the thread which
+    entered the profiler every PROFILER_SAMPLE_INTERVAL. Frames of the
+    functions below the one entering the profiler are left out, which
+    includes the event loop's own, as its frames are new on each iteration;
+    samples taken while the profiled code is awaiting something therefore
+    show whatever else the event loop was doing, or its selector if it was
+    idle.
+    """
+    def __init__(self):
+        self.samples = 0
+        self.inclusive: Counter = Counter()
+        self.exclusive: Counter = Counter()
+
+        self._thread_id = None
+        self._outer_codes = set()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._outer_codes = {f.f_code for f, _ in traceback.walk_stack(sys._getframe(1).f_back)}  # pylint: disable=protected-access
+        self._sampler = threading.Thread(target=self._sample, name="profiler", daemon=True)
+        self._sampler.start()
+
+        return self
+
+    def __exit__(self, *_):
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self):
+        interval = Config.PROFILER_SAMPLE_INTERVAL.total_seconds()
+
+        while not self._stop.wait(interval):
+            if (frame := sys._current_frames().get(self._thread_id)) is None:  # pylint: disable=protected-access
+                continue
+
+            stack = [f"{f.f_code.co_filename}:{f.f_lineno} ({f.f_code.co_name})"
+                     for f, _ in traceback.walk_stack(frame)
+                     if f.f_code not in self._outer_codes] or ["(event loop)"]
+
+            self.samples += 1
+            self.exclusive[stack[0]] += 1
+            self.inclusive.update(set(stack))
+
+    def get_report_lines(self, count: int) -> List[str]:
+        """Return a table of the `count` locations present in the most samples."""
+        lines = [f"{self.samples} samples",
+                 "{:>6} {:>6}  {}".format("total", "self", "location")]
+
+        # Every frame below the profiled code is on the stack in all samples,
+        # so break ties by self time to bring the interesting frames up.
+        locations = sorted(self.inclusive.items(),
+                           key=lambda item: (item[1], self.exclusive[item[0]]),
+                           reverse=True)
+
+        for location, num_samples in locations[:count]:
+            filename, _, rest = location.rpartition("/")
+            lines.append("{:>5.1f}% {:>5.1f}%  {}".format(
+                100 * num_samples / max(self.samples, 1),
+                100 * self.exclusive[location] / max(self.samples, 1),
+                rest if filename else location,
+            ))
+
+        return lines
@@ -1,10 +1,21 @@
-from typing import Callable, NamedTuple, Optional
+from collections import OrderedDict
+from enum import Enum, auto
+from typing import Callable, Hashable, List, NamedTuple, Optional
 
 from discord.embeds import Embed, EmptyEmbed
 from discord.ext.commands import Context
 from discord.message import Message
 
 from pombot.config import Config, IconUrls
+from pombot.data import Limits
+from pombot.lib.errors import EmbedTooLargeError
+
+ELLIPSIS = "\u2026"
+CONTINUED = " (cont.)"
+
+# Embeds already built by `send_embed_message`, keyed by their content, least
+# recently used first.
+_embeds: "OrderedDict[Hashable, List[Embed]]" = OrderedDict()
 
 
 class EmbedField(NamedTuple):
@@ -14,6 +25,200 @@ class EmbedField(NamedTuple):
     inline: bool = True
 
 
+class Overflow(Enum):
+    """What to do with an embed which exceeds Discord's limits."""
+    RAISE = auto()     # Raise EmbedTooLargeError instead of sending it.
+    TRUNCATE = auto()  # Cut the text which doesn't fit short.
+    SPLIT = auto()     # Split long fields and send as many embeds as needed.
+
+
+class _EmbedText(NamedTuple):
+    """The parts of an embed which count towards Discord's limits."""
+    title: str
+    description: Optional[str]
+    fields: List[EmbedField]
+    footer: Optional[str]
+
+    def get_length(self) -> int:
+        """Return the number of characters counted towards the total limit."""
+        return sum(len(text or "") for text in (
+            self.title,
+            self.description,
+            self.footer,
+            *(text for field in self.fields for text in field[:2]),
+        ))
+
+    def get_problems(self) -> List[str]:
+        """Return a description of every limit this embed exceeds."""
+        problems = [
+            f"{name} is {len(text):,} characters (max {max_length:,})"
+            for name, text, max_length in (
+                ("title",       self.title,       Limits.MAX_EMBED_TITLE),
+                ("description", self.description, Limits.MAX_EMBED_DESCRIPTION),
+                ("footer",      self.footer,      Limits.MAX_EMBED_FOOTER_TEXT),
+                *((f"fields[{index}].{attr}", getattr(field, attr), max_length)
+                  for index, field in enumerate(self.fields)
+                  for attr, max_length in (("name",  Limits.MAX_EMBED_FIELD_NAME),
+                                           ("value", Limits.MAX_EMBED_FIELD_VALUE))),
+            )
+            if text and len(text) > max_length
+        ]
+
+        if len(self.fields) > Limits.MAX_NUM_EMBED_FIELDS:
+            problems += [f"{len(self.fields)} fields (max {Limits.MAX_NUM_EMBED_FIELDS})"]
+
+        if self.get_length() > Limits.MAX_CHARACTERS_PER_EMBED:
+            problems += [f"{self.get_length():,} characters in total "
+                         f"(max {Limits.MAX_CHARACTERS_PER_EMBED:,})"]
+
+        return problems
+
+    def truncate(self) -> "_EmbedText":
+        """Return this embed with any text which doesn't fit cut short,
+        starting from the last field.
+        """
+        fields = [
+            EmbedField(_truncate(name, Limits.MAX_EMBED_FIELD_NAME),
+                       _truncate(value, Limits.MAX_EMBED_FIELD_VALUE),
+                       inline)
+            for name, value, inline in self.fields[:Limits.MAX_NUM_EMBED_FIELDS]
+        ]
+        truncated = self._replace(
+            title=_truncate(self.title, Limits.MAX_EMBED_TITLE),
+            description=_truncate(self.description, Limits.MAX_EMBED_DESCRIPTION),
+            fields=fields,
+            footer=_truncate(self.footer, Limits.MAX_EMBED_FOOTER_TEXT),
+        )
+
+        # `fields` is shared with `truncated`, so its length follows along.
+        for index in reversed(range(len(fields))):
+            if (excess := truncated.get_length() - Limits.MAX_CHARACTERS_PER_EMBED) <= 0:
+                return truncated
+
+            name, value, inline = fields[index]
+            fields[index] = EmbedField(name, _truncate(value, max(1, len(value) - excess)), inline)
+
+        excess = truncated.get_length() - Limits.MAX_CHARACTERS_PER_EMBED
+
+        if excess > 0 and truncated.description:
+            truncated = truncated._replace(description=_truncate(
+                truncated.description, max(1, len(truncated.description) - excess)))
+
+        return truncated
+
+    def split(self) -> List["_EmbedText"]:
+        """Return this embed as a list of embeds which fit.
+
+        Long field values are split between lines into several fields. The
+        first embed keeps the description and the last keeps the footer.
+        """
+        first = self._replace(fields=[], footer=None).truncate()
+        footer = _truncate(self.footer, Limits.MAX_EMBED_FOOTER_TEXT)
+        fields = []
+
+        for name, value, inline in self.fields:
+            name = _truncate(name, Limits.MAX_EMBED_FIELD_NAME - len(CONTINUED))
+
+            for index, chunk in enumerate(_split_lines(value, Limits.MAX_EMBED_FIELD_VALUE)):
+                fields.append(EmbedField(name + CONTINUED if index else name, chunk, inline))
+
+        embeds = [first]
+        room_for_footer = len(footer or "")
+
+        for field in fields:
+            embed = embeds[-1]
+
+            if (len(embed.fields) == Limits.MAX_NUM_EMBED_FIELDS or
+                    embed.get_length() + len(field.name) + len(field.value) + room_for_footer
+                    > Limits.MAX_CHARACTERS_PER_EMBED):
+                embed = _EmbedText(first.title, None, [], None)
+                embeds.append(embed)
+
+            embed.fields.append(field)
+
+        embeds[-1] = embeds[-1]._replace(footer=footer)
+
+        return embeds
+
+
+def _truncate(text: Optional[str], max_length: int) -> Optional[str]:
+    if text is None or len(text) <= max_length:
+        return text
+
+    return text[:max_length - len(ELLIPSIS)] + ELLIPSIS
+
+
+def _split_lines(text: str, max_length: int) -> List[str]:
+    """Split `text` into chunks of at most `max_length` characters, between
+    lines where possible.
+    """
+    chunks, lines, length = [], [], -1
+
+    for line in text.split("\n"):
+        if lines and length + 1 + len(line) > max_length:
+            chunks.append("\n".join(lines))
+            lines, length = [], -1
+
+        while len(line) > max_length:
+            chunks.append(line[:max_length])
+            line = line[max_length:]
+
+        lines.append(line)
+        length += 1 + len(line)
+
+    return [*chunks, "\n".join(lines)]
+
+
+def create_embed(
+        *,
+        title: str,
+        description: Optional[str],
+        colour=Config.EMBED_COLOUR,
+        icon_url=IconUrls.POMBOMB,
+        fields: list = None,
+        footer: str = None,
+        image: str = None,
+        thumbnail: str = None,
+) -> Embed:
+    """Create an embed to send or to edit into a message.
+
+    See `send_embed_message` for the parameters.
+    """
+    # In discord.py==1.7.x there is a defect which handles None as a string.
+    # This a workaround and can likely be removed later.
+    description = description or EmptyEmbed
+
+    message = Embed(
+        description=description,
+        colour=colour,
+    )
+
+    if icon_url:
+        message.set_author(
+            name=title,
+            icon_url=icon_url,
+        )
+    else:
+        message.title=title
+        message.description=description
+        message.colour=colour
+
+    if fields:
+        for field in fields:
+            name, value, inline = field
+            message.add_field(name=name, value=value, inline=inline)
+
+    for content, setter, kwarg in (
+        (image,     message.set_image,     "url"),
+        (footer,    message.set_footer,    "text"),
+        (thumbnail, message.set_thumbnail, "url"),
+    ):
+        if content:
+            setter(**{kwarg: content})
+
+    return message
+
+
 async def send_embed_message(
         ctx: Optional[Context],
         *,
@@ -25,17 +230,28 @@ async def send_embed_message(
         footer: str = None,
         image: str = None,
         thumbnail: str = None,
+        overflow: Overflow = Overflow.RAISE,
         private_message: bool = False,
         _func: Callable = None,
 ) -> Message:
     """Send an embedded message using the context.
 
+    The embed is checked against Discord's limits before it is sent, since
+    Discord would only reject it. Embeds are only built once for the same
+    content while they're among the `Config.EMBED_CACHE_SIZE` most recently
+    sent.
+
     @param ctx Either the context with which to send the response, or None
         when a coroutine is specified via _func.
     @param colour Colour to line the left side of the embed.
+    @param overflow What to do when the embed exceeds Discord's limits.
+        Overflow.SPLIT may send more than one message, so it can't be used
+        to edit a message.
     @param private_messaage Whether or not to send this emabed as a DM to the
         user; does not apply when ctx is None.
     @param _func Coroutine describing how to send the embed.
+    @raises EmbedTooLargeError when the embed exceeds Discord's limits and
+        `overflow` is Overflow.RAISE.
 
     All other parameters:
 
@@ -71,39 +287,38 @@ async def send_embed_message(
     │Footer                                 │
     └───────────────────────────────────────┘
 
-    @return The message object that was sent.
+    @return The (first) message object that was sent.
     """
-    # In discord.py==1.7.x there is a defect which handles None as a string.
-    # This a workaround and can likely be removed later.
-    description = description or EmptyEmbed
+    text = _EmbedText(title=title,
+                      description=description,
+                      fields=[EmbedField(*field) for field in fields or []],
+                      footer=footer)
+    key = (text.title, text.description, tuple(text.fields), text.footer,
+           colour, icon_url, image, thumbnail, overflow)
 
-    message = Embed(
-        description=description,
-        colour=colour,
-    )
-
-    if icon_url:
-        message.set_author(
-            name=title,
-            icon_url=icon_url,
-        )
+    try:
+        embeds = _embeds[key]
+    except TypeError:
+        # Unhashable content, e.g. a colour given as a list, isn't cached.
+        key, embeds = None, None
+    except KeyError:
+        embeds = None
     else:
-        message.title=title
-        message.description=description
-        message.colour=colour
+        _embeds.move_to_end(key)
 
-    if fields:
-        for field in fields:
-            name, value, inline = field
-            message.add_field(name=name, value=value, inline=inline)
+    if embeds is None:
+        embeds = _build_embeds(text,
+                               colour=colour,
+                               icon_url=icon_url,
+                               image=image,
+                               thumbnail=thumbnail,
+                               overflow=overflow)
 
-    for content, setter, kwarg in (
-        (image,     message.set_image,     "url"),
-        (footer,    message.set_footer,    "text"),
-        (thumbnail, message.set_thumbnail, "url"),
-    ):
-        if content:
-            setter(**{kwarg: content})
+        if key is not None:
+            _embeds[key] = embeds
+
+            while len(_embeds) > Config.EMBED_CACHE_SIZE:
+                _embeds.popitem(last=False)
 
     if ctx is None:
         coro = _func
@@ -111,4 +326,39 @@ async def send_embed_message(
         coro = ctx.author.send if private_message else ctx.send
 
     # Allow the TypeError to bubble up when both ctx and _func are None.
-    return await coro(embed=message)
+    messages = [await coro(embed=embed) for embed in embeds]
+
+    return messages[0]
+
+
+def _build_embeds(
+        text: _EmbedText,
+        *,
+        colour,
+        icon_url,
+        image: Optional[str],
+        thumbnail: Optional[str],
+        overflow: Overflow,
+) -> List[Embed]:
+    """Build the embeds to send for `text`, handling any overflow."""
+    texts = [text]
+
+    if problems := text.get_problems():
+        if overflow == Overflow.RAISE:
+            raise EmbedTooLargeError("Embed too large: " + ", ".join(problems))
+
+        texts = [text.truncate()] if overflow == Overflow.TRUNCATE else text.split()
+
+    return [
+        create_embed(
+            title=text.title,
+            description=text.description,
+            colour=colour,
+            icon_url=icon_url,
+            fields=text.fields,
+            footer=text.footer,
+            image=image if index == len(texts) - 1 else None,
+            thumbnail=thumbnail if index == 0 else None,
+        )
+        for index, text in enumerate(texts)
+    ]
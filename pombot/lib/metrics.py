@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import os
+import re
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Union
+
+from discord.ext.commands import Context
+
+from pombot.config import Config
+
+_log = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+@dataclass
+class CommandStats:
+    """Measurements of a single command invocation."""
+    command: str
+    user: str
+    wall_time: float = 0.0
+    db_round_trips: int = 0
+    rows_fetched: int = 0
+    discord_calls: int = 0
+
+
+# The stats of the command being run by the current task, if any. Discord.py
+# runs each command in the task that dispatched its message, so every query
+# and API call awaited by the command sees the same value.
+current_command: ContextVar[Optional[CommandStats]] = ContextVar(
+    "current_command", default=None)
+
+
+def normalize_query(query: Union[str, bytes]) -> str:
+    """Reduce an SQL statement to its shape.
+
+    Literals and placeholders become "?", whitespace is collapsed and
+    repetition generated by the query builders (OR-chains of the same
+    condition, multi-row VALUES lists) is folded, so that statements which
+    differ only in their arguments or length share a shape.
+    """
+    if isinstance(query, (bytes, bytearray)):
+        query = bytes(query).decode("utf-8", errors="replace")
+
+    shape = " ".join(query.split()).rstrip(";").strip()
+
+    for pattern, replacement in _QUERY_SHAPE_SUBSTITUTIONS:
+        shape = pattern.sub(replacement, shape)
+
+    return shape
+
+
+_QUERY_SHAPE_SUBSTITUTIONS = [
+    (re.compile(r"'(?:[^'\\]|\\.|'')*'"), "?"),
+    (re.compile(r"%s|\bNULL\b|\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\((?:\?, ?)+\?\)"), "(?+)"),
+    (re.compile(r"(\(\?\+?\))(?:, ?\(\?\+?\))+"), r"\1, ..."),
+    (re.compile(r"( (OR|AND) [\w.]+ ?= ?\?)(?:\1)+"), r"\1 ..."),
+]
+
+
+class RollingSummary:
+    """Quantiles over the most recent samples, plus lifetime totals."""
+    def __init__(self, window: int):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        """Record a sample."""
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantile(self, quantile: float) -> float:
+        """Return the given quantile of the samples in the window."""
+        if len(self.samples) < 2:
+            return self.samples[0] if self.samples else 0.0
+
+        cut_points = statistics.quantiles(self.samples, n=100, method="inclusive")
+        return cut_points[round(quantile * 100) - 1]
+
+    def mean(self) -> float:
+        """Return the mean of the samples in the window."""
+        return statistics.fmean(self.samples) if self.samples else 0.0
+
+
+class Metrics:
+    """Per-command latency, database and Discord API usage."""
+    FIELDS = {
+        # Attribute of CommandStats: (Prometheus name, help text)
+        "wall_time":      ("pombot_command_duration_seconds",
+                           "Wall time spent running a command."),
+        "db_round_trips": ("pombot_command_db_round_trips",
+                           "Statements sent to the database by a command."),
+        "rows_fetched":   ("pombot_command_db_rows_fetched",
+                           "Rows read from the database by a command."),
+        "discord_calls":  ("pombot_command_discord_api_calls",
+                           "Discord REST API calls made by a command."),
+    }
+
+    _summaries: Dict[str, Dict[str, RollingSummary]] = {}
+    _file_writer: Optional[asyncio.Task] = None
+
+    @classmethod
+    @asynccontextmanager
+    async def track_command(cls, name: str, ctx: Context):
+        """Measure the command run inside this context."""
+        stats = CommandStats(command=name, user=str(ctx.author))
+        token = current_command.set(stats)
+        start = time.perf_counter()
+
+        try:
+            yield stats
+        finally:
+            stats.wall_time = time.perf_counter() - start
+            current_command.reset(token)
+            cls._record(stats)
+
+    @classmethod
+    def _record(cls, stats: CommandStats):
+        summaries = cls._summaries.setdefault(stats.command, {
+            field: RollingSummary(Config.METRICS_WINDOW) for field in cls.FIELDS
+        })
+
+        for field, summary in summaries.items():
+            summary.add(getattr(stats, field))
+
+    @staticmethod
+    def record_query(rows_fetched: int):
+        """Count a database round-trip against the current command."""
+        if stats := current_command.get():
+            stats.db_round_trips += 1
+            stats.rows_fetched += rows_fetched
+
+    @staticmethod
+    def record_discord_call():
+        """Count a Discord API call against the current command."""
+        if stats := current_command.get():
+            stats.discord_calls += 1
+
+    @classmethod
+    def instrument_http(cls, http):
+        """Count every REST request made through a discord.py HTTPClient."""
+        request = http.request
+
+        async def _request(route, **kwargs):
+            cls.record_discord_call()
+            return await request(route, **kwargs)
+
+        http.request = _request
+
+    @classmethod
+    def get_summary_lines(cls) -> List[str]:
+        """Return a human-readable table of rolling per-command stats."""
+        lines = ["{:<14}{:>7}{:>9}{:>9}{:>9}{:>7}{:>7}{:>5}".format(
+            "command", "count", "p50 ms", "p95 ms", "p99 ms", "db", "rows", "api")]
+
+        for command in sorted(cls._summaries):
+            summaries = cls._summaries[command]
+            wall_time = summaries["wall_time"]
+
+            lines.append("{:<14}{:>7,}{:>9.1f}{:>9.1f}{:>9.1f}{:>7.1f}{:>7.0f}{:>5.1f}".format(
+                command[:13],
+                wall_time.count,
+                *(wall_time.quantile(q) * 1000 for q in QUANTILES),
+                summaries["db_round_trips"].mean(),
+                summaries["rows_fetched"].mean(),
+                summaries["discord_calls"].mean(),
+            ))
+
+        return lines
+
+    @classmethod
+    def to_prometheus(cls) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+
+        for field, (metric, help_text) in cls.FIELDS.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+
+            for command in sorted(cls._summaries):
+                summary = cls._summaries[command][field]
+                label = f'command="{command}"'
+
+                lines += [f'{metric}{{{label},quantile="{q}"}} {summary.quantile(q)}'
+                          for q in QUANTILES]
+                lines += [f"{metric}_sum{{{label}}} {summary.total}",
+                          f"{metric}_count{{{label}}} {summary.count}"]
+
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def write_prometheus_file(cls, path: Path):
+        """Atomically (re)write the metrics file, e.g. for node_exporter's
+        textfile collector.
+        """
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        temp_path.write_text(cls.to_prometheus(), encoding="utf-8")
+        os.replace(temp_path, path)
+
+    @classmethod
+    def start_prometheus_file_writer(cls, path: Path):
+        """Rewrite the metrics file every METRICS_FILE_INTERVAL.
+
+        Calling this again while the writer is running has no effect, so it is
+        safe to call from `on_ready`, which fires again on reconnects.
+        """
+        if cls._file_writer and not cls._file_writer.done():
+            return
+
+        async def _write_forever():
+            while True:
+                try:
+                    cls.write_prometheus_file(path)
+                except OSError as exc:
+                    _log.error("Could not write metrics file %s: %s", path, exc)
+
+                await asyncio.sleep(Config.METRICS_FILE_INTERVAL.total_seconds())
+
+        cls._file_writer = asyncio.create_task(_write_forever())
+
+
+@dataclass
+class QueryShapeStats:
+    """Aggregated measurements of all statements sharing one shape."""
+    shape: str
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+
+
+class QueryStats:
+    """Per-shape database statement counters and the slow-query log."""
+    _shapes: Dict[str, QueryShapeStats] = {}
+
+    @classmethod
+    def record(cls, query: Union[str, bytes], elapsed: float, rows: int):
+        """Record an executed statement and log it when it was slow."""
+        shape = normalize_query(query)
+
+        if (stats := cls._shapes.get(shape)) is None:
+            stats = cls._shapes[shape] = QueryShapeStats(shape)
+
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        stats.rows += rows
+
+        if elapsed >= Config.SLOW_QUERY_THRESHOLD.total_seconds():
+            command = current_command.get()
+
+            _log.warning('Slow query (%.1f ms, %d rows) from %s by %s: %s',
+                         elapsed * 1000,
+                         rows,
+                         f"!{command.command}" if command else "no command",
+                         command.user if command else "nobody",
+                         shape)
+
+    @classmethod
+    def get_top_shapes(cls, count: int) -> List[QueryShapeStats]:
+        """Return the `count` shapes which have taken the most time in
+        total.
+        """
+        return sorted(cls._shapes.values(),
+                      key=lambda s: s.total_time,
+                      reverse=True)[:count]
@@ -0,0 +1,102 @@
+import asyncio
+import itertools
+import logging
+from enum import IntEnum
+from typing import Callable, Dict
+
+from discord.ext.commands import Context
+from discord.message import Message
+
+from pombot.config import Config
+from pombot.lib.metrics import current_command
+
+_log = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Order in which queued requests for a route are sent."""
+    REPLY = 0
+    REACTION = 1
+
+
+class Outbound:
+    """Send replies and reactions in the background so that commands can
+    return as soon as their own work is done.
+
+    Requests are queued per channel, which is how discord.py buckets the
+    rate limits of message and reaction endpoints, and each queue is drained
+    by its own task, one request at a time. Within a channel, replies are
+    sent before cosmetic reactions.
+
+    Each queue holds at most OUTBOUND_QUEUE_SIZE requests; once full,
+    queueing waits for room.
+
+    Only use this for requests whose result and errors the caller does not
+    need; failures are logged. Until `start` is called (i.e. before the bot
+    is ready, and in unit tests), requests are sent inline instead.
+    """
+    _enabled = False
+    _queues: Dict[int, asyncio.PriorityQueue] = {}
+    _workers: Dict[int, asyncio.Task] = {}
+    _counter = itertools.count()
+
+    @classmethod
+    def start(cls):
+        """Send requests in the background from now on."""
+        cls._enabled = True
+
+    @classmethod
+    async def send(cls, ctx: Context, *args, **kwargs):
+        """Queue `ctx.send(*args, **kwargs)`."""
+        await cls._enqueue(ctx.channel, Priority.REPLY, ctx.send, *args, **kwargs)
+
+    @classmethod
+    async def reply(cls, ctx: Context, *args, **kwargs):
+        """Queue `ctx.reply(*args, **kwargs)`."""
+        await cls._enqueue(ctx.channel, Priority.REPLY, ctx.reply, *args, **kwargs)
+
+    @classmethod
+    async def add_reaction(cls, message: Message, emoji: str):
+        """Queue `message.add_reaction(emoji)`."""
+        await cls._enqueue(message.channel, Priority.REACTION, message.add_reaction, emoji)
+
+    @classmethod
+    async def _enqueue(cls, channel, priority: Priority, func: Callable, *args, **kwargs):
+        if not cls._enabled:
+            await func(*args, **kwargs)
+            return
+
+        if (queue := cls._queues.get(channel.id)) is None:
+            queue = cls._queues[channel.id] = asyncio.PriorityQueue(
+                maxsize=Config.OUTBOUND_QUEUE_SIZE)
+            cls._workers[channel.id] = asyncio.create_task(
+                cls._send_forever(channel.id, queue))
+
+        await queue.put((priority, next(cls._counter), func, args, kwargs))
+
+    @classmethod
+    async def _send_forever(cls, channel_id: int, queue: asyncio.PriorityQueue):
+        # This task inherited the context of the command which created it;
+        # its requests must not all be counted against that one command.
+        current_command.set(None)
+        idle_timeout = Config.OUTBOUND_IDLE_TIMEOUT.total_seconds()
+
+        try:
+            while True:
+                try:
+                    *_, func, args, kwargs = await asyncio.wait_for(queue.get(), idle_timeout)
+                except asyncio.TimeoutError:
+                    return
+
+                try:
+                    await func(*args, **kwargs)
+                except Exception:  # pylint: disable=broad-except
+                    _log.exception("Failed to send %s to channel %s",
+                                   getattr(func, "__qualname__", func), channel_id)
+        finally:
+            # Nothing can be queued between leaving the loop and this, as
+            # there is no await in between; the next request starts a new
+            # queue and worker.
+            if cls._queues.get(channel_id) is queue:
+                del cls._queues[channel_id]
+                del cls._workers[channel_id]
@@ -0,0 +1,152 @@
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from discord import RawReactionActionEvent
+from discord.embeds import Embed
+from discord.errors import DiscordException
+from discord.message import Message
+
+from pombot.config import Config, Reactions
+from pombot.lib.outbound import Outbound
+from pombot.lib.shards import ShardCoordinator
+
+_log = logging.getLogger(__name__)
+
+PAGE_FLIP_TOPIC = "page_flip"
+
+PageRenderer = Callable[[int], Awaitable[Embed]]
+
+
+@dataclass
+class _Book:
+    """A paginated message and the pages rendered for it so far."""
+    user_id: int
+    num_pages: int
+    render: PageRenderer
+    message: Optional[Message] = None
+    page: int = 0
+    expires: float = 0.0
+    pages: Dict[int, Embed] = field(default_factory=dict)
+
+    async def get_page(self, page: int) -> Embed:
+        """Return the embed of `page`, rendering it the first time."""
+        if page not in self.pages:
+            self.pages[page] = await self.render(page)
+
+        return self.pages[page]
+
+    def touch(self):
+        """Keep this book for another `Config.PAGINATOR_TTL`."""
+        self.expires = monotonic() + Config.PAGINATOR_TTL.total_seconds()
+
+
+class Paginator:
+    """Messages whose pages their user can flip through with reactions.
+
+    Pages are rendered when they are first shown and kept, per user, until
+    the user hasn't flipped through them for `Config.PAGINATOR_TTL`.
+
+    Books are kept by the process which sent them. Reactions in private
+    messages all reach the process running shard 0, which relays those to
+    the books it doesn't have to the other processes via `ShardCoordinator`.
+    """
+    _books: Dict[Tuple[int, str], _Book] = {}
+    _messages: Dict[int, _Book] = {}
+
+    @classmethod
+    async def send(
+        cls,
+        send: Callable[..., Awaitable[Message]],
+        *,
+        user_id: int,
+        key: str,
+        num_pages: int,
+        render: PageRenderer,
+    ) -> Message:
+        """Send the first page of a paginated message.
+
+        @param send Coroutine which sends the message, e.g. `ctx.author.send`.
+        @param user_id ID of the user who can flip through the pages.
+        @param key Name of the message among the user's paginated messages.
+            Sending another message with the same key replaces the first.
+        @param render Coroutine which renders the embed of a page by index.
+        @return The message sent.
+        """
+        cls._forget_expired()
+
+        book = _Book(user_id, num_pages, render)
+        message = await send(embed=await book.get_page(0))
+
+        if (old_book := cls._books.pop((user_id, key), None)) is not None:
+            cls._messages.pop(old_book.message.id, None)
+
+        if num_pages < 2:
+            return message
+
+        book.message = message
+        book.touch()
+        cls._books[(user_id, key)] = book
+        cls._messages[message.id] = book
+
+        for emoji in (Reactions.PREVIOUS_PAGE, Reactions.NEXT_PAGE):
+            await Outbound.add_reaction(message, emoji)
+
+        return message
+
+    @classmethod
+    async def flip(cls, payload: RawReactionActionEvent):
+        """Show the previous or next page of a paginated message when its
+        user reacts to it.
+        """
+        if payload.emoji.name not in (Reactions.PREVIOUS_PAGE, Reactions.NEXT_PAGE):
+            return
+
+        if payload.message_id in cls._messages:
+            await cls._flip(payload.message_id, payload.user_id, payload.emoji.name)
+        elif payload.guild_id is None:
+            ShardCoordinator.send(
+                PAGE_FLIP_TOPIC, (payload.message_id, payload.user_id, payload.emoji.name))
+
+    @classmethod
+    async def _on_flip_relayed(cls, flip: Tuple[int, int, str]):
+        await cls._flip(*flip)
+
+    @classmethod
+    async def _flip(cls, message_id: int, user_id: int, emoji: str):
+        if (book := cls._messages.get(message_id)) is None:
+            return
+
+        if user_id != book.user_id:
+            return
+
+        if book.expires < monotonic():
+            cls._forget_expired()
+            return
+
+        step = {
+            Reactions.PREVIOUS_PAGE: -1,
+            Reactions.NEXT_PAGE: 1,
+        }[emoji]
+
+        book.page = (book.page + step) % book.num_pages
+        book.touch()
+
+        try:
+            await book.message.edit(embed=await book.get_page(book.page))
+        except DiscordException:
+            _log.exception("Failed to show page %s of message %s",
+                           book.page, book.message.id)
+
+    @classmethod
+    def _forget_expired(cls):
+        now = monotonic()
+
+        for key, book in list(cls._books.items()):
+            if book.expires < now:
+                del cls._books[key]
+                cls._messages.pop(book.message.id, None)
+
+
+ShardCoordinator.receive(PAGE_FLIP_TOPIC, Paginator._on_flip_relayed)
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from pombot.config import Config
+from pombot.lib.event_bus import EventBus, TablesCleared
+from pombot.lib.storage import Storage
+
+
+class ActionTotals:
+    """Each team's number of actions and raw damage by action type, rolled
+    up from the actions table.
+
+    Actions are never changed once added, so each read only sums the actions
+    added since the last one, on top of the totals of the actions before
+    them. Those totals stop at the last action which is surely committed,
+    called the watermark, and can be saved in a snapshot so that a restarted
+    bot does not sum the whole table again.
+    """
+    _settled: Dict[Tuple[str, str], Tuple[int, int]] = {}
+    _watermark = 0
+
+    @classmethod
+    async def get(cls, team: str) -> Dict[str, Tuple[int, int]]:
+        """Return the number and raw damage of a team's actions.
+
+        @param team Team name as a string.
+        @return (count, raw damage) by action type name.
+        """
+        watermark = cls._watermark
+
+        # Whole minutes keep the arguments, and so the memoized read, the
+        # same for a minute at a time.
+        settled_before = (datetime.now().replace(second=0, microsecond=0) -
+                          Config.ACTIONS_SETTLE_TIME)
+        sums = await Storage.sum_actions_since(after_id=watermark,
+                                               settled_before=settled_before)
+        totals = dict(cls._settled)
+
+        for row in sums:
+            count, damage = totals.get((row.team, row.action_type), (0, 0))
+            totals[row.team, row.action_type] = count + row.count, damage + row.raw_damage
+
+        settled = [row for row in sums if row.settled]
+        unsettled = [row for row in sums if not row.settled]
+
+        # Move the watermark past the settled actions, unless another read
+        # already did or an unsettled action comes before some of them.
+        if (settled and watermark == cls._watermark and
+                max(row.max_id for row in settled) <
+                min((row.min_id for row in unsettled), default=float("inf"))):
+            for row in settled:
+                count, damage = cls._settled.get((row.team, row.action_type), (0, 0))
+                cls._settled[row.team, row.action_type] = (count + row.count,
+                                                           damage + row.raw_damage)
+
+            cls._watermark = max(row.max_id for row in settled)
+
+        return {action_type: total for (name, action_type), total in totals.items()
+                if name == team}
+
+    @classmethod
+    def to_snapshot(cls) -> Optional[Dict[str, Any]]:
+        """Return the settled totals as JSON-serializable data, or None when
+        there are none.
+        """
+        if not cls._watermark:
+            return None
+
+        return {
+            "watermark": cls._watermark,
+            "totals": [[team, action_type, count, damage]
+                       for (team, action_type), (count, damage) in cls._settled.items()],
+        }
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]):
+        """Replace the settled totals with those of `to_snapshot`."""
+        cls._settled = {(team, action_type): (count, damage)
+                        for team, action_type, count, damage in snapshot["totals"]}
+        cls._watermark = snapshot["watermark"]
+
+    @classmethod
+    def clear(cls):
+        """Forget every total."""
+        cls._settled = {}
+        cls._watermark = 0
+
+
+EventBus.subscribe(TablesCleared, lambda event: ActionTotals.clear())
@@ -5,6 +5,7 @@ from discord.ext.commands import Context
 import pombot.lib.pom_wars.errors as war_crimes
 from pombot.config import Config, Reactions
 from pombot.lib.errors import DescriptionTooLongError
+from pombot.lib.outbound import Outbound
 from pombot.lib.storage import Storage
 from pombot.lib.types import User as BotUser
 
@@ -26,14 +27,14 @@ async def check_user_add_pom(
     try:
         user = await Storage.get_user_by_id(ctx.author.id)
     except war_crimes.UserDoesNotExistError:
-        await ctx.reply("How did you get in here? You haven't joined the war!")
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.reply(ctx, "How did you get in here? You haven't joined the war!")
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         raise
 
     if len(description) > Config.DESCRIPTION_LIMIT:
-        await ctx.message.add_reaction(Reactions.WARNING)
-        await ctx.send(f"{ctx.author.mention}, your pom description must "
-                        f"be fewer than {Config.DESCRIPTION_LIMIT} characters.")
+        await Outbound.add_reaction(ctx.message, Reactions.WARNING)
+        await Outbound.send(ctx, f"{ctx.author.mention}, your pom description must "
+                                 f"be fewer than {Config.DESCRIPTION_LIMIT} characters.")
         raise DescriptionTooLongError()
 
     await Storage.add_poms_to_user_session(
@@ -42,6 +43,6 @@ async def check_user_add_pom(
         count=1,
         time_set=timestamp,
     )
-    await ctx.message.add_reaction(Reactions.TOMATO)
+    await Outbound.add_reaction(ctx.message, Reactions.TOMATO)
 
     return user
@@ -1,12 +1,16 @@
-from typing import List
+import asyncio
+from typing import Dict, List, Optional
 
 import discord.errors
 from discord.channel import ChannelType
 from discord.ext.commands.bot import Bot
 
 from pombot.config import Pomwars, Reactions
-from pombot.lib.messages import EmbedField, send_embed_message
+from pombot.lib.messages import EmbedField, Overflow, send_embed_message
 from pombot.lib.pom_wars.team import Team
+from pombot.lib.shared_state import SharedState
+
+SCOREBOARD_STATE = "scoreboard"
 
 
 class Scoreboard:
@@ -15,9 +19,32 @@ class Scoreboard:
         self.bot = bot
         self.scoreboard_channels = scoreboard_channels
 
-    async def update(self) -> List[ChannelType]:
+    @staticmethod
+    async def get_stats() -> Dict[str, Dict]:
+        """Return the totals of each team, by team name."""
+        return {
+            team.value: {
+                "damage":      await team.damage,
+                "fav_attack":  (await team.favorite_action).value,
+                "population":  await team.population,
+                "num_attacks": await team.attack_count,
+            }
+            for team in (Team.KNIGHTS, Team.VIKINGS)
+        }
+
+    async def update(
+        self,
+        stats: Optional[Dict[str, Dict]] = None,
+        share: bool = True,
+    ) -> List[ChannelType]:
         """Updates or creates the live scoreboards of all guilds.
 
+        When more than one process runs the bot, this only updates the guilds
+        of this process and, unless `share` is False, shares the team totals
+        with the other processes to update theirs.
+
+        @param stats The totals from `get_stats`, or None to get them.
+
         The scoreboard:
             - Differentiates teams.
             - Displays current winner.
@@ -36,25 +63,13 @@ class Scoreboard:
         knights, vikings = Team.KNIGHTS, Team.VIKINGS
         winner = None
 
-        stats = {
-            knights: {
-                "damage":      await knights.damage,
-                "fav_attack":  await knights.favorite_action,
-                "population":  await knights.population,
-                "num_attacks": await knights.attack_count,
-            },
-            vikings: {
-                "damage":      await vikings.damage,
-                "fav_attack":  await vikings.favorite_action,
-                "population":  await vikings.population,
-                "num_attacks": await vikings.attack_count,
-            }
-        }
+        if stats is None:
+            stats = await self.get_stats()
 
         if stats[knights]["damage"] != stats[vikings]["damage"]:
             winner = knights if stats[vikings]["damage"] < stats[knights]["damage"] else vikings
 
-        for channel in self.scoreboard_channels:
+        async def _update_channel(channel: ChannelType):
             history = channel.history(limit=1, oldest_first=True)
 
             lines = [
@@ -108,7 +123,7 @@ class Scoreboard:
                 scoreboard_msg = channel_messages[0]
                 if scoreboard_msg.author != self.bot.user:
                     full_channels.append(channel)
-                    continue
+                    return
 
             try:
                 new_msg = await send_embed_message(
@@ -118,6 +133,7 @@ class Scoreboard:
                     fields=fields,
                     footer=msg_footer,
                     colour=Pomwars.ACTION_COLOUR,
+                    overflow=Overflow.TRUNCATE,
                     _func=scoreboard_msg.edit if scoreboard_msg else channel.send
                 )
                 if new_msg:
@@ -125,4 +141,11 @@ class Scoreboard:
             except discord.errors.Forbidden:
                 restricted_channels.append(channel)
 
+        # Each channel has its own message, so they are updated concurrently.
+        await asyncio.gather(*(_update_channel(channel)
+                               for channel in self.scoreboard_channels))
+
+        if share:
+            await SharedState.set(SCOREBOARD_STATE, stats)
+
         return [full_channels, restricted_channels]
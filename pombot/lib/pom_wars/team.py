@@ -4,6 +4,7 @@ from discord.user import User
 
 from pombot.config import Config, IconUrls, Pomwars
 from pombot.lib.pom_wars import errors as war_crimes
+from pombot.lib.pom_wars.action_totals import ActionTotals
 from pombot.lib.storage import Storage
 from pombot.lib.types import ActionType
 
@@ -28,23 +29,20 @@ class Team(str, Enum):
     @property
     async def damage(self) -> int:
         """The team's total damage."""
-        return int(await Storage.sum_team_damage(self.value) / 100.0)
+        totals = await ActionTotals.get(self.value)
+        return int(sum(damage for _, damage in totals.values()) / 100.0)
 
     @property
     async def favorite_action(self) -> ActionType:
         """The team's most-used action."""
-        async def _count_actions(typ: ActionType):
-            await Storage.count_rows_in_table(Config.ACTIONS_TABLE,
-                action_type=typ,
-                team=self.value,
-            )
-
-        return max({typ: await _count_actions(typ) for typ in ActionType})
+        totals = await ActionTotals.get(self.value)
+        return max(ActionType, key=lambda typ: totals.get(typ.value, (0, 0))[0])
 
     @property
     async def attack_count(self) -> int:
         """The team's total number of actions."""
-        return await Storage.count_rows_in_table(Config.ACTIONS_TABLE, team=self.value)
+        totals = await ActionTotals.get(self.value)
+        return sum(count for count, _ in totals.values())
 
     @property
     async def population(self) -> int:
@@ -0,0 +1,66 @@
+import re
+from typing import FrozenSet, Optional, Pattern
+
+from discord.ext.commands import Bot
+from discord.message import Message
+
+from pombot.config import Config, Debug
+
+
+class CommandPrefilter:
+    """Cheaply reject messages which cannot be commands for this bot, before
+    discord.py builds a Context for them.
+
+    Both the pattern of command names and the set of channel IDs are built
+    from the bot's state, so they must be updated once it is ready. Until
+    then, every message is let through.
+    """
+    _command_pattern: Optional[Pattern] = None
+    _channel_ids: Optional[FrozenSet[int]] = None
+
+    @classmethod
+    def update_commands(cls, bot: Bot):
+        """Build the pattern matching any of the bot's commands or aliases,
+        optionally separated from the prefix by a space.
+        """
+        names = sorted(bot.all_commands, key=len, reverse=True)
+
+        cls._command_pattern = re.compile(r"{}\s?(?:{})(?:\s|$)".format(
+            re.escape(Config.PREFIX),
+            "|".join(re.escape(name) for name in names),
+        ), re.IGNORECASE if bot.case_insensitive else 0)
+
+    @classmethod
+    def update_channels(cls, bot: Bot):
+        """Resolve POM_CHANNEL_NAMES to the IDs of the matching channels in
+        every guild the bot is in.
+        """
+        if not any(Config.POM_CHANNEL_NAMES):
+            cls._channel_ids = None
+            return
+
+        names = frozenset(Config.POM_CHANNEL_NAMES)
+
+        cls._channel_ids = frozenset(
+            channel.id
+            for guild in bot.guilds
+            for channel in guild.text_channels
+            if channel.name in names
+        )
+
+    @classmethod
+    def is_candidate(cls, message: Message) -> bool:
+        """Return whether the message could be a command the bot should
+        respond to.
+        """
+        if message.guild is None:
+            # DMs are only restricted along with channels.
+            if any(Config.POM_CHANNEL_NAMES) and not Debug.RESPOND_TO_DM:
+                return False
+        elif cls._channel_ids is not None and message.channel.id not in cls._channel_ids:
+            return False
+
+        if cls._command_pattern is None:
+            return True
+
+        return cls._command_pattern.match(message.content) is not None
@@ -0,0 +1,198 @@
+import asyncio
+import dataclasses
+import functools
+from dataclasses import dataclass
+from datetime import timedelta
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Tuple
+
+from pombot.config import Config
+
+
+@dataclass
+class ReadStats:
+    """How the calls to one memoized read were served."""
+    hits: int = 0    # From the cache.
+    joins: int = 0   # By sharing an identical read already in flight.
+    misses: int = 0  # By reading from the database.
+
+    @property
+    def calls(self) -> int:
+        """Return the number of calls made to the read."""
+        return self.hits + self.joins + self.misses
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires: float
+    tables: Tuple[str, ...]
+
+
+def _freeze(obj: Any) -> Hashable:
+    """Return a hashable equivalent of a read's arguments."""
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(item) for item in obj)
+
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(_freeze(item) for item in obj)
+
+    if isinstance(obj, dict):
+        return tuple(sorted((key, _freeze(value)) for key, value in obj.items()))
+
+    if dataclasses.is_dataclass(obj):
+        return (type(obj).__name__, *(_freeze(getattr(obj, field.name))
+                                      for field in dataclasses.fields(obj)))
+
+    return obj
+
+
+def _copy(value: Any) -> Any:
+    """Return a copy of a shared result which its caller can modify."""
+    if isinstance(value, (list, set, dict)):
+        return type(value)(value)
+
+    return value
+
+
+class ReadCache:
+    """Single-flight, time-limited memoization of `Storage` reads.
+
+    Concurrent identical reads share one round-trip to the database, and its
+    result is then reused until its TTL expires. Every write through
+    `Storage` invalidates the reads of the tables it writes to, including
+    those still in flight.
+
+    Writes from other processes aren't seen until the TTL expires, so TTLs
+    should stay short.
+    """
+    _entries: Dict[Hashable, _Entry] = {}
+    _in_flight: Dict[Hashable, Tuple[asyncio.Future, Tuple[str, ...]]] = {}
+    _generations: Dict[str, int] = {}
+    _epoch = 0
+    stats: Dict[str, ReadStats] = {}
+
+    @classmethod
+    def memoize(cls, *, ttl: timedelta, tables: Iterable[str]):
+        """Decorate an async Storage read whose result depends only on its
+        arguments and on `tables`.
+
+        @param ttl How long to reuse a result for.
+        @param tables The tables read, whose writes invalidate the result.
+        """
+        tables = tuple(tables)
+
+        def decorator(func: Callable[..., Awaitable]):
+            name = func.__name__
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = (name, _freeze(args), _freeze(kwargs))
+
+                try:
+                    hash(key)
+                except TypeError:
+                    return await func(*args, **kwargs)
+
+                value = await cls._get(name, key, tables, ttl,
+                                       functools.partial(func, *args, **kwargs))
+
+                return _copy(value)
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    def invalidate(cls, *tables: str):
+        """Forget the reads of these tables after a write to them."""
+        for table in tables:
+            cls._generations[table] = cls._generations.get(table, 0) + 1
+
+        cls._entries = {key: entry for key, entry in cls._entries.items()
+                        if not set(entry.tables) & set(tables)}
+        cls._in_flight = {key: flight for key, flight in cls._in_flight.items()
+                          if not set(flight[1]) & set(tables)}
+
+    @classmethod
+    def clear(cls):
+        """Forget every read."""
+        cls._epoch += 1
+        cls._entries = {}
+        cls._in_flight = {}
+
+    @classmethod
+    def get_summary_lines(cls) -> List[str]:
+        """Return a human-readable table of how each read was served."""
+        lines = ["{:<22}{:>9}{:>8}{:>8}".format("read", "calls", "hit %", "join %")]
+
+        for name in sorted(cls.stats):
+            stats = cls.stats[name]
+
+            lines.append("{:<22}{:>9,}{:>8.1f}{:>8.1f}".format(
+                name[:21],
+                stats.calls,
+                100 * stats.hits / stats.calls,
+                100 * stats.joins / stats.calls,
+            ))
+
+        return lines
+
+    @classmethod
+    async def _get(
+        cls,
+        name: str,
+        key: Hashable,
+        tables: Tuple[str, ...],
+        ttl: timedelta,
+        load: Callable[[], Awaitable],
+    ) -> Any:
+        stats = cls.stats.setdefault(name, ReadStats())
+
+        if (entry := cls._entries.get(key)) is not None:
+            if entry.expires > monotonic():
+                stats.hits += 1
+                return entry.value
+
+            del cls._entries[key]
+
+        if (flight := cls._in_flight.get(key)) is not None:
+            stats.joins += 1
+
+            # Shield the read so that a cancelled caller does not cancel it
+            # for everyone else.
+            return await asyncio.shield(flight[0])
+
+        stats.misses += 1
+        generations = cls._get_generations(tables)
+        future = asyncio.ensure_future(load())
+        cls._in_flight[key] = future, tables
+
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            if cls._in_flight.get(key, (None, ))[0] is future:
+                del cls._in_flight[key]
+
+        if generations == cls._get_generations(tables):
+            cls._entries[key] = _Entry(value, monotonic() + ttl.total_seconds(), tables)
+            cls._evict()
+
+        return value
+
+    @classmethod
+    def _get_generations(cls, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        return (cls._epoch, *(cls._generations.get(table, 0) for table in tables))
+
+    @classmethod
+    def _evict(cls):
+        if len(cls._entries) <= Config.READ_CACHE_SIZE:
+            return
+
+        now = monotonic()
+        cls._entries = {key: entry for key, entry in cls._entries.items()
+                        if entry.expires > now}
+
+        # Dicts keep insertion order, so the oldest entries go first.
+        while len(cls._entries) > Config.READ_CACHE_SIZE:
+            del cls._entries[next(iter(cls._entries))]
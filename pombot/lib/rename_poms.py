@@ -2,6 +2,7 @@ from aiomysql import DataError
 from discord.ext.commands import Context
 
 from pombot.config import Config, Reactions
+from pombot.lib.outbound import Outbound
 from pombot.lib.storage import Storage
 from pombot.lib.tiny_tools import normalize_and_dedent
 from pombot.lib.types import SessionType
@@ -35,7 +36,7 @@ async def rename_poms(ctx: Context, old: str, new: str, session_type: SessionTyp
             New description is too long: "{new}" ({len(new)} of
             {Config.DESCRIPTION_LIMIT} character maximum).
         """))
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return 0
 
     if not changed:
@@ -43,8 +44,8 @@ async def rename_poms(ctx: Context, old: str, new: str, session_type: SessionTyp
         await ctx.author.send(normalize_and_dedent(f"""
             No poms found matching "{old}" in your {session_name}.
         """))
-        await ctx.message.add_reaction(Reactions.ROBOT)
+        await Outbound.add_reaction(ctx.message, Reactions.ROBOT)
         return 0
 
-    await ctx.message.add_reaction(Reactions.CHECKMARK)
+    await Outbound.add_reaction(ctx.message, Reactions.CHECKMARK)
     return changed
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, TypeVar
+
+from pombot.config import Config
+
+_log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RenderPool:
+    """Run large, CPU-bound renders, e.g. the !poms lists of users with
+    thousands of poms, off the event loop.
+
+    A thread pool is used rather than a process pool, since the inputs would
+    otherwise need to be pickled on the event loop, which costs about as much
+    as the render. While a worker holds the GIL, the interpreter still
+    switches back to the event loop every few milliseconds, so other guilds'
+    commands keep running.
+    """
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    async def run(cls, func: Callable[..., T], *args, size: int, **kwargs) -> T:
+        """Return `func(*args, **kwargs)`, run in the pool when `size` is at
+        least `Config.RENDER_OFFLOAD_THRESHOLD`.
+
+        @param size The number of items rendered, e.g. poms.
+        """
+        if size < Config.RENDER_OFFLOAD_THRESHOLD:
+            return func(*args, **kwargs)
+
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=Config.RENDER_WORKERS,
+                                               thread_name_prefix="render")
+
+        _log.debug("Rendering %s items in the render pool", size)
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(cls._executor, partial(func, *args, **kwargs))
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import threading
+from multiprocessing import Queue
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from pombot.config import Config
+
+_log = logging.getLogger(__name__)
+
+
+def distribute_shards(shard_count: int, num_processes: int) -> List[List[int]]:
+    """Split shard IDs as evenly as possible between processes.
+
+    Consecutive IDs go to different processes, because Discord assigns
+    guilds to shards by ID, so large and small guilds are spread evenly.
+    """
+    num_processes = max(1, min(num_processes, shard_count))
+
+    return [list(range(i, shard_count, num_processes)) for i in range(num_processes)]
+
+
+class ShardCoordinator:
+    """Notify the bot processes running the other shards of changes they
+    need to act on, e.g. the shared state having changed.
+
+    Notifications are plain topic strings relayed by the supervisor in
+    `bot.py`. Processes can also send each other messages, which, unlike
+    notifications, carry a payload and are each delivered. When the bot is
+    not sharded, publishing and sending do nothing.
+    """
+    _index: Optional[int] = None
+    _inbox: Optional[Queue] = None
+    _outbox: Optional[Queue] = None
+    _subscribers: Dict[str, Callable[[], Awaitable]] = {}
+    _receivers: Dict[str, Callable[[Any], Awaitable]] = {}
+    _scheduled: Set[str] = set()
+
+    @classmethod
+    def connect(cls, index: int, inbox: Queue, outbox: Queue, loop: asyncio.AbstractEventLoop):
+        """Start receiving notifications from other processes on `loop`.
+
+        @param index The index of this process among the shard processes.
+        @param inbox Queue on which the supervisor delivers notifications.
+        @param outbox Queue on which to send notifications to the supervisor.
+        """
+        cls._index, cls._inbox, cls._outbox = index, inbox, outbox
+
+        def _receive_forever():
+            while True:
+                topic, payload = inbox.get()
+
+                if payload is None:
+                    loop.call_soon_threadsafe(cls._dispatch, topic)
+                else:
+                    loop.call_soon_threadsafe(cls._deliver, topic, payload)
+
+        threading.Thread(target=_receive_forever, name="shard-inbox", daemon=True).start()
+
+    @classmethod
+    def get_process_path(cls, path: Path) -> Path:
+        """Return this process's own variant of a file path which every
+        process is configured with, e.g. "metrics.1.prom" for "metrics.prom"
+        in the process at index 1. When not sharded, `path` is unchanged.
+        """
+        if cls._index is None:
+            return path
+
+        return path.with_name(f"{path.stem}.{cls._index}{path.suffix}")
+
+    @classmethod
+    def subscribe(cls, topic: str, callback: Callable[[], Awaitable]):
+        """Await `callback` when another process publishes `topic`.
+
+        A topic has only one subscriber; subscribing again replaces it.
+        """
+        cls._subscribers[topic] = callback
+
+    @classmethod
+    def receive(cls, topic: str, callback: Callable[[Any], Awaitable]):
+        """Await `callback` with the payload of every message another process
+        sends on `topic`.
+
+        A topic has only one receiver; receiving again replaces it.
+        """
+        cls._receivers[topic] = callback
+
+    @classmethod
+    def publish(cls, topic: str):
+        """Tell the other processes that `topic` has changed."""
+        if cls._outbox is not None:
+            cls._outbox.put((cls._index, topic, None))
+
+    @classmethod
+    def send(cls, topic: str, payload: Any):
+        """Send a message to the other processes.
+
+        @param payload Any picklable value other than None.
+        """
+        if cls._outbox is not None:
+            cls._outbox.put((cls._index, topic, payload))
+
+    @classmethod
+    def _deliver(cls, topic: str, payload: Any):
+        if (callback := cls._receivers.get(topic)) is None:
+            return
+
+        async def _call_receiver():
+            try:
+                await callback(payload)
+            except Exception:  # pylint: disable=broad-except
+                _log.exception("Failed to handle %s message", topic)
+
+        asyncio.create_task(_call_receiver())
+
+    @classmethod
+    def _dispatch(cls, topic: str):
+        # Coalesce bursts of notifications, e.g. one per attack during an
+        # event, into a single call of the subscriber.
+        if topic in cls._scheduled or topic not in cls._subscribers:
+            return
+
+        cls._scheduled.add(topic)
+
+        async def _call_subscriber():
+            await asyncio.sleep(Config.SHARD_NOTIFY_DELAY.total_seconds())
+            cls._scheduled.discard(topic)
+
+            try:
+                await cls._subscribers[topic]()
+            except Exception:  # pylint: disable=broad-except
+                _log.exception("Failed to handle %s notification", topic)
+
+        asyncio.create_task(_call_subscriber())
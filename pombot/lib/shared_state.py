@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pombot.config import Config
+from pombot.lib.event_bus import USER_WRITES, EventBus
+from pombot.lib.shards import ShardCoordinator
+from pombot.lib.storage import Storage
+from pombot.lib.user_cache import UserCache
+
+_log = logging.getLogger(__name__)
+
+GOAL_REACHED = "goal_reached"
+SHARED_STATE_TOPIC = "shared_state"
+
+
+class SharedState:
+    """Values shared between every process running the bot, i.e. the shard
+    processes and any replicas on other hosts using the same database.
+
+    Values are stored JSON-encoded in the shared state table, along with a
+    version which is bumped on every write. Each process polls the table and
+    awaits the subscriber of every value another process has changed. Shard
+    processes additionally nudge each other through `ShardCoordinator` to
+    poll straight away instead of waiting for the next poll.
+
+    Writes to a user's data are shared the same way, as the ID of the latest
+    write to each user, so that every other process drops only the values
+    `UserCache` holds for that user.
+
+    When `Config.SHARE_STATE` is off, values are only kept in this process.
+    """
+    ORIGIN = uuid.uuid4().hex
+    _values: Dict[str, Any] = {}
+    _versions: Dict[str, int] = {}
+    _subscribers: Dict[str, Callable[[Any], Awaitable]] = {}
+    _user_write_id: Optional[int] = None
+    _user_write_ids: Dict[int, int] = {}
+    _poller: Optional[asyncio.Task] = None
+    _wakeup: Optional[asyncio.Event] = None
+
+    @classmethod
+    def get(cls, name: str, default: Any = None) -> Any:
+        """Return the latest known value of `name`."""
+        return cls._values.get(name, default)
+
+    @classmethod
+    async def set(cls, name: str, value: Any):
+        """Set `name` to the JSON-serializable `value` in every process."""
+        cls._values[name] = value
+
+        if not Config.SHARE_STATE:
+            return
+
+        await Storage.set_shared_state(name, json.dumps(value), cls.ORIGIN)
+        ShardCoordinator.publish(SHARED_STATE_TOPIC)
+
+    @classmethod
+    def subscribe(cls, name: str, callback: Callable[[Any], Awaitable]):
+        """Await `callback` with the new value when another process changes
+        `name`.
+
+        A value has only one subscriber; subscribing again replaces it.
+        """
+        cls._subscribers[name] = callback
+
+    @classmethod
+    def start(cls):
+        """Start polling for changes, unless already polling."""
+        if not Config.SHARE_STATE or cls._poller is not None:
+            return
+
+        cls._wakeup = asyncio.Event()
+        ShardCoordinator.subscribe(SHARED_STATE_TOPIC, cls._wake)
+        EventBus.subscribe_queue("user_writes", USER_WRITES, cls._share_user_write)
+        cls._poller = asyncio.create_task(cls._poll_forever())
+
+    @classmethod
+    async def poll(cls):
+        """Apply the values changed by other processes since the last poll."""
+        for row in await Storage.get_shared_state():
+            if cls._versions.get(row.name) == row.version:
+                continue
+
+            cls._versions[row.name] = row.version
+
+            # Our own writes were applied when they were made.
+            if row.origin == cls.ORIGIN:
+                continue
+
+            cls._values[row.name] = value = json.loads(row.value)
+
+            if (callback := cls._subscribers.get(row.name)) is None:
+                continue
+
+            try:
+                await callback(value)
+            except Exception:  # pylint: disable=broad-except
+                _log.exception("Failed to apply shared %s", row.name)
+
+    @classmethod
+    async def poll_user_writes(cls):
+        """Drop the values cached for the users other processes wrote to
+        since the last poll.
+
+        IDs are handed out when a write starts, so a write committed late can
+        show up below the latest ID already seen. The last
+        `Config.USER_WRITES_OVERLAP` IDs are read again on every poll, and
+        each user's latest write ID is remembered so that a write is only
+        applied once.
+        """
+        after_id = max((cls._user_write_id or 0) - Config.USER_WRITES_OVERLAP, 0)
+        writes = await Storage.get_user_writes(after_id)
+
+        for write in writes:
+            if cls._user_write_ids.get(write.user_id, 0) >= write.write_id:
+                continue
+
+            cls._user_write_ids[write.user_id] = write.write_id
+
+            if cls._user_write_id is not None and write.origin != cls.ORIGIN:
+                UserCache.bump(write.user_id)
+
+        if cls._user_write_id is None:
+            # Writes made before the first poll can't be told apart.
+            UserCache.clear()
+
+        if writes:
+            cls._user_write_id = max(cls._user_write_id or 0, writes[-1].write_id)
+        elif cls._user_write_id is None:
+            cls._user_write_id = 0
+
+        # Writes below the window are never read again; any newer write to
+        # the same user has a higher ID.
+        after_id = max(cls._user_write_id - Config.USER_WRITES_OVERLAP, 0)
+        cls._user_write_ids = {
+            user_id: write_id
+            for user_id, write_id in cls._user_write_ids.items()
+            if write_id > after_id
+        }
+
+    @classmethod
+    async def _share_user_write(cls, event: Any):
+        await Storage.record_user_write(event.user_id, cls.ORIGIN)
+        ShardCoordinator.publish(SHARED_STATE_TOPIC)
+
+    @classmethod
+    async def _wake(cls):
+        cls._wakeup.set()
+
+    @classmethod
+    async def _poll_forever(cls):
+        while True:
+            try:
+                await cls.poll()
+                await cls.poll_user_writes()
+            except Exception:  # pylint: disable=broad-except
+                _log.exception("Failed to poll shared state")
+
+            try:
+                await asyncio.wait_for(cls._wakeup.wait(),
+                                       Config.SHARED_STATE_POLL_INTERVAL.total_seconds())
+            except asyncio.TimeoutError:
+                pass
+
+            cls._wakeup.clear()
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import aiomysql
+
+from pombot.config import Config, Secrets
+from pombot.lib.pom_wars.action_totals import ActionTotals
+from pombot.lib.storage import Storage
+from pombot.lib.undo_stack import UndoStack
+
+_log = logging.getLogger(__name__)
+
+MAGIC = b"PBSN"
+VERSION = 3
+
+# Magic, version, then the time of the snapshot in seconds since the epoch.
+_HEADER = struct.Struct(">4sHQ")
+
+
+class Snapshot:
+    """Save the in-memory state which is costly to rebuild to a local file,
+    and warm up from it after a restart.
+
+    The file is a short header followed by zlib-compressed JSON. A file of
+    another version or database is ignored. Only state which can be brought
+    up to date from the database is saved:
+
+        - The settled Pom Wars totals, which are brought up to date by
+          summing the actions added since their watermark.
+        - The undo stacks, whose pom rows `!undo` checks before deleting.
+          The stacks of users who added poms since the snapshot are dropped,
+          since they no longer end with the user's latest poms.
+
+    The other caches are either short-lived or can't tell what changed while
+    the bot was down, so they start empty.
+    """
+    _writer: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def save(cls, path: Path):
+        """Write the snapshot, replacing the previous one only once complete."""
+        # Read before the stacks, so that any pom pushed in between counts as
+        # added since the snapshot.
+        pom_watermark = await Storage.get_last_pom_id()
+
+        payload = {
+            "database": Secrets.MYSQL_DATABASE,
+            "action_totals": ActionTotals.to_snapshot(),
+            "pom_watermark": pom_watermark,
+            "undo_stacks": UndoStack.to_snapshot(),
+        }
+
+        data = _HEADER.pack(MAGIC, VERSION, int(time.time())) + zlib.compress(
+            json.dumps(payload, separators=(",", ":")).encode())
+
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    @classmethod
+    async def load(cls, path: Path) -> bool:
+        """Restore the state saved in the snapshot, if it is usable.
+
+        @return Whether anything was restored.
+        """
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return False
+        except OSError as exc:
+            _log.error("Could not read snapshot %s: %s", path, exc)
+            return False
+
+        try:
+            magic, version, saved_at = _HEADER.unpack_from(data)
+            payload = json.loads(zlib.decompress(data[_HEADER.size:]))
+        except (struct.error, zlib.error, ValueError) as exc:
+            _log.error("Ignoring unreadable snapshot %s: %s", path, exc)
+            return False
+
+        if magic != MAGIC or version != VERSION:
+            _log.info("Ignoring snapshot %s of version %s", path, version)
+            return False
+
+        if payload["database"] != Secrets.MYSQL_DATABASE:
+            _log.info("Ignoring snapshot %s of database %s", path, payload["database"])
+            return False
+
+        # A watermark past the last action means the table was emptied since.
+        if (totals := payload["action_totals"]) is not None:
+            if totals["watermark"] <= await Storage.get_last_action_id():
+                ActionTotals.restore(totals)
+
+        stale_user_ids = await Storage.get_users_with_poms_after(payload["pom_watermark"])
+        UndoStack.restore([[user_id, stack] for user_id, stack in payload["undo_stacks"]
+                           if user_id not in stale_user_ids])
+
+        _log.info("Restored snapshot %s from %s", path,
+                  time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(saved_at)))
+
+        return True
+
+    @classmethod
+    async def start(cls, path: Path, *, restore: bool = True):
+        """Restore the snapshot, then save it every SNAPSHOT_INTERVAL.
+
+        Calling this again while the writer is running has no effect, so it is
+        safe to call from `on_ready`, which fires again on reconnects.
+
+        @param restore Whether to restore the snapshot first.
+        """
+        if cls._writer and not cls._writer.done():
+            return
+
+        if restore:
+            await cls.load(path)
+
+        async def _write_forever():
+            while True:
+                await asyncio.sleep(Config.SNAPSHOT_INTERVAL.total_seconds())
+
+                try:
+                    await cls.save(path)
+                except (OSError, aiomysql.Error) as exc:
+                    _log.error("Could not write snapshot %s: %s", path, exc)
+
+        cls._writer = asyncio.create_task(_write_forever())
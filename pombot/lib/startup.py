@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from time import perf_counter
+from typing import Any, Awaitable, Dict, List, Optional, Set
+
+_log = logging.getLogger(__name__)
+
+
+class Startup:
+    """Run and time the phases of warming up after logging into Discord.
+
+    Independent phases are meant to run concurrently, e.g. with
+    `asyncio.gather`, and a phase which depends on another, even from another
+    `on_ready` handler, waits for it with `wait_for`. Every phase is logged
+    with its duration.
+
+    `on_ready` fires again on every reconnect, but a phase only runs until it
+    first succeeds, unless it is run with `repeat`.
+    """
+    _phases: Dict[str, asyncio.Future] = {}
+    _running: Set[str] = set()
+    durations: Dict[str, float] = {}
+
+    @classmethod
+    async def run(cls, name: str, awaitable: Awaitable, *, repeat: bool = False) -> Any:
+        """Run a phase and return its result.
+
+        A phase which already succeeded isn't run again; its first result is
+        returned instead. A phase which is still running is waited for. When
+        the phase fails, so does waiting for it, and it runs again next time.
+
+        @param name Name of the phase.
+        @param awaitable The work of the phase.
+        @param repeat Whether to run the phase every time, e.g. for work which
+            depends on the guilds the bot is in.
+        """
+        future = cls._phases.get(name)
+
+        if name in cls._running or (not repeat and _succeeded(future)):
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+
+            return await asyncio.shield(future)
+
+        if future is None or future.done():
+            future = cls._phases[name] = asyncio.get_running_loop().create_future()
+
+        cls._running.add(name)
+        started = perf_counter()
+
+        try:
+            result = await awaitable
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            # Mark the error as retrieved, since it is raised here anyway.
+            future.set_exception(exc)
+            future.exception()
+            _log.error("Startup phase %s failed after %.2fs", name, perf_counter() - started)
+            raise
+        finally:
+            cls._running.discard(name)
+
+        cls.durations[name] = perf_counter() - started
+        future.set_result(result)
+        _log.info("Startup phase %s took %.2fs", name, cls.durations[name])
+
+        return result
+
+    @classmethod
+    async def wait_for(cls, name: str):
+        """Wait until a phase has run, raising its error if it failed.
+
+        A phase which failed before this is called is waited for until it is
+        run again.
+        """
+        if (future := cls._phases.get(name)) is None or (
+                future.done() and not _succeeded(future)):
+            future = cls._phases[name] = asyncio.get_running_loop().create_future()
+
+        await asyncio.shield(future)
+
+    @classmethod
+    def get_summary_lines(cls) -> List[str]:
+        """Return a human-readable table of how long each phase last took."""
+        lines = ["{:<22}{:>9}".format("startup phase", "seconds")]
+
+        for name, duration in cls.durations.items():
+            lines.append("{:<22}{:>9.2f}".format(name[:21], duration))
+
+        return lines
+
+
+def _succeeded(future: Optional[asyncio.Future]) -> bool:
+    return (future is not None and future.done() and not future.cancelled() and
+            future.exception() is None)
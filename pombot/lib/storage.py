@@ -1,53 +1,127 @@
+import asyncio
 import logging
 import sys
+import weakref
+from collections import Counter, OrderedDict
 from contextlib import asynccontextmanager
 from datetime import datetime as dt
 from datetime import time, timezone
-from typing import Iterable, List, Optional, Set, Union
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import aiomysql
 from discord.user import User as DiscordUser
 import pombot.lib.pom_wars.errors as war_crimes
 from pombot.config import Config, Secrets
 from pombot.lib import errors
-from pombot.lib.types import (Action, ActionType, DateRange, Event, Pom,
-                              SessionType)
+from pombot.lib.event_bus import (USER_WRITES, ActionRecorded, EventBus,
+                                  PomEventsChanged, PomsAdded, PomsDeleted,
+                                  PomsRenamed, SessionBanked, TablesCleared,
+                                  TeamChanged, TimezoneChanged, UserJoined)
+from pombot.lib.metrics import Metrics, QueryStats
+from pombot.lib.read_cache import ReadCache
+from pombot.lib.types import (Action, ActionSums, ActionType, DateRange,
+                              Event, Pom, SessionType, SharedValue, UserWrite)
 from pombot.lib.types import User as PombotUser
-from pombot.state import State
+from pombot.lib.user_cache import UserCache
 
 _log = logging.getLogger(__name__)
 
 
+# One pool per event loop. The bot runs a single loop per process, but unit
+# tests get a new loop for every test.
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Future]" = \
+    weakref.WeakKeyDictionary()
+
+# Interned descriptions: (user ID, description) -> description ID, least
+# recently used first. Entries can go stale when another process renames or
+# merges a description, so poms are only ever inserted against a cached ID
+# which still names the same description (see `_insert_poms`).
+_descript_ids: "OrderedDict[Tuple[int, str], int]" = OrderedDict()
+
+
+async def _get_pool() -> aiomysql.Pool:
+    loop = asyncio.get_running_loop()
+
+    if (pool := _pools.get(loop)) is None:
+        pool = _pools[loop] = asyncio.ensure_future(aiomysql.create_pool(
+            minsize=1,
+            maxsize=Config.MYSQL_POOL_SIZE,
+            pool_recycle=int(Config.MYSQL_POOL_RECYCLE.total_seconds()),
+            db=Secrets.MYSQL_DATABASE,
+            host=Secrets.MYSQL_HOST,
+            user=Secrets.MYSQL_USER,
+            password=Secrets.MYSQL_PASSWORD,
+            charset="utf8",
+        ))
+
+    try:
+        # Shield the pool from being cancelled along with one of its users.
+        return await asyncio.shield(pool)
+    except (aiomysql.Error, OSError):
+        # Try again next time rather than failing forever.
+        _pools.pop(loop, None)
+        raise
+
+
 @asynccontextmanager
 async def _mysql_database_connection():
-    db_config = {
-        "db":       Secrets.MYSQL_DATABASE,
-        "host":     Secrets.MYSQL_HOST,
-        "user":     Secrets.MYSQL_USER,
-        "password": Secrets.MYSQL_PASSWORD,
-        "loop":     State.event_loop,
-        "charset":  "utf8",
-    }
-    connection: aiomysql.Connection = await aiomysql.connect(**db_config)
+    pool = await _get_pool()
 
-    try:
-        yield connection
-    except aiomysql.Error:
-        await connection.rollback()
+    async with pool.acquire() as connection:
+        try:
+            yield connection
+        except aiomysql.Error:
+            await connection.rollback()
+
+            # Handle error at callsite.
+            raise
+        except BaseException:
+            # Do not return a connection in the middle of a transaction to
+            # the pool. aiomysql.Connection.close() returns None, not a coro.
+            connection.close()
+            raise
+        else:
+            await connection.commit()
 
-        # Handle error at callsite.
-        raise
-    else:
-        await connection.commit()
-    finally:
-        # aiomysql.Connection.close() returns None, not a coro.
-        connection.close()
+
+class _InstrumentedCursor(aiomysql.Cursor):
+    """Cursor which reports every round-trip to the command metrics and
+    times every statement for the per-shape query stats.
+
+    `executemany` is implemented in terms of `execute`, so round-trips are
+    counted in `execute`, but an `executemany` is timed as a single query.
+    """
+    _in_executemany = False
+
+    async def execute(self, query, args=None):
+        start = perf_counter()
+        result = await super().execute(query, args)
+        Metrics.record_query(self.rowcount if self.description else 0)
+
+        if not self._in_executemany:
+            QueryStats.record(query, perf_counter() - start, max(self.rowcount, 0))
+
+        return result
+
+    async def executemany(self, query, args):
+        start = perf_counter()
+        self._in_executemany = True
+
+        try:
+            result = await super().executemany(query, args)
+        finally:
+            self._in_executemany = False
+
+        QueryStats.record(query, perf_counter() - start, max(self.rowcount, 0))
+
+        return result
 
 
 @asynccontextmanager
 async def _mysql_database_cursor():
     async with _mysql_database_connection() as connection:
-        cursor: aiomysql.Cursor =  await connection.cursor()
+        cursor: aiomysql.Cursor =  await connection.cursor(_InstrumentedCursor)
 
         try:
             yield cursor
@@ -64,6 +138,192 @@ def _replace_further_occurances(text: str, old: str, new: str) -> str:
     return text[:offset] + text[offset:].replace(old, new)
 
 
+def _column_exists_query(table: str, column: str) -> str:
+    """Return a query which returns a row when the table has this column."""
+    return f"""
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = '{table}'
+        AND COLUMN_NAME = '{column}'
+    """
+
+
+def _session_condition(session: SessionType) -> str:
+    """Return the condition matching poms in a session of this type."""
+    if session == SessionType.CURRENT:
+        return "banked_at IS NULL"
+
+    return "banked_at IS NOT NULL"
+
+
+async def _get_open_session_id(cursor: aiomysql.Cursor, user: DiscordUser, started: dt) -> int:
+    """Return the ID of the user's current session, starting one if needed.
+
+    Two concurrent first poms can start two sessions, which is harmless,
+    since every open session of a user is part of their current session.
+
+    The session is locked until the cursor's transaction ends, so that it
+    can't be banked before the poms added to it are counted.
+    """
+    await cursor.execute(f"""
+        SELECT id FROM {Config.SESSIONS_TABLE}
+        WHERE userID=%s
+        AND banked_at IS NULL
+        ORDER BY id DESC
+        LIMIT 1
+        FOR UPDATE;
+    """, (user.id, ))
+
+    if row := await cursor.fetchone():
+        return row[0]
+
+    await cursor.execute(f"""
+        INSERT INTO {Config.SESSIONS_TABLE} (userID, started)
+        VALUES (%s, %s);
+    """, (user.id, started))
+
+    return cursor.lastrowid
+
+
+async def _get_descript_id(cursor: aiomysql.Cursor, user_id: int, descript: str) -> int:
+    """Return the ID of a user's description, adding it if it's new."""
+    key = (user_id, descript)
+
+    if (descript_id := _descript_ids.get(key)) is not None:
+        _descript_ids.move_to_end(key)
+        return descript_id
+
+    # LAST_INSERT_ID(id) makes lastrowid the existing ID on a duplicate.
+    await cursor.execute(f"""
+        INSERT INTO {Config.DESCRIPTIONS_TABLE} (userID, descript)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id);
+    """, key)
+
+    _descript_ids[key] = descript_id = cursor.lastrowid
+
+    while len(_descript_ids) > Config.DESCRIPTION_CACHE_SIZE:
+        _descript_ids.popitem(last=False)
+
+    return descript_id
+
+
+async def _insert_poms(
+    cursor: aiomysql.Cursor,
+    user: DiscordUser,
+    descript: Optional[str],
+    quantity: int,
+    time_set: dt,
+    session_id: int,
+) -> int:
+    """Insert a single row of poms, interning its description, and return
+    the ID of the row.
+    """
+    if descript is None:
+        await cursor.execute(f"""
+            INSERT INTO {Config.POMS_TABLE} (userID, descript_id, quantity, time_set, session_id)
+            VALUES (%s, NULL, %s, %s, %s);
+        """, (user.id, quantity, time_set, session_id))
+        return cursor.lastrowid
+
+    # Selecting the description guards against a stale cached ID, in which
+    # case nothing is inserted and the description is interned again.
+    for _ in range(2):
+        descript_id = await _get_descript_id(cursor, user.id, descript)
+
+        await cursor.execute(f"""
+            INSERT INTO {Config.POMS_TABLE} (userID, descript_id, quantity, time_set, session_id)
+            SELECT %s, id, %s, %s, %s FROM {Config.DESCRIPTIONS_TABLE}
+            WHERE id = %s
+            AND descript = %s;
+        """, (user.id, quantity, time_set, session_id, descript_id, descript))
+
+        if cursor.rowcount:
+            return cursor.lastrowid
+
+        _descript_ids.pop((user.id, descript), None)
+
+    raise RuntimeError(f"Failed to intern description: {descript}")
+
+
+async def _rename_poms(
+    cursor: aiomysql.Cursor,
+    user_id: int,
+    old_description: str,
+    new_description: str,
+    in_scope: str,
+) -> int:
+    """Rename a user's poms matching `in_scope` and return the number of
+    poms renamed.
+    """
+    # The old description matches regardless of case, like `get_poms`,
+    # so it can name more than one description.
+    count_query = f"""
+        SELECT
+            descript_id,
+            descript,
+            SUM(IF({in_scope}, quantity, 0)),
+            SUM(NOT ({in_scope}))
+        FROM {Config.POMS_TABLE}
+        JOIN {Config.SESSIONS_TABLE} ON session_id = {Config.SESSIONS_TABLE}.id
+        JOIN {Config.DESCRIPTIONS_TABLE} ON descript_id = {Config.DESCRIPTIONS_TABLE}.id
+        WHERE {Config.DESCRIPTIONS_TABLE}.userID=%s
+        AND descript=%s COLLATE utf8_general_ci
+        GROUP BY descript_id;
+    """
+
+    await cursor.execute(count_query, (user_id, old_description))
+    rows = await cursor.fetchall()
+
+    num_poms = sum(int(num_in_scope) for _, _, num_in_scope, _ in rows)
+
+    if not num_poms:
+        return 0
+
+    for _, descript, _, _ in rows:
+        _descript_ids.pop((user_id, descript), None)
+
+    if len(rows) == 1 and not rows[0][3]:
+        try:
+            await cursor.execute(f"""
+                UPDATE {Config.DESCRIPTIONS_TABLE}
+                SET descript=%s
+                WHERE id=%s;
+            """, (new_description, rows[0][0]))
+        except aiomysql.IntegrityError:
+            # The user already has poms of the new description.
+            pass
+        else:
+            return num_poms
+
+    new_id = await _get_descript_id(cursor, user_id, new_description)
+    old_ids = [descript_id for descript_id, _, num_in_scope, _ in rows
+               if num_in_scope and descript_id != new_id]
+
+    if not old_ids:
+        return num_poms
+
+    ids = ", ".join(["%s"] * len(old_ids))
+
+    await cursor.execute(f"""
+        UPDATE {Config.POMS_TABLE}
+        JOIN {Config.SESSIONS_TABLE} ON session_id = {Config.SESSIONS_TABLE}.id
+        SET descript_id=%s
+        WHERE descript_id IN ({ids})
+        AND {in_scope};
+    """, (new_id, *old_ids))
+
+    # Forget the descriptions which no longer have any poms.
+    await cursor.execute(f"""
+        DELETE {Config.DESCRIPTIONS_TABLE} FROM {Config.DESCRIPTIONS_TABLE}
+        LEFT JOIN {Config.POMS_TABLE} ON descript_id = {Config.DESCRIPTIONS_TABLE}.id
+        WHERE {Config.DESCRIPTIONS_TABLE}.id IN ({ids})
+        AND {Config.POMS_TABLE}.id IS NULL;
+    """, old_ids)
+
+    return num_poms
+
+
 class Storage:
     """The global object-relational mapping."""
 
@@ -74,10 +334,38 @@ class Storage:
                 CREATE TABLE IF NOT EXISTS {Config.POMS_TABLE} (
                     id INT(11) NOT NULL AUTO_INCREMENT,
                     userID BIGINT(20),
-                    descript VARCHAR(30),
+                    descript_id INT(11) NULL,
+                    quantity INT(11) NOT NULL DEFAULT 1,
                     time_set TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    current_session TINYINT(1),
-                    PRIMARY KEY(id)
+                    session_id INT(11) NOT NULL,
+                    PRIMARY KEY(id),
+                    INDEX(session_id),
+                    INDEX(descript_id)
+                );
+            """
+        },
+        {
+            "name": Config.DESCRIPTIONS_TABLE,
+            "create_query": f"""
+                CREATE TABLE IF NOT EXISTS {Config.DESCRIPTIONS_TABLE} (
+                    id INT(11) NOT NULL AUTO_INCREMENT,
+                    userID BIGINT(20) NOT NULL,
+                    descript VARCHAR(30) CHARACTER SET utf8 COLLATE utf8_bin NOT NULL,
+                    PRIMARY KEY(id),
+                    UNIQUE(userID, descript)
+                );
+            """
+        },
+        {
+            "name": Config.SESSIONS_TABLE,
+            "create_query": f"""
+                CREATE TABLE IF NOT EXISTS {Config.SESSIONS_TABLE} (
+                    id INT(11) NOT NULL AUTO_INCREMENT,
+                    userID BIGINT(20) NOT NULL,
+                    started TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    banked_at TIMESTAMP NULL DEFAULT NULL,
+                    PRIMARY KEY(id),
+                    INDEX(userID, banked_at)
                 );
             """
         },
@@ -127,6 +415,142 @@ class Storage:
                 );
             """
         },
+        {
+            "name": Config.SHARED_STATE_TABLE,
+            "create_query": f"""
+                CREATE TABLE IF NOT EXISTS {Config.SHARED_STATE_TABLE} (
+                    name VARCHAR(64) NOT NULL,
+                    value TEXT,
+                    version BIGINT(20) NOT NULL DEFAULT 1,
+                    origin VARCHAR(32) NOT NULL,
+                    PRIMARY KEY(name)
+                );
+            """
+        },
+        {
+            "name": Config.USER_WRITES_TABLE,
+            "create_query": f"""
+                CREATE TABLE IF NOT EXISTS {Config.USER_WRITES_TABLE} (
+                    id BIGINT(20) NOT NULL AUTO_INCREMENT,
+                    userID BIGINT(20) NOT NULL UNIQUE,
+                    origin VARCHAR(32) NOT NULL,
+                    PRIMARY KEY(id)
+                );
+            """
+        },
+    ]
+
+    # Changes to existing tables, in order. A migration runs when its
+    # "needed_query" returns any rows. A migration which failed part way
+    # through runs again, so each query must be safe to repeat, or be given
+    # with an "unless" query which returns rows once it has run.
+    MIGRATIONS = [
+        {
+            "name": "Move poms into sessions",
+            "needed_query": f"SHOW COLUMNS FROM {Config.POMS_TABLE} LIKE 'current_session';",
+            "queries": [
+                {
+                    "unless": _column_exists_query(Config.POMS_TABLE, "session_id"),
+                    "query": f"""
+                        ALTER TABLE {Config.POMS_TABLE}
+                        ADD COLUMN session_id INT(11) NOT NULL AFTER time_set,
+                        ADD INDEX(session_id);
+                    """,
+                },
+                # One open session per user for their current session, and
+                # one banked session for their whole bank. Poms of a NULL
+                # current_session are banked. The sessions are only kept
+                # once the poms are moved into them, in the same transaction.
+                {
+                    "unless": f"SELECT 1 FROM {Config.SESSIONS_TABLE} LIMIT 1;",
+                    "query": f"""
+                        INSERT INTO {Config.SESSIONS_TABLE} (userID, started, banked_at)
+                        SELECT userID, MIN(time_set),
+                            IF(COALESCE(current_session, 0), NULL, MAX(time_set))
+                        FROM {Config.POMS_TABLE}
+                        GROUP BY userID, COALESCE(current_session, 0);
+                    """,
+                },
+                f"""
+                    UPDATE {Config.POMS_TABLE} AS p
+                    JOIN {Config.SESSIONS_TABLE} AS s
+                    ON s.userID = p.userID
+                    AND (s.banked_at IS NULL) = (COALESCE(p.current_session, 0) = 1)
+                    SET p.session_id = s.id;
+                """,
+                f"ALTER TABLE {Config.POMS_TABLE} DROP COLUMN current_session;",
+            ],
+        },
+        {
+            "name": "Fold identical poms into quantities",
+            "needed_query": f"""
+                SELECT 1 FROM DUAL WHERE NOT EXISTS (
+                    {_column_exists_query(Config.POMS_TABLE, 'quantity')}
+                );
+            """,
+            # Adding the column doesn't lock the table. The fold then runs as
+            # one transaction, keeping the first row of each group of
+            # identical poms and deleting the others. Should it not run, the
+            # identical poms are still counted correctly, only unfolded.
+            "queries": [
+                f"""
+                    ALTER TABLE {Config.POMS_TABLE}
+                    ADD COLUMN quantity INT(11) NOT NULL DEFAULT 1 AFTER descript,
+                    ALGORITHM=INPLACE, LOCK=NONE;
+                """,
+                f"""
+                    UPDATE {Config.POMS_TABLE} AS p
+                    JOIN (
+                        SELECT MIN(id) AS id, SUM(quantity) AS quantity
+                        FROM {Config.POMS_TABLE}
+                        GROUP BY userID, descript, time_set, session_id
+                        HAVING COUNT(*) > 1
+                    ) AS g ON g.id = p.id
+                    SET p.quantity = g.quantity;
+                """,
+                f"""
+                    DELETE p FROM {Config.POMS_TABLE} AS p
+                    JOIN (
+                        SELECT MIN(id) AS id, userID, descript, time_set, session_id
+                        FROM {Config.POMS_TABLE}
+                        GROUP BY userID, descript, time_set, session_id
+                        HAVING COUNT(*) > 1
+                    ) AS g ON g.userID = p.userID
+                    AND g.descript <=> p.descript
+                    AND g.time_set = p.time_set
+                    AND g.session_id = p.session_id
+                    AND g.id <> p.id;
+                """,
+            ],
+        },
+        {
+            "name": "Move descriptions into their own table",
+            "needed_query": f"SHOW COLUMNS FROM {Config.POMS_TABLE} LIKE 'descript';",
+            "queries": [
+                {
+                    "unless": _column_exists_query(Config.POMS_TABLE, "descript_id"),
+                    "query": f"""
+                        ALTER TABLE {Config.POMS_TABLE}
+                        ADD COLUMN descript_id INT(11) NULL AFTER userID,
+                        ADD INDEX(descript_id);
+                    """,
+                },
+                f"""
+                    INSERT IGNORE INTO {Config.DESCRIPTIONS_TABLE} (userID, descript)
+                    SELECT DISTINCT userID, CONVERT(descript USING utf8) COLLATE utf8_bin
+                    FROM {Config.POMS_TABLE}
+                    WHERE descript IS NOT NULL;
+                """,
+                f"""
+                    UPDATE {Config.POMS_TABLE} AS p
+                    JOIN {Config.DESCRIPTIONS_TABLE} AS d
+                    ON d.userID = p.userID
+                    AND d.descript = CONVERT(p.descript USING utf8) COLLATE utf8_bin
+                    SET p.descript_id = d.id;
+                """,
+                f"ALTER TABLE {Config.POMS_TABLE} DROP COLUMN descript;",
+            ],
+        },
     ]
 
     @classmethod
@@ -150,6 +574,57 @@ class Storage:
             async with _mysql_database_cursor() as cursor:
                 await cursor.execute(create_query)
 
+        await cls.migrate_tables()
+
+    @classmethod
+    async def migrate_tables(cls):
+        """Run the migrations which existing tables still need.
+
+        Processes starting together would run the same migrations at once, so
+        they are run under a lock on the database, by whichever process takes
+        it first. The others then find nothing left to do.
+        """
+        async with _mysql_database_cursor() as cursor:
+            for migration in cls.MIGRATIONS:
+                await cursor.execute(migration["needed_query"])
+
+                if await cursor.fetchall():
+                    break
+            else:
+                return
+
+            # Don't keep reading the tables as they were before the lock.
+            await cursor.connection.commit()
+            await cursor.execute("SELECT GET_LOCK(CONCAT(DATABASE(), '.migrations'), %s);",
+                                 (Config.MIGRATION_LOCK_TIMEOUT.total_seconds(), ))
+
+            if (await cursor.fetchone())[0] != 1:
+                raise RuntimeError("Timed out waiting for another process to migrate tables.")
+
+            try:
+                for migration in cls.MIGRATIONS:
+                    await cursor.execute(migration["needed_query"])
+
+                    if not await cursor.fetchall():
+                        continue
+
+                    _log.info("Migrating tables: %s", migration["name"])
+
+                    for query in migration["queries"]:
+                        if isinstance(query, dict):
+                            await cursor.execute(query["unless"])
+
+                            if await cursor.fetchall():
+                                continue
+
+                            query = query["query"]
+
+                        await cursor.execute(query)
+
+                    await cursor.connection.commit()
+            finally:
+                await cursor.execute("SELECT RELEASE_LOCK(CONCAT(DATABASE(), '.migrations'));")
+
     @classmethod
     async def delete_all_rows_from_all_tables(cls):
         """Delete all rows from all tables.
@@ -161,6 +636,9 @@ class Storage:
         async with _mysql_database_cursor() as cursor:
             for table_name in (table["name"] for table in cls.TABLES):
                 await cursor.execute(f"DELETE FROM {table_name};")
+
+        _descript_ids.clear()
+        await EventBus.publish(TablesCleared())
         _log.info("Tables deleted.")
 
     @staticmethod
@@ -169,57 +647,80 @@ class Storage:
         descript: Optional[Union[str, Iterable]],
         count: int,
         time_set: dt = None,
-    ):
-        """Add a number of user poms.
+    ) -> List[int]:
+        """Add a number of user poms as a single row and return the IDs of
+        the rows added.
 
         If `descript` is specified as a non-string iterable, like a list or
         generator, then this will check that we're in a unit test and fail if
         not. This is because it is generally only possible to have one pom
         description per user command specified, but this makes unit tests that
-        require many poms in the DB very slow.
-        """
-        query = f"""
-            INSERT INTO {Config.POMS_TABLE} (
-                userID,
-                descript,
-                time_set,
-                current_session
-            )
-            VALUES (%s, %s, %s, %s);
+        require many poms in the DB very slow. Each description then gets one
+        row holding `count` poms for every time it appears.
         """
-
         descript = descript or None
         time_set = time_set or dt.now()
 
-        if type(descript) in [str, type(None)]:
-            poms = [(user.id, descript, time_set, True) for _ in range(count)]
-        else:
-            assert "unittest" in sys.modules, \
-                f"{type(descript)} not allowed for descript outside of unit tests"
+        async with _mysql_database_cursor() as cursor:
+            session_id = await _get_open_session_id(cursor, user, time_set)
 
-            poms = [(user.id, desc, time_set, True)
-                    for desc in descript
-                    for _ in range(count)]
+            if type(descript) in [str, type(None)]:
+                pom_ids = [await _insert_poms(cursor, user, descript, count, time_set, session_id)]
+                num_poms = count
+            else:
+                assert "unittest" in sys.modules, \
+                    f"{type(descript)} not allowed for descript outside of unit tests"
 
-        async with _mysql_database_cursor() as cursor:
-            await cursor.executemany(query, poms)
+                descripts = Counter(descript)
+                pom_ids = [
+                    await _insert_poms(cursor, user, desc or None, num_descripts * count,
+                                       time_set, session_id)
+                    for desc, num_descripts in descripts.items()
+                ]
+                num_poms = sum(descripts.values()) * count
+
+        await EventBus.publish(PomsAdded(user.id, tuple(pom_ids), num_poms, time_set))
+
+        return pom_ids
 
     @staticmethod
     async def bank_user_session_poms(user: DiscordUser) -> int:
-        """Set all active session poms to be non-active and return number of
-        rows affected.
+        """Close the user's current session, moving its poms to their bank,
+        and return the number of poms banked.
+
+        The open sessions are locked first, so that poms being added to them
+        are either counted and banked together or go to a new session.
         """
-        query = f"""
-            UPDATE {Config.POMS_TABLE}
-            SET current_session = 0
+        sessions_query = f"""
+            SELECT id FROM {Config.SESSIONS_TABLE}
             WHERE userID = %s
-            AND current_session = 1;
+            AND banked_at IS NULL
+            FOR UPDATE;
         """
 
         async with _mysql_database_cursor() as cursor:
-            rows_affected = await cursor.execute(query, (user.id, ))
+            await cursor.execute(sessions_query, (user.id, ))
+            session_ids = [session_id for session_id, in await cursor.fetchall()]
+            num_poms = 0
+
+            if session_ids:
+                ids = ", ".join(["%s"] * len(session_ids))
+
+                await cursor.execute(f"""
+                    SELECT COALESCE(SUM(quantity), 0) FROM {Config.POMS_TABLE}
+                    WHERE session_id IN ({ids});
+                """, session_ids)
+                num_poms, = await cursor.fetchone()
+
+                await cursor.execute(f"""
+                    UPDATE {Config.SESSIONS_TABLE}
+                    SET banked_at = %s
+                    WHERE id IN ({ids});
+                """, (dt.now(), *session_ids))
 
-        return rows_affected
+        await EventBus.publish(SessionBanked(user.id, int(num_poms)))
+
+        return int(num_poms)
 
     @staticmethod
     async def delete_poms(
@@ -236,9 +737,13 @@ class Storage:
         @param user Only match poms for this user.
         @param time_set Only match poms with this timestamp value.
         @param session Only remove poms from this session.
-        @return Number of rows deleted.
+        @return Number of poms deleted.
         """
-        query = [f"DELETE FROM {Config.POMS_TABLE} WHERE userID=%s"]
+        query = [f"""
+            FROM {Config.POMS_TABLE}
+            JOIN {Config.SESSIONS_TABLE} ON session_id = {Config.SESSIONS_TABLE}.id
+            WHERE {Config.POMS_TABLE}.userID=%s
+        """]
         args = [user.id]
 
         if time_set:
@@ -250,17 +755,83 @@ class Storage:
                     session not in [SessionType.CURRENT, SessionType.BANKED]):
                 raise RuntimeError("Invalid session type for removal.")
 
-            query += ["WHERE current_session=%s"]
-            args += [int(session == SessionType.CURRENT)]
+            query += ["WHERE " + _session_condition(session)]
 
         query_str = _replace_further_occurances(" ".join(query), "WHERE", "AND")
 
         async with _mysql_database_cursor() as cursor:
-            num_rows_removed = await cursor.execute(query_str, args)
+            await cursor.execute(f"SELECT COALESCE(SUM(quantity), 0) {query_str}", args)
+            num_poms_removed, = await cursor.fetchone()
+            await cursor.execute(f"DELETE {Config.POMS_TABLE} {query_str}", args)
+
+        await EventBus.publish(PomsDeleted(user.id, int(num_poms_removed)))
+
+        return int(num_poms_removed)
+
+    @staticmethod
+    async def delete_poms_by_id(*, user: DiscordUser, quantities: Dict[int, int]) -> List[Pom]:
+        """Delete a number of a user's poms from each of the rows named by
+        their IDs, deleting the rows which are left without any.
+
+        @param user Only match poms for this user.
+        @param quantities Number of poms to delete from each row, by row ID.
+        @return The poms deleted, each with the number deleted from its row,
+            which exclude any already deleted.
+        """
+        if not quantities:
+            return []
+
+        ids = ", ".join(["%s"] * len(quantities))
+        args = (user.id, *quantities)
+
+        select_query = f"""
+            SELECT
+                {Config.POMS_TABLE}.id,
+                {Config.POMS_TABLE}.userID,
+                descript,
+                time_set,
+                banked_at IS NULL,
+                quantity
+            FROM {Config.POMS_TABLE}
+            JOIN {Config.SESSIONS_TABLE} ON session_id = {Config.SESSIONS_TABLE}.id
+            LEFT JOIN {Config.DESCRIPTIONS_TABLE} ON descript_id = {Config.DESCRIPTIONS_TABLE}.id
+            WHERE {Config.POMS_TABLE}.userID=%s
+            AND {Config.POMS_TABLE}.id IN ({ids})
+            FOR UPDATE;
+        """
+
+        update_query = f"""
+            UPDATE {Config.POMS_TABLE}
+            SET quantity = quantity - %s
+            WHERE id=%s;
+        """
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(select_query, args)
+            poms = [Pom(*row) for row in await cursor.fetchall()]
+            emptied = [pom.pom_id for pom in poms if pom.quantity <= quantities[pom.pom_id]]
+
+            for pom in poms:
+                if pom.quantity > quantities[pom.pom_id]:
+                    # Other commands' poms were merged into this row.
+                    await cursor.execute(update_query, (quantities[pom.pom_id], pom.pom_id))
+                    pom.quantity = quantities[pom.pom_id]
+
+            if emptied:
+                emptied_ids = ", ".join(["%s"] * len(emptied))
 
-        return num_rows_removed
+                await cursor.execute(f"""
+                    DELETE FROM {Config.POMS_TABLE}
+                    WHERE id IN ({emptied_ids});
+                """, emptied)
+
+        if num_poms := sum(pom.quantity for pom in poms):
+            await EventBus.publish(PomsDeleted(user.id, num_poms))
+
+        return poms
 
     @staticmethod
+    @ReadCache.memoize(ttl=Config.EVENTS_READ_TTL, tables=[Config.EVENTS_TABLE])
     async def get_ongoing_events() -> List[Event]:
         """Return a list of ongoing Events."""
         query = f"""
@@ -286,22 +857,33 @@ class Storage:
         limit: int = None
     ) -> List[Pom]:
         """Get a list of poms from storage matching certain criteria. When
-        limit is set, then the order is assumed to be most recent first.
+        limit is set, then the order is most recently added first.
 
         @param user Only match poms for this user.
         @param date_range Only match poms within this date range.
         @param limit Maximum length of the returned list.
         @return List of Pom objects.
         """
-        query = [f"SELECT * FROM {Config.POMS_TABLE}"]
+        query = [f"""
+            SELECT
+                {Config.POMS_TABLE}.id,
+                {Config.POMS_TABLE}.userID,
+                descript,
+                time_set,
+                banked_at IS NULL,
+                quantity
+            FROM {Config.POMS_TABLE}
+            JOIN {Config.SESSIONS_TABLE} ON session_id = {Config.SESSIONS_TABLE}.id
+            LEFT JOIN {Config.DESCRIPTIONS_TABLE} ON descript_id = {Config.DESCRIPTIONS_TABLE}.id
+        """]
         args = []
 
         if user:
-            query += ["WHERE userID=%s"]
+            query += [f"WHERE {Config.POMS_TABLE}.userID=%s"]
             args += [user.id]
 
         if descript:
-            query += ["WHERE descript=%s"]
+            query += ["WHERE descript=%s COLLATE utf8_general_ci"]
             args += [descript]
 
         if date_range:
@@ -309,7 +891,7 @@ class Storage:
             args += [date_range.start_date, date_range.end_date]
 
         if limit:
-            query += ["ORDER BY time_set DESC LIMIT %s"]
+            query += [f"ORDER BY {Config.POMS_TABLE}.id DESC LIMIT %s"]
             args += [limit]
 
         query_str = _replace_further_occurances(" ".join(query), "WHERE", "AND")
@@ -320,6 +902,26 @@ class Storage:
 
         return [Pom(*row) for row in rows]
 
+    @staticmethod
+    async def count_poms(*, date_range: DateRange = None) -> int:
+        """Count the poms of all users.
+
+        @param date_range Only count poms within this date range.
+        @return Number of poms.
+        """
+        query = [f"SELECT COALESCE(SUM(quantity), 0) FROM {Config.POMS_TABLE}"]
+        args = []
+
+        if date_range:
+            query += ["WHERE time_set >= %s AND time_set <= %s"]
+            args += [date_range.start_date, date_range.end_date]
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(" ".join(query), args)
+            num_poms, = await cursor.fetchone()
+
+        return int(num_poms)
+
     @staticmethod
     async def add_new_event(name: str, goal: int, date_range: DateRange):
         """Add a new event row."""
@@ -343,6 +945,8 @@ class Storage:
                 # out of range.
                 raise errors.EventCreationError(exc.args[-1]) from exc
 
+        await EventBus.publish(PomEventsChanged())
+
     @staticmethod
     async def get_all_events() -> List[Event]:
         """Return a list of all events."""
@@ -389,6 +993,8 @@ class Storage:
         async with _mysql_database_cursor() as cursor:
             await cursor.execute(query, (name, ))
 
+        await EventBus.publish(PomEventsChanged())
+
     @classmethod
     async def add_user(cls, user_id: str, zone: timezone, team: str):
         """Add a user into the users table."""
@@ -410,6 +1016,8 @@ class Storage:
                 user = await cls.get_user_by_id(user_id)
                 raise war_crimes.UserAlreadyExistsError(user.team) from exc
 
+        await EventBus.publish(UserJoined(int(user_id), team))
+
     @staticmethod
     async def set_user_timezone(user_id: str, zone: timezone):
         """Set the user timezone."""
@@ -424,6 +1032,8 @@ class Storage:
         async with _mysql_database_cursor() as cursor:
             await cursor.execute(query, (zone_str, user_id))
 
+        await EventBus.publish(TimezoneChanged(int(user_id)))
+
     @staticmethod
     async def update_user_team(user_id: str, team: str):
         """Set the user team."""
@@ -436,6 +1046,8 @@ class Storage:
         async with _mysql_database_cursor() as cursor:
             await cursor.execute(query, (team, user_id))
 
+        await EventBus.publish(TeamChanged(int(user_id), team))
+
     @staticmethod
     async def update_user_poms_descriptions(
         user: DiscordUser,
@@ -444,29 +1056,35 @@ class Storage:
         banked_poms_only: bool = False,
         session_poms_only: bool = False,
     ) -> int:
-        """Update user poms matching a description to a new description."""
+        """Update user poms matching a description to a new description and
+        return the number of poms renamed.
+
+        When every pom of the description is renamed, only its row in the
+        descriptions table changes. Otherwise, or when the user already has
+        poms of the new description, the poms are moved to the new one.
+        """
         if banked_poms_only and session_poms_only:
             raise RuntimeError("Only one of banked_poms_only or session_poms_only allowed.")
 
-        query = f"""
-            UPDATE {Config.POMS_TABLE}
-            SET descript=%s
-            WHERE userID=%s
-            AND descript=%s
-        """
+        in_scope = "TRUE"
 
         if banked_poms_only:
-            query += "AND current_session=0"
+            in_scope = _session_condition(SessionType.BANKED)
 
         if session_poms_only:
-            query += "AND current_session=1"
+            in_scope = _session_condition(SessionType.CURRENT)
 
         async with _mysql_database_cursor() as cursor:
-            rows_affected = await cursor.execute(query, (new_description, user.id, old_description))
+            num_poms = await _rename_poms(
+                cursor, user.id, old_description, new_description, in_scope)
 
-        return rows_affected
+        if num_poms:
+            await EventBus.publish(PomsRenamed(user.id, num_poms))
+
+        return num_poms
 
     @staticmethod
+    @ReadCache.memoize(ttl=Config.USERS_READ_TTL, tables=[Config.USERS_TABLE])
     async def get_user_by_id(user_id: int) -> Optional[PombotUser]:
         """Return a single user by its userID."""
         query = f"""
@@ -484,6 +1102,7 @@ class Storage:
         return PombotUser(*row)
 
     @staticmethod
+    @ReadCache.memoize(ttl=Config.USERS_READ_TTL, tables=[Config.USERS_TABLE])
     async def get_users_by_id(user_ids: List[int]) -> Set[PombotUser]:
         """Return a list of users from a list of userID's.
 
@@ -540,7 +1159,11 @@ class Storage:
         async with _mysql_database_cursor() as cursor:
             await cursor.execute(query, values)
 
+        await EventBus.publish(
+            ActionRecorded(user.id, team, action_type, was_successful, damage or 0))
+
     @staticmethod
+    @ReadCache.memoize(ttl=Config.ACTIONS_READ_TTL, tables=[Config.ACTIONS_TABLE])
     async def get_actions(
         *,
         action_type: ActionType = None,
@@ -590,6 +1213,8 @@ class Storage:
         return [Action(*row) for row in rows]
 
     @staticmethod
+    @ReadCache.memoize(ttl=Config.ACTIONS_READ_TTL,
+                        tables=[Config.ACTIONS_TABLE, Config.USERS_TABLE])
     async def count_rows_in_table(
         table: str,
         *,
@@ -625,21 +1250,151 @@ class Storage:
         return int(row)
 
     @staticmethod
-    async def sum_team_damage(team: str) -> int:
-        """Get sum of the damage column for a team.
+    @ReadCache.memoize(ttl=Config.ACTIONS_READ_TTL, tables=[Config.ACTIONS_TABLE])
+    async def sum_actions_since(*, after_id: int, settled_before: dt) -> List[ActionSums]:
+        """Sum the actions added after a row by team and type.
+
+        Actions set before `settled_before` are summed apart from the others,
+        as those are assumed to be committed, so that no action with a lower
+        ID can still appear.
+
+        @param after_id Only sum the actions with a higher ID.
+        @param settled_before When actions become settled.
+        @return The sums of each team, type and whether the actions are
+            settled.
+        """
+        query = f"""
+            SELECT
+                team,
+                type,
+                time_set < %s,
+                COUNT(1),
+                COALESCE(SUM(damage), 0),
+                MIN(id),
+                MAX(id)
+            FROM {Config.ACTIONS_TABLE}
+            WHERE id > %s
+            GROUP BY 1, 2, 3;
+        """
 
-        The team parameter is a string here to avoid a circular reference.
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(query, (settled_before, after_id))
+            rows = await cursor.fetchall()
 
-        @param team Team name as a string.
-        @return Sum of the damage that the team has done thus far.
+        return [ActionSums(team, typ, bool(settled), int(count), int(damage), min_id, max_id)
+                for team, typ, settled, count, damage, min_id, max_id in rows]
+
+    @staticmethod
+    async def get_last_action_id() -> int:
+        """Return the highest ID in the actions table, or 0 when it is empty."""
+        query = f"SELECT COALESCE(MAX(id), 0) FROM {Config.ACTIONS_TABLE};"
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(query)
+            row, = await cursor.fetchone()
+
+        return int(row)
+
+    @staticmethod
+    async def get_last_pom_id() -> int:
+        """Return the highest ID in the poms table, or 0 when it is empty."""
+        query = f"SELECT COALESCE(MAX(id), 0) FROM {Config.POMS_TABLE};"
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(query)
+            row, = await cursor.fetchone()
+
+        return int(row)
+
+    @staticmethod
+    async def get_users_with_poms_after(pom_id: int) -> Set[int]:
+        """Return the IDs of the users who have poms with a higher ID."""
+        query = f"""
+            SELECT DISTINCT userID FROM {Config.POMS_TABLE}
+            WHERE id > %s;
+        """
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(query, (pom_id, ))
+            rows = await cursor.fetchall()
+
+        return {int(user_id) for user_id, in rows}
+
+    @staticmethod
+    async def set_shared_state(name: str, value: str, origin: str):
+        """Set a shared value and bump its version.
+
+        @param name Name of the value.
+        @param value The encoded value.
+        @param origin ID of the process setting the value.
         """
         query = f"""
-            SELECT SUM(damage) FROM {Config.ACTIONS_TABLE}
-            WHERE team=%s;
+            INSERT INTO {Config.SHARED_STATE_TABLE} (name, value, origin)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                value=VALUES(value),
+                version=version + 1,
+                origin=VALUES(origin);
         """
 
         async with _mysql_database_cursor() as cursor:
-            await cursor.execute(query, (team,))
-            row, = await cursor.fetchone()
+            await cursor.execute(query, (name, value, origin))
+
+    @staticmethod
+    async def get_shared_state() -> List[SharedValue]:
+        """Return every shared value."""
+        query = f"""
+            SELECT name, value, version, origin
+            FROM {Config.SHARED_STATE_TABLE};
+        """
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(query)
+            rows = await cursor.fetchall()
+
+        return [SharedValue(*row) for row in rows]
+
+    @staticmethod
+    async def record_user_write(user_id: int, origin: str):
+        """Record that a process wrote to a user's data, as the latest write.
+
+        @param user_id ID of the user whose data was written.
+        @param origin ID of the process which wrote.
+        """
+        # REPLACE gives the user's row the next ID, so rows stay one per user.
+        query = f"""
+            REPLACE INTO {Config.USER_WRITES_TABLE} (userID, origin)
+            VALUES (%s, %s);
+        """
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(query, (user_id, origin))
+
+    @staticmethod
+    async def get_user_writes(after_id: int) -> List[UserWrite]:
+        """Return the latest write to each user's data recorded after the
+        write with this ID, oldest first.
+        """
+        query = f"""
+            SELECT id, userID, origin
+            FROM {Config.USER_WRITES_TABLE}
+            WHERE id > %s
+            ORDER BY id;
+        """
+
+        async with _mysql_database_cursor() as cursor:
+            await cursor.execute(query, (after_id, ))
+            rows = await cursor.fetchall()
+
+        return [UserWrite(*row) for row in rows]
+
 
-        return int(row or 0)
+# Storage's own caches follow its writes before the writing call returns, so
+# that a user always reads their own writes.
+EventBus.subscribe(USER_WRITES, lambda event: UserCache.bump(event.user_id))
+EventBus.subscribe(ActionRecorded, lambda event: ReadCache.invalidate(Config.ACTIONS_TABLE))
+EventBus.subscribe((UserJoined, TeamChanged, TimezoneChanged),
+                   lambda event: ReadCache.invalidate(Config.USERS_TABLE))
+EventBus.subscribe(PomEventsChanged, lambda event: ReadCache.invalidate(Config.EVENTS_TABLE))
+EventBus.subscribe(TablesCleared, lambda event: UserCache.clear())
+EventBus.subscribe(TablesCleared, lambda event: ReadCache.clear())
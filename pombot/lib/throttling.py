@@ -0,0 +1,142 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from discord.user import User as DiscordUser
+
+from pombot.config import Config
+from pombot.lib.storage import Storage
+
+MAX_IDLE_BUCKETS = 10_000
+
+
+class TokenBucket:
+    """Allow `capacity` uses at once, regaining one use every `period`
+    seconds.
+    """
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.exhausted = False
+
+    def refill(self, now: float):
+        """Add the uses regained since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.period)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Take one use from the bucket if there is one."""
+        self.refill(time.monotonic())
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        self.exhausted = False
+
+        return True
+
+    @property
+    def is_full(self) -> bool:
+        """Return whether the bucket holds its full capacity."""
+        return self.tokens >= self.capacity
+
+
+class RateLimiter:
+    """Per-user, per-command token buckets, configured by
+    COMMAND_RATE_LIMITS and DEFAULT_RATE_LIMIT.
+    """
+    _buckets: Dict[Tuple[int, str], TokenBucket] = {}
+
+    @classmethod
+    def try_acquire(cls, user: DiscordUser, command: str) -> bool:
+        """Return whether `user` may run `command` now."""
+        if (bucket := cls._buckets.get((user.id, command))) is None:
+            if len(cls._buckets) >= MAX_IDLE_BUCKETS:
+                cls._forget_full_buckets()
+
+            capacity, period = Config.COMMAND_RATE_LIMITS.get(
+                command, Config.DEFAULT_RATE_LIMIT)
+            bucket = cls._buckets[(user.id, command)] = TokenBucket(
+                capacity, period.total_seconds())
+
+        return bucket.try_acquire()
+
+    @classmethod
+    def should_notify(cls, user: DiscordUser, command: str) -> bool:
+        """Return True the first time this is called after `user` runs out
+        of uses of `command`, so that they are told once, not once per
+        message.
+        """
+        bucket = cls._buckets[(user.id, command)]
+        should_notify, bucket.exhausted = not bucket.exhausted, True
+
+        return should_notify
+
+    @classmethod
+    def _forget_full_buckets(cls):
+        # A full bucket is the same as a new one.
+        now = time.monotonic()
+
+        for key, bucket in list(cls._buckets.items()):
+            bucket.refill(now)
+
+            if bucket.is_full:
+                del cls._buckets[key]
+
+
+@dataclass
+class _PendingPoms:
+    count: int = 0
+    task: Optional[asyncio.Task] = None
+
+
+class PomCoalescer:
+    """Merge poms added by the same user with the same description within
+    POM_COALESCE_WINDOW into a single database write.
+
+    Every caller waits for the shared write to finish, so callers still see
+    its errors and only react once their poms are stored.
+    """
+    _pending: Dict[Tuple[int, Optional[str]], _PendingPoms] = {}
+
+    @classmethod
+    async def add_poms_to_user_session(
+        cls,
+        user: DiscordUser,
+        descript: Optional[str],
+        count: int,
+    ) -> List[int]:
+        """Add a number of user poms, merged with any others the user adds
+        with the same description within the window, and return the IDs of
+        the rows they were added in.
+        """
+        if not Config.POM_COALESCE_WINDOW:
+            return await Storage.add_poms_to_user_session(user, descript, count)
+
+        key = (user.id, descript or None)
+
+        if (pending := cls._pending.get(key)) is None:
+            pending = cls._pending[key] = _PendingPoms()
+            pending.task = asyncio.create_task(cls._write_later(key, user, descript))
+
+        pending.count += count
+
+        # Shield the write so that a cancelled caller does not cancel it for
+        # everyone else.
+        return await asyncio.shield(pending.task)
+
+    @classmethod
+    async def _write_later(
+        cls,
+        key: tuple,
+        user: DiscordUser,
+        descript: Optional[str],
+    ) -> List[int]:
+        await asyncio.sleep(Config.POM_COALESCE_WINDOW.total_seconds())
+        pending = cls._pending.pop(key)
+
+        return await Storage.add_poms_to_user_session(user, descript, pending.count)
@@ -62,8 +62,9 @@ def has_any_role(ctx: Context, roles_needed=None):
 
 class BotCommand(Command):
     """Wrapper around discord.ext.commands.Command which ensures that the
-    passed function is a coroutine and maps the caller's module __name__ to
-    the `extension` attribute.
+    passed function is a coroutine, maps the caller's module __name__ to
+    the `extension` attribute, rate limits each user and records metrics for
+    every invocation.
     """
     def __init__(self, func, **kwargs):
         # The exception raised by `discord` is not helpful in finding the
@@ -82,6 +83,25 @@ class BotCommand(Command):
         super().__init__(func, **kwargs)
         self.extension = Path(inspect.stack()[1].filename).stem
 
+    async def invoke(self, ctx: Context):
+        """Invoke the command while recording its metrics, unless the user
+        has exceeded its rate limit.
+        """
+        # Imported here to avoid a circular import with pombot.config.
+        # pylint: disable=import-outside-toplevel
+        from pombot.config import Reactions
+        from pombot.lib.metrics import Metrics
+        from pombot.lib.outbound import Outbound
+        from pombot.lib.throttling import RateLimiter
+
+        if not RateLimiter.try_acquire(ctx.author, self.name):
+            if RateLimiter.should_notify(ctx.author, self.name):
+                await Outbound.add_reaction(ctx.message, Reactions.HOURGLASS)
+            return
+
+        async with Metrics.track_command(self.name, ctx):
+            await super().invoke(ctx)
+
 
 def normalize_newlines(text: str) -> str:
     r"""Replace newlines with spaces, unless the newline is followed by
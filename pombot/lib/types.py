@@ -84,7 +84,8 @@ class Pom:
     user_id: int
     descript: str
     time_set: datetime
-    session: int
+    session: int  # 1 when in the user's current (unbanked) session.
+    quantity: int = 1
 
     def __lt__(self, other):
         """Return whether the Pom in `other` came before this one.
@@ -123,6 +124,27 @@ class ActionType(str, Enum):
     BRIBE = 'bribe'
 
 
+@dataclass
+class SharedValue:
+    """A value shared between bot processes, as described, in order, from the
+    database.
+    """
+    name: str
+    value: str
+    version: int
+    origin: str
+
+
+@dataclass
+class UserWrite:
+    """The latest write a bot process made to a user's data, as described,
+    in order, from the database.
+    """
+    write_id: int
+    user_id: int
+    origin: str
+
+
 @dataclass(frozen=True)
 class User:
     """A user, as described, in order, from the database."""
@@ -175,6 +197,20 @@ class Action:
         return self.type == ActionType.NORMAL_ATTACK
 
 
+@dataclass
+class ActionSums:
+    """The totals of one team's actions of one type, as summed by
+    `Storage.sum_actions_since`.
+    """
+    team: str
+    action_type: str
+    settled: bool  # Whether every action summed is old enough to be committed.
+    count: int
+    raw_damage: int
+    min_id: int
+    max_id: int
+
+
 class InstantItem(str, Enum):
     """Type of an instant-use item in the actions table of the database."""
     # Tech debt: This should be moved to pombot.lib.pom_wars.types.
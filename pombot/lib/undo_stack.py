@@ -0,0 +1,71 @@
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Tuple
+
+from discord.user import User as DiscordUser
+
+from pombot.config import Config
+
+
+class UndoStack:
+    """The pom rows each user's recent commands added to, and how many poms
+    each added to them, most recent last.
+
+    Rapid `!pom`s can be merged into a single row, so `!undo` must only
+    remove the poms its command added, not the whole row.
+
+    Stacks live in memory, and in the snapshot when there is one. They hold
+    at most `Config.UNDO_STACK_DEPTH` writes and are kept for the
+    `Config.UNDO_STACK_USERS` most recently active users. Once a user's stack
+    is empty, e.g. after a restart without a snapshot, `!undo` falls back to
+    finding their latest pom in the DB.
+    """
+    _stacks: "OrderedDict[int, Deque[List[Tuple[int, int]]]]" = OrderedDict()
+
+    @classmethod
+    def push(cls, user: DiscordUser, poms: List[Tuple[int, int]]):
+        """Remember the poms added by one of the user's commands.
+
+        @param poms (row ID, number of poms the command added to it) of each
+            row the command added to.
+        """
+        if not poms:
+            return
+
+        if (stack := cls._stacks.get(user.id)) is None:
+            stack = cls._stacks[user.id] = deque(maxlen=Config.UNDO_STACK_DEPTH)
+
+        stack.append(poms)
+        cls._stacks.move_to_end(user.id)
+
+        while len(cls._stacks) > Config.UNDO_STACK_USERS:
+            cls._stacks.popitem(last=False)
+
+    @classmethod
+    def pop(cls, user: DiscordUser) -> Optional[List[Tuple[int, int]]]:
+        """Return the poms added by the user's latest command, as given to
+        `push`, or None when there are none left in memory.
+        """
+        if not (stack := cls._stacks.get(user.id)):
+            return None
+
+        poms = stack.pop()
+
+        if not stack:
+            del cls._stacks[user.id]
+
+        return poms
+
+    @classmethod
+    def to_snapshot(cls) -> List[list]:
+        """Return every stack as JSON-serializable data, least recently
+        active user first.
+        """
+        return [[user_id, list(stack)] for user_id, stack in cls._stacks.items()]
+
+    @classmethod
+    def restore(cls, snapshot: List[list]):
+        """Replace every stack with those of `to_snapshot`."""
+        cls._stacks = OrderedDict(
+            (user_id, deque([[tuple(pom) for pom in poms] for poms in stack],
+                            maxlen=Config.UNDO_STACK_DEPTH))
+            for user_id, stack in snapshot[-Config.UNDO_STACK_USERS:])
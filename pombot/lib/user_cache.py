@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from pombot.config import Config
+
+
+@dataclass
+class _UserEntry:
+    """The values cached for one user and when the user last wrote."""
+    version: int
+    values: Dict[Hashable, Tuple[Any, int]] = field(default_factory=dict)
+    size: int = 0
+
+
+class UserCache:
+    """Per-user read-through cache of values derived from a user's data.
+
+    Every write `Storage` makes to a user's data bumps the user's version,
+    which drops the values cached for them. A value loaded while the user was
+    writing is returned but not cached. Users are evicted least recently used
+    first, once more than `Config.USER_CACHE_USERS` are cached or their
+    values' sizes add up to more than `Config.USER_CACHE_SIZE`.
+
+    Writes in other processes drop the values cached for their user, a
+    moment later, through `SharedState`.
+    """
+    _users: "OrderedDict[int, _UserEntry]" = OrderedDict()
+    _clock = 0
+    _evicted_version = 0
+    _size = 0
+
+    @classmethod
+    async def get(
+        cls,
+        user_id: int,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        size: Callable[[Any], int] = lambda value: 1,
+    ) -> Any:
+        """Return the cached value of `key` for a user, loading it first if
+        needed.
+
+        @param user_id ID of the user whose data the value is derived from.
+        @param key Name of the value among the user's values.
+        @param load Coroutine function which loads the value.
+        @param size Function returning the approximate size of the value,
+            e.g. its number of items.
+        """
+        if (entry := cls._users.get(user_id)) is not None and key in entry.values:
+            cls._users.move_to_end(user_id)
+            value, _ = entry.values[key]
+            return value
+
+        started = cls._clock
+        value = await load()
+
+        if (entry := cls._users.get(user_id)) is None:
+            entry = cls._users[user_id] = _UserEntry(version=cls._evicted_version)
+
+        if entry.version > started:
+            # The user wrote while this value was loaded.
+            return value
+
+        _, old_size = entry.values.get(key, (None, 0))
+        new_size = size(value)
+        entry.values[key] = value, new_size
+        entry.size += new_size - old_size
+        cls._size += new_size - old_size
+        cls._users.move_to_end(user_id)
+        cls._evict()
+
+        return value
+
+    @classmethod
+    def bump(cls, user_id: int):
+        """Drop the values cached for a user after a write to their data."""
+        cls._clock += 1
+
+        if (entry := cls._users.get(user_id)) is None:
+            entry = cls._users[user_id] = _UserEntry(version=cls._clock)
+
+        cls._size -= entry.size
+        entry.version = cls._clock
+        entry.values.clear()
+        entry.size = 0
+        cls._users.move_to_end(user_id)
+        cls._evict()
+
+    @classmethod
+    def clear(cls):
+        """Drop the values cached for every user."""
+        cls._clock += 1
+        cls._evicted_version = cls._clock
+        cls._users.clear()
+        cls._size = 0
+
+    @classmethod
+    def _evict(cls):
+        while (len(cls._users) > Config.USER_CACHE_USERS or
+               cls._size > Config.USER_CACHE_SIZE):
+            _, entry = cls._users.popitem(last=False)
+            cls._evicted_version = max(cls._evicted_version, entry.version)
+            cls._size -= entry.size
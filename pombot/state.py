@@ -8,6 +8,3 @@ class State:
     # during Pomwar events.
     # NOTE: The type is not imported to avoid a circular import.
     scoreboard = None
-
-    # Tech debt: This should be a column in the events table of the DB.
-    goal_reached: bool = False
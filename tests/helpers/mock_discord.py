@@ -97,13 +97,13 @@ class AsyncCheckRaiseResponse(unittest.mock.AsyncMock):
         """
         # Call super() first because it sets call counts and called args. We
         # still want to investigate that stuff even if we raise.
-        await super().__call__(*args, **kwargs)
+        result = await super().__call__(*args, **kwargs)
 
         if args and sum(len(a) for a in args) > Limits.MAX_CHARACTERS_PER_MESSAGE:
             self.raise_bad_request("args")
 
         if not (embed := kwargs.get("embed")):
-            return
+            return result
 
         total_embed_length = 0
 
@@ -146,6 +146,8 @@ class AsyncCheckRaiseResponse(unittest.mock.AsyncMock):
         if total_embed_length > Limits.MAX_CHARACTERS_PER_EMBED:
             self.raise_bad_request("total embed length is OVER 6,000!")
 
+        return result
+
     @staticmethod
     async def raise_bad_request(data_category: str):
         response = unittest.mock.MagicMock()
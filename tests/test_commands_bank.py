@@ -0,0 +1,66 @@
+import unittest
+from unittest.async_case import IsolatedAsyncioTestCase
+
+import pombot
+from pombot.lib.storage import Storage
+from pombot.lib.types import SessionType
+from tests.helpers import mock_discord
+
+
+class TestBankCommand(IsolatedAsyncioTestCase):
+    """Test the !bank command."""
+    ctx = None
+
+    async def asyncSetUp(self) -> None:
+        """Ensure database tables exist and create contexts for the tests."""
+        self.ctx = mock_discord.MockContext()
+        await Storage.create_tables_if_not_exists()
+        await Storage.delete_all_rows_from_all_tables()
+
+    async def asyncTearDown(self) -> None:
+        """Cleanup the database."""
+        await Storage.delete_all_rows_from_all_tables()
+
+    async def test_banking_starts_a_new_session(self):
+        """Test the user typing `!bank` moves their session to their bank and
+        their next pom starts a new session.
+        """
+        await Storage.add_poms_to_user_session(self.ctx.author, "banked", 3)
+
+        self.ctx.invoked_with = "bank"
+        await pombot.commands.do_bank(self.ctx)
+
+        await Storage.add_poms_to_user_session(self.ctx.author, "current", 1)
+        poms = await Storage.get_poms(user=self.ctx.author)
+
+        self.assertEqual({("banked", False), ("current", True)},
+                         {(pom.descript, pom.is_current_session()) for pom in poms})
+        self.assertEqual(3, sum(pom.quantity for pom in poms if not pom.is_current_session()))
+
+        await Storage.delete_poms(user=self.ctx.author, session=SessionType.CURRENT)
+        self.assertEqual(3, sum(pom.quantity for pom in await Storage.get_poms(user=self.ctx.author)))
+
+    async def test_renaming_banked_poms_leaves_current_session(self):
+        """Test the user typing `!bank.rename` renames only their banked poms,
+        merging them with banked poms of the new description.
+        """
+        await Storage.add_poms_to_user_session(self.ctx.author, "readign", 2)
+        await Storage.add_poms_to_user_session(self.ctx.author, "reading", 1)
+        await Storage.bank_user_session_poms(self.ctx.author)
+        await Storage.add_poms_to_user_session(self.ctx.author, "readign", 4)
+
+        self.ctx.invoked_with = "bank.rename"
+        await pombot.commands.do_bank(self.ctx, "readign", "reading")
+
+        poms = await Storage.get_poms(user=self.ctx.author)
+        totals = {}
+
+        for pom in poms:
+            key = (pom.descript, pom.is_current_session())
+            totals[key] = totals.get(key, 0) + pom.quantity
+
+        self.assertEqual({("reading", False): 3, ("readign", True): 4}, totals)
+
+
+if __name__ == "__main__":
+    unittest.main()
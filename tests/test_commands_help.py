@@ -6,10 +6,10 @@ from discord.ext.commands.core import _CaseInsensitiveDict, GroupMixin
 from parameterized import parameterized
 
 import pombot
-from pombot.commands.help import OFFSET
 from pombot.config import Config, Debug
 from pombot.extensions.general import setup as setup_general_commands
 from pombot.extensions.pom_wars import setup as setup_pomwars_commands
+from pombot.lib.help_index import OFFSET
 from tests.helpers import mock_discord
 
 ADMIN_ROLE = "AdminRole"
@@ -87,6 +87,28 @@ class TestHelpCommand(IsolatedAsyncioTestCase):
         else:
             self.assertFalse(any(admin_commands_sent_to_user))
 
+    @parameterized.expand([
+        (True,),   # Calling user is an admin.
+        (False,),  # Calling user is NOT an admin.
+    ])
+    async def test_user_calling_help_for_admin_command_only_sees_it_with_admin_role(
+        self,
+        is_user_an_admin,
+    ):
+        """Test a user typing `!help pom total` only sees the help of the admin
+        command `total` when the user has an admin role.
+        """
+        if is_user_an_admin:
+            self.ctx.author = mock_discord.MockMember(
+                roles=[mock_discord.MockRole(name=ADMIN_ROLE, position=2)])
+
+        self.ctx.invoked_with = "help"
+        await pombot.commands.do_help(self.ctx, "pom", "total")
+
+        fields = self.ctx.author.send.call_args.kwargs["embed"].fields
+        expected_names = ["!pom", "!total"] if is_user_an_admin else ["!pom"]
+        self.assertEqual(expected_names, [field.name for field in fields])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,18 +1,18 @@
 import random
-import re
 import string
 import unittest
 from unittest.async_case import IsolatedAsyncioTestCase
 
+from discord import PartialEmoji, RawReactionActionEvent
 from discord.embeds import Embed
 from parameterized import parameterized
 
 import pombot
-from pombot.config import Config, Debug
-from pombot.data import Limits
+from pombot.config import Config, Debug, Reactions
+from pombot.lib.paginator import Paginator
 from pombot.lib.storage import Storage
 from pombot.lib.types import SessionType
-from tests.helpers.mock_discord import MockContext
+from tests.helpers.mock_discord import AsyncCheckRaiseResponse, MockContext, MockMessage
 from tests.helpers.semantics import assert_not_raises
 
 
@@ -86,7 +86,7 @@ class TestPomsCommand(IsolatedAsyncioTestCase):
             self.assertEqual(expected["value"], actual.value)
             self.assertEqual(expected["inline"], actual.inline)
 
-    async def test_too_many_pom_descripts_causes_detailed_direct_message(self):
+    async def test_too_many_pom_descripts_are_paginated(self):
         """Test the user typing `!poms` when the response of the message
         would exceed Discord limits.
         """
@@ -105,70 +105,64 @@ class TestPomsCommand(IsolatedAsyncioTestCase):
         await Storage.add_poms_to_user_session(self.ctx.author, None, 1)
 
         # The command succeeds.
-        await self._do_poms_and_verify_response("poms", descripts)
+        await self._do_poms_and_verify_response(SessionType.CURRENT, descripts)
 
         # Bank our poms.
         await Storage.bank_user_session_poms(self.ctx.author)
 
         # The command succeeds again.
-        await self._do_poms_and_verify_response("bank", descripts)
+        await self._do_poms_and_verify_response(SessionType.BANKED, descripts)
 
     async def _do_poms_and_verify_response(
         self,
-        expected_response_failed_cmd,
+        expected_paginated_session,
         expected_descripts,
     ):
         self.ctx.send.reset_mock()
         self.ctx.reply.reset_mock()
         self.ctx.author.send.reset_mock()
 
+        paginated_message = MockMessage(id=random.getrandbits(32))
+        paginated_message.edit = AsyncCheckRaiseResponse()
+        self.ctx.author.send.return_value = paginated_message
+
         with assert_not_raises():
             self.ctx.invoked_with = "poms"
             await pombot.commands.do_poms(self.ctx)
 
         # The user was DM'd and only DM'd.
-        self.assertTrue(self.ctx.author.send.called)
         self.assertFalse(any((self.ctx.send.called, self.ctx.reply.called)))
 
-        first, second, third, *remainder = self.ctx.author.send.call_args_list
-
-        # The first call was the one that raised the error.
-        self.assertGreater(len(first.kwargs["embed"]),
-                           Limits.MAX_CHARACTERS_PER_EMBED)
-
-        # The second call was as much of the embed that sent successfully.
-        self.assertIsNotNone(second.kwargs.get("embed"))
-
-        # The third call was a detailed message of the problem.
-        expected_message_response_re = (
-            r"```fix\n"
-            r"\n"
-            r"The combined length of all the pom descriptions in your "
-            r"(current session|banked poms) is longer than the maximum embed "
-            r"message field size for Discord embeds \([0-9]{4,}, Max is "
-            r"([0-9]+)\)\. Please rename a few with \!(poms|bank)\.rename "
-            r"\(see \!help (poms|bank)\)\.```"
-        )
-
-        self.assertIsNotNone(
-            match := re.search(expected_message_response_re, third.args[0]))
-        session_type, limit, *cmds = match.groups()
-
-        self.assertTrue(
-            (SessionType(session_type.title()) == SessionType.CURRENT
-             if expected_response_failed_cmd == "poms" else SessionType(
-                 session_type.title()) == SessionType.BANKED))
-
-        self.assertEqual(str(Limits.MAX_EMBED_FIELD_VALUE), limit)
-        self.assertTrue(all(cmd == expected_response_failed_cmd for cmd in cmds))
+        # The statistics were sent first, listing only some descriptions, and
+        # then the first page of the rest.
+        statistics, first_page = self.ctx.author.send.call_args_list
+
+        self.assertTrue(any("more*" in field.value
+                            for field in statistics.kwargs["embed"].fields))
+        self.assertIn(f"{expected_paginated_session.value} (1/",
+                      first_page.kwargs["embed"].author.name)
+
+        # Flipping through the pages shows every description left out.
+        pages = [first_page.kwargs["embed"].description]
+        num_pages = int(first_page.kwargs["embed"].author.name.split("/")[1].rstrip(")"))
+
+        for _ in range(num_pages - 1):
+            await Paginator.flip(RawReactionActionEvent(
+                data={
+                    "message_id": paginated_message.id,
+                    "channel_id": 0,
+                    "user_id": self.ctx.author.id,
+                },
+                emoji=PartialEmoji(name=Reactions.NEXT_PAGE),
+                event_type="REACTION_ADD",
+            ))
+            pages.append(paginated_message.edit.call_args.kwargs["embed"].description)
 
-        # The remaining calls detail all of the user's descripts in the session.
-        actual_combined_response = "\n".join([
-            "\n".join(args) for args in [call.args for call in remainder]
-        ])
+        actual_combined_response = "\n".join(
+            [*(field.value for field in statistics.kwargs["embed"].fields), *pages])
 
         for expected_descript in expected_descripts:
-            self.assertIn(expected_descript, actual_combined_response)
+            self.assertEqual(1, actual_combined_response.count(expected_descript))
 
 
 if __name__ == "__main__":
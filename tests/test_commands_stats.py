@@ -0,0 +1,36 @@
+import unittest
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+import pombot
+from pombot.data import Limits
+from pombot.lib.metrics import Metrics
+from tests.helpers import mock_discord
+
+
+class TestStatsCommand(IsolatedAsyncioTestCase):
+    """Test the !stats command."""
+    async def test_long_stats_are_sent_in_several_messages(self):
+        """Test stats too long for one embed are split between several
+        messages, each within Discord's limits.
+        """
+        ctx = mock_discord.MockContext()
+        lines = ["{:<40}{:>9}".format(f"command{number}", number) for number in range(300)]
+
+        with mock.patch.object(Metrics, "get_summary_lines", return_value=lines):
+            await pombot.commands.do_stats(ctx)
+
+        embeds = [call.kwargs["embed"] for call in ctx.author.send.call_args_list]
+        self.assertGreater(len(embeds), 1)
+
+        for embed in embeds:
+            self.assertLessEqual(len(embed), Limits.MAX_CHARACTERS_PER_EMBED)
+
+            for field in embed.fields:
+                self.assertLessEqual(len(field.value), Limits.MAX_EMBED_FIELD_VALUE)
+                self.assertTrue(field.value.startswith("```"))
+                self.assertTrue(field.value.endswith("```"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime
+from unittest.async_case import IsolatedAsyncioTestCase
+
+import pombot
+from pombot.lib.storage import Storage
+from pombot.lib.undo_stack import UndoStack
+from tests.helpers import mock_discord
+
+
+class TestUndoCommand(IsolatedAsyncioTestCase):
+    """Test the !undo command."""
+    ctx = None
+
+    async def asyncSetUp(self) -> None:
+        """Ensure database tables exist and create contexts for the tests."""
+        self.ctx = mock_discord.MockContext()
+        await Storage.create_tables_if_not_exists()
+        await Storage.delete_all_rows_from_all_tables()
+
+    async def asyncTearDown(self) -> None:
+        """Cleanup the database."""
+        await Storage.delete_all_rows_from_all_tables()
+
+    async def test_undo_removes_only_the_latest_poms(self):
+        """Test the user typing `!undo` removes the poms of their latest
+        command, but not others added in the same second, and then falls
+        back to their latest pom in the DB.
+        """
+        time_set = datetime.now().replace(microsecond=0)
+
+        for descript in ("first", "second", "third"):
+            pom_ids = await Storage.add_poms_to_user_session(
+                self.ctx.author, descript, 2, time_set=time_set)
+
+            if descript != "first":
+                UndoStack.push(self.ctx.author, [(pom_id, 2) for pom_id in pom_ids])
+
+        for expected in (["first", "second"], ["first"], []):
+            await pombot.commands.do_undo(self.ctx)
+
+            poms = await Storage.get_poms(user=self.ctx.author)
+            self.assertEqual(expected, sorted(pom.descript for pom in poms))
+
+    async def test_undo_leaves_poms_merged_into_the_same_row(self):
+        """Test undoing a command whose poms were merged with an earlier
+        command's removes only its own poms from the row.
+        """
+        pom_ids = await Storage.add_poms_to_user_session(self.ctx.author, "merged", 4)
+        UndoStack.push(self.ctx.author, [(pom_id, 1) for pom_id in pom_ids])
+        UndoStack.push(self.ctx.author, [(pom_id, 3) for pom_id in pom_ids])
+
+        await pombot.commands.do_undo(self.ctx)
+
+        poms = await Storage.get_poms(user=self.ctx.author)
+        self.assertEqual([("merged", 1)], [(pom.descript, pom.quantity) for pom in poms])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from datetime import timedelta
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.config import Config
+from pombot.lib.error_reporter import ErrorReporter
+from tests.helpers import mock_discord
+
+
+class TestErrorReporter(IsolatedAsyncioTestCase):
+    """Test the batching errors channel reporter."""
+    guild = None
+    channel = None
+
+    async def asyncSetUp(self) -> None:
+        """Give every test a guild with an errors channel and a fresh
+        reporter.
+        """
+        self.channel = mock_discord.MockTextChannel(name="errors")
+        self.guild = mock_discord.MockGuild(text_channels=[self.channel])
+        self.guild.get_channel.return_value = self.channel
+
+        ErrorReporter._worker = None  # pylint: disable=protected-access
+        ErrorReporter._channel_ids = {}  # pylint: disable=protected-access
+        ErrorReporter._dropped_since_last_send = 0  # pylint: disable=protected-access
+
+        for patch in [
+            mock.patch.object(Config, "ERRORS_CHANNEL_NAME", "errors"),
+            mock.patch.object(Config, "ERRORS_BATCH_WINDOW", timedelta(milliseconds=50)),
+        ]:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def asyncTearDown(self) -> None:
+        """Stop the reporter's worker, if a test started it."""
+        if worker := ErrorReporter._worker:  # pylint: disable=protected-access
+            worker.cancel()
+
+    async def test_identical_errors_are_batched_into_one_message(self):
+        """Test that a burst of errors is sent once, de-duplicated."""
+        for user in range(5):
+            ErrorReporter.report(self.guild, "DB down", f"User {user} hit: DB down")
+
+        ErrorReporter.report(self.guild, "Oops", "User 9 hit: Oops")
+        await asyncio.sleep(0.2)
+
+        self.channel.send.assert_awaited_once()
+        message, = self.channel.send.await_args.args
+        self.assertIn("User 0 hit: DB down (x5)", message)
+        self.assertIn("User 9 hit: Oops", message)
+        self.assertNotIn("User 1", message)
+
+    async def test_errors_channel_is_cached(self):
+        """Test the channel list is only searched when the cached channel is
+        gone.
+        """
+        self.assertEqual(self.channel, ErrorReporter.get_errors_channel(self.guild))
+
+        self.guild.text_channels = []
+        self.assertEqual(self.channel, ErrorReporter.get_errors_channel(self.guild))
+
+        self.guild.get_channel.return_value = None
+        self.assertIsNone(ErrorReporter.get_errors_channel(self.guild))
+
+    async def test_missing_errors_channel_is_cached(self):
+        """Test a guild without an errors channel is only searched again
+        once channels have changed.
+        """
+        self.guild.text_channels = []
+        self.assertIsNone(ErrorReporter.get_errors_channel(self.guild))
+
+        self.guild.text_channels = [self.channel]
+        self.assertIsNone(ErrorReporter.get_errors_channel(self.guild))
+
+        ErrorReporter.forget_channels()
+        self.assertEqual(self.channel, ErrorReporter.get_errors_channel(self.guild))
+
+    async def test_errors_are_dropped_when_the_queue_is_full(self):
+        """Test the overflow is counted and mentioned in the next message."""
+        with mock.patch.object(Config, "ERRORS_QUEUE_SIZE", 2):
+            for error in range(5):
+                ErrorReporter.report(self.guild, str(error), str(error))
+
+        await asyncio.sleep(0.2)
+
+        message, = self.channel.send.await_args.args
+        self.assertIn("3 more errors were dropped", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
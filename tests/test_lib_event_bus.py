@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+from dataclasses import dataclass
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.lib.event_bus import EventBus
+
+
+@dataclass(frozen=True)
+class _Changed:
+    number: int
+
+
+@dataclass(frozen=True)
+class _Other:
+    number: int
+
+
+class TestEventBus(IsolatedAsyncioTestCase):
+    """Test delivering events to immediate and queued subscribers."""
+    def tearDown(self):
+        EventBus.unsubscribe_queues()
+
+    async def test_immediate_subscribers_handle_events_before_publish_returns(self):
+        """Test a subscriber sees only the events of its types, by the time
+        they are published.
+        """
+        seen = []
+        EventBus.subscribe((_Changed, ), seen.append)
+
+        await EventBus.publish(_Changed(1))
+        await EventBus.publish(_Other(2))
+
+        self.assertEqual([_Changed(1)], seen)
+
+    async def test_full_queues_slow_down_publishers(self):
+        """Test publishing waits for room in a full queue, and a coalescing
+        subscriber skips to the latest event queued.
+        """
+        seen = []
+        release = asyncio.Event()
+
+        async def handle(event):
+            await release.wait()
+            seen.append(event)
+
+        EventBus.subscribe_queue("test", _Changed, handle, coalesce=True, maxsize=2)
+
+        # The first event is taken by the worker, the next two fill the queue.
+        for number in range(3):
+            await EventBus.publish(_Changed(number))
+            await asyncio.sleep(0)
+
+        blocked = asyncio.create_task(EventBus.publish(_Changed(3)))
+        await asyncio.sleep(0)
+        self.assertFalse(blocked.done())
+
+        release.set()
+        await blocked
+
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        stats = EventBus._subscribers["test"].stats  # pylint: disable=protected-access
+        self.assertEqual([_Changed(0), _Changed(2), _Changed(3)], seen)
+        self.assertEqual(1, stats.waits)
+        self.assertEqual(1, stats.coalesced)
+
+    async def test_subscribing_again_keeps_the_queued_events(self):
+        """Test subscribing a queued subscriber again, as on a reconnect,
+        hands the events already queued to the new handler.
+        """
+        seen = []
+        release = asyncio.Event()
+
+        async def handle(event):
+            await release.wait()
+            seen.append(("old", event))
+
+        EventBus.subscribe_queue("test", _Changed, handle)
+
+        for number in range(2):
+            await EventBus.publish(_Changed(number))
+
+        await asyncio.sleep(0)
+
+        async def handle_again(event):
+            seen.append(("new", event))
+
+        EventBus.subscribe_queue("test", _Changed, handle_again)
+        release.set()
+
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        self.assertEqual([("old", _Changed(0)), ("new", _Changed(1))], seen)
+
+
+if __name__ == "__main__":
+    unittest.main()
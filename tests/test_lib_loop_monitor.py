@@ -0,0 +1,52 @@
+import asyncio
+import time
+import unittest
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.lib.loop_monitor import SamplingProfiler
+
+
+def _busy_wait(seconds: float):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Test the profiler used by !profile."""
+    def test_busy_function_dominates_the_profile(self):
+        """Test that a function burning the CPU is sampled both as on the
+        stack and at the top of it.
+        """
+        with SamplingProfiler() as profiler:
+            _busy_wait(0.2)
+
+        busy_location, = [location for location in profiler.inclusive
+                          if location.endswith("(_busy_wait)")]
+
+        self.assertGreater(profiler.samples, 10)
+        self.assertGreater(profiler.inclusive[busy_location], profiler.samples * 0.9)
+        self.assertGreater(profiler.exclusive[busy_location], profiler.samples * 0.9)
+        self.assertIn("(_busy_wait)", "\n".join(profiler.get_report_lines(5)))
+
+
+class TestSamplingProfilerInEventLoop(IsolatedAsyncioTestCase):
+    """Test profiling a coroutine."""
+    async def test_idle_event_loop_is_left_out(self):
+        """Test the event loop's own frames, which are new on each iteration,
+        are left out while the profiled coroutine awaits.
+        """
+        with SamplingProfiler() as profiler:
+            await asyncio.sleep(0.2)
+
+        idle_location, = [location for location in profiler.inclusive
+                          if location.endswith("(select)")]
+
+        self.assertGreater(profiler.samples, 10)
+        self.assertGreater(profiler.exclusive[idle_location], profiler.samples * 0.9)
+        self.assertFalse([location for location in profiler.inclusive
+                          if location.endswith("(_run_once)")])
+
+
+if __name__ == "__main__":
+    unittest.main()
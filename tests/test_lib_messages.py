@@ -0,0 +1,97 @@
+import unittest
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.data import Limits
+from pombot.lib.errors import EmbedTooLargeError
+from pombot.lib.messages import EmbedField, Overflow, send_embed_message
+
+# Ten fields of 1,000 short lines each, 100,000 characters in total.
+LONG_FIELDS = [
+    EmbedField(name=f"Field {i}", value="\n".join(f"{i}-{j:05}" for j in range(1000)))
+    for i in range(10)
+]
+
+
+class TestSendEmbedMessage(IsolatedAsyncioTestCase):
+    """Test sending embeds which exceed Discord's limits."""
+    async def test_oversize_embeds_are_not_sent(self):
+        """Test an oversize embed raises before anything is sent."""
+        send = mock.AsyncMock()
+
+        with self.assertRaises(EmbedTooLargeError):
+            await send_embed_message(None, title="Title", description=None,
+                                     fields=LONG_FIELDS, _func=send)
+
+        send.assert_not_awaited()
+
+    async def test_truncated_embeds_fit(self):
+        """Test truncating sends a single embed within every limit."""
+        send = mock.AsyncMock()
+
+        await send_embed_message(None,
+                                 title="Title",
+                                 description="x" * (Limits.MAX_EMBED_DESCRIPTION + 1),
+                                 fields=LONG_FIELDS,
+                                 footer="Footer",
+                                 overflow=Overflow.TRUNCATE,
+                                 _func=send)
+
+        embed = send.call_args.kwargs["embed"]
+        self.assertEqual(1, send.await_count)
+        self.assertLessEqual(len(embed), Limits.MAX_CHARACTERS_PER_EMBED)
+        self.assertLessEqual(len(embed.description), Limits.MAX_EMBED_DESCRIPTION)
+        self.assertTrue(all(len(field.value) <= Limits.MAX_EMBED_FIELD_VALUE
+                            for field in embed.fields))
+        self.assertEqual("Footer", embed.footer.text)
+
+    async def test_split_embeds_fit_and_keep_every_line(self):
+        """Test splitting sends as many embeds as needed, each within every
+        limit, without losing any lines of the fields.
+        """
+        send = mock.AsyncMock()
+
+        await send_embed_message(None,
+                                 title="Title",
+                                 description="Description",
+                                 fields=LONG_FIELDS,
+                                 footer="Footer",
+                                 overflow=Overflow.SPLIT,
+                                 _func=send)
+
+        embeds = [call.kwargs["embed"] for call in send.call_args_list]
+        lines = [line for embed in embeds for field in embed.fields
+                 for line in field.value.split("\n")]
+
+        self.assertGreater(len(embeds), 1)
+        self.assertTrue(all(len(embed) <= Limits.MAX_CHARACTERS_PER_EMBED and
+                            len(embed.fields) <= Limits.MAX_NUM_EMBED_FIELDS and
+                            all(len(field.value) <= Limits.MAX_EMBED_FIELD_VALUE
+                                for field in embed.fields)
+                            for embed in embeds))
+        self.assertEqual([line for field in LONG_FIELDS for line in field.value.split("\n")],
+                         lines)
+        self.assertEqual("Description", embeds[0].description)
+        self.assertEqual("Footer", embeds[-1].footer.text)
+
+    async def test_embeds_with_the_same_content_are_built_once(self):
+        """Test sending the same content again reuses the embed, but any
+        change to the content builds a new one.
+        """
+        send = mock.AsyncMock()
+        content = dict(title="Title", description="Description",
+                       fields=[EmbedField(name="Name", value="Value")])
+
+        for _ in range(2):
+            await send_embed_message(None, **content, _func=send)
+
+        await send_embed_message(None, **content, footer="Footer", _func=send)
+
+        first, again, changed = [call.kwargs["embed"] for call in send.call_args_list]
+        self.assertIs(first, again)
+        self.assertIsNot(first, changed)
+        self.assertEqual("Footer", changed.footer.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
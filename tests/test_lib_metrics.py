@@ -0,0 +1,139 @@
+import unittest
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from parameterized import parameterized
+
+from pombot.config import Config
+from pombot.lib.metrics import (Metrics, QueryStats, RollingSummary,
+                                current_command, normalize_query)
+from tests.helpers import mock_discord
+
+
+class TestMetrics(IsolatedAsyncioTestCase):
+    """Test the per-command metrics."""
+    ctx = None
+
+    async def asyncSetUp(self) -> None:
+        """Start every test with no recorded metrics."""
+        self.ctx = mock_discord.MockContext()
+        Metrics._summaries = {}  # pylint: disable=protected-access
+
+    async def test_queries_and_api_calls_are_counted_against_the_command(self):
+        """Test that round-trips, rows and API calls inside a tracked command
+        are attributed to it, and that nothing is counted outside of one.
+        """
+        Metrics.record_query(rows_fetched=100)
+
+        async with Metrics.track_command("poms", self.ctx) as stats:
+            Metrics.record_query(rows_fetched=3)
+            Metrics.record_query(rows_fetched=0)
+            Metrics.record_discord_call()
+
+        Metrics.record_discord_call()
+
+        self.assertIsNone(current_command.get())
+        self.assertEqual(2, stats.db_round_trips)
+        self.assertEqual(3, stats.rows_fetched)
+        self.assertEqual(1, stats.discord_calls)
+
+    async def test_failing_commands_are_still_recorded(self):
+        """Test that a command raising an exception is still measured."""
+        with self.assertRaises(RuntimeError):
+            async with Metrics.track_command("attack", self.ctx):
+                raise RuntimeError()
+
+        self.assertIn("attack", "\n".join(Metrics.get_summary_lines()))
+
+    async def test_prometheus_output(self):
+        """Test the Prometheus text format contains a summary per command."""
+        for _ in range(3):
+            async with Metrics.track_command("pom", self.ctx):
+                Metrics.record_query(rows_fetched=1)
+
+        output = Metrics.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE pombot_command_db_round_trips summary", output)
+        self.assertIn('pombot_command_db_round_trips{command="pom",quantile="0.99"} 1.0',
+                      output)
+        self.assertIn('pombot_command_db_round_trips_count{command="pom"} 3', output)
+        self.assertIn('pombot_command_db_rows_fetched_sum{command="pom"} 3.0', output)
+
+
+class TestRollingSummary(unittest.TestCase):
+    """Test the rolling window used by the metrics."""
+    def test_quantiles_only_consider_the_window(self):
+        """Test old samples fall out of the quantiles but not the totals."""
+        summary = RollingSummary(window=100)
+
+        for value in [1000] * 100 + list(range(1, 101)):
+            summary.add(value)
+
+        self.assertEqual(200, summary.count)
+        self.assertEqual(100 * 1000 + 5050, summary.total)
+        self.assertAlmostEqual(50.5, summary.quantile(0.5))
+        self.assertAlmostEqual(99.01, summary.quantile(0.99))
+
+
+class TestQueryStats(IsolatedAsyncioTestCase):
+    """Test the per-shape query stats and slow-query log."""
+    ctx = None
+
+    async def asyncSetUp(self) -> None:
+        """Start every test with no recorded queries."""
+        self.ctx = mock_discord.MockContext()
+        QueryStats._shapes = {}  # pylint: disable=protected-access
+
+    @parameterized.expand([
+        (
+            """
+                SELECT * FROM users
+                WHERE userID=%s OR userID=%s OR userID=%s;
+            """,
+            "SELECT * FROM users WHERE userID=? OR userID=? ...",
+        ),
+        (
+            b"INSERT INTO poms (userID, descript) VALUES (1,'a'),(2,'it''s'),(3,NULL)",
+            "INSERT INTO poms (userID, descript) VALUES (?+), ...",
+        ),
+        (
+            "SELECT * FROM poms WHERE userID=%s AND descript=%s ORDER BY id DESC LIMIT %s",
+            "SELECT * FROM poms WHERE userID=? AND descript=? ORDER BY id DESC LIMIT ?",
+        ),
+    ])
+    def test_normalize_query(self, query, expected_shape):
+        """Test statements are reduced to their shape."""
+        self.assertEqual(expected_shape, normalize_query(query))
+
+    async def test_statements_are_aggregated_by_shape(self):
+        """Test that statements differing only in arguments share counters
+        and that the top shapes are ordered by total time.
+        """
+        QueryStats.record("SELECT * FROM poms WHERE userID=1", 0.002, rows=5)
+        QueryStats.record("SELECT * FROM poms WHERE userID=2", 0.004, rows=7)
+        QueryStats.record("SELECT * FROM events", 0.001, rows=1)
+
+        slowest, fastest = QueryStats.get_top_shapes(2)
+
+        self.assertEqual("SELECT * FROM poms WHERE userID=?", slowest.shape)
+        self.assertEqual(2, slowest.calls)
+        self.assertEqual(12, slowest.rows)
+        self.assertAlmostEqual(0.006, slowest.total_time)
+        self.assertAlmostEqual(0.004, slowest.max_time)
+        self.assertEqual("SELECT * FROM events", fastest.shape)
+
+    async def test_slow_queries_are_logged_with_command_and_user(self):
+        """Test that queries over the threshold name their origin."""
+        threshold = Config.SLOW_QUERY_THRESHOLD.total_seconds()
+
+        with self.assertLogs("pombot.lib.metrics", level="WARNING") as logs:
+            async with Metrics.track_command("poms", self.ctx):
+                QueryStats.record("SELECT 1", threshold / 2, rows=1)
+                QueryStats.record("SELECT 2", threshold + 0.1, rows=1)
+
+        log_line, = logs.output
+        self.assertIn("!poms", log_line)
+        self.assertIn(str(self.ctx.author), log_line)
+
+
+if __name__ == "__main__":
+    unittest.main()
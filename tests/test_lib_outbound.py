@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.config import Reactions
+from pombot.lib.outbound import Outbound
+from tests.helpers import mock_discord
+
+
+class TestOutbound(IsolatedAsyncioTestCase):
+    """Test the background reply and reaction queue."""
+    ctx = None
+    sent = None
+
+    async def asyncSetUp(self) -> None:
+        """Record the order in which requests reach Discord."""
+        self.ctx = mock_discord.MockContext()
+        self.ctx.message.channel = self.ctx.channel
+        self.sent = []
+
+        def _slow_request(name):
+            async def _request(*_, **__):
+                await asyncio.sleep(0.01)
+                self.sent.append(name)
+
+            return _request
+
+        self.ctx.send.side_effect = _slow_request("send")
+        self.ctx.reply.side_effect = _slow_request("reply")
+        self.ctx.message.add_reaction.side_effect = _slow_request("reaction")
+
+    async def _wait_until_sent(self, count: int):
+        """Wait until `count` requests reached Discord, failing after a
+        second.
+        """
+        async def _wait():
+            while len(self.sent) < count:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(_wait(), 1)
+
+    async def test_requests_are_sent_inline_until_started(self):
+        """Test that nothing is deferred before the bot is ready."""
+        await Outbound.add_reaction(self.ctx.message, Reactions.TOMATO)
+        await Outbound.send(self.ctx, "hello")
+
+        self.assertEqual(["reaction", "send"], self.sent)
+
+    async def test_replies_are_sent_before_reactions_in_the_background(self):
+        """Test that queueing returns immediately and that replies overtake
+        the reactions queued before them.
+        """
+        with mock.patch.object(Outbound, "_enabled", True), \
+                mock.patch.object(Outbound, "_queues", {}), \
+                mock.patch.object(Outbound, "_workers", {}):
+            await Outbound.add_reaction(self.ctx.message, Reactions.TOMATO)
+            await Outbound.add_reaction(self.ctx.message, Reactions.CHECKMARK)
+            await Outbound.reply(self.ctx, "first")
+            await Outbound.send(self.ctx, "second")
+
+            self.assertEqual([], self.sent)
+            await self._wait_until_sent(4)
+
+        self.assertEqual(["reply", "send", "reaction", "reaction"], self.sent)
+
+    async def test_failed_requests_do_not_stop_the_queue(self):
+        """Test that a request failing with any error is logged and the
+        requests queued after it are still sent.
+        """
+        self.ctx.reply.side_effect = OSError("Connection reset")
+
+        with mock.patch.object(Outbound, "_enabled", True), \
+                mock.patch.object(Outbound, "_queues", {}), \
+                mock.patch.object(Outbound, "_workers", {}), \
+                self.assertLogs("pombot.lib.outbound", level="ERROR"):
+            await Outbound.reply(self.ctx, "first")
+            await Outbound.send(self.ctx, "second")
+            await self._wait_until_sent(1)
+
+        self.assertEqual(["send"], self.sent)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from discord import PartialEmoji, RawReactionActionEvent
+from discord.embeds import Embed
+
+from pombot.config import Reactions
+from pombot.lib.paginator import PAGE_FLIP_TOPIC, Paginator
+from pombot.lib.shards import ShardCoordinator
+from tests.helpers.mock_discord import MockMessage
+
+USER_ID = 1234
+
+
+def _reaction(message_id: int, user_id: int, emoji: str) -> RawReactionActionEvent:
+    return RawReactionActionEvent(
+        data={"message_id": message_id, "channel_id": 0, "user_id": user_id},
+        emoji=PartialEmoji(name=emoji),
+        event_type="REACTION_ADD",
+    )
+
+
+class TestPaginator(IsolatedAsyncioTestCase):
+    """Test flipping through the pages of a paginated message."""
+    async def asyncSetUp(self):
+        self.message = MockMessage(id=5678)
+        self.message.edit = mock.AsyncMock()
+        self.message.add_reaction = mock.AsyncMock()
+        self.render = mock.AsyncMock(side_effect=lambda page: Embed(description=str(page)))
+
+        await Paginator.send(mock.AsyncMock(return_value=self.message),
+                             user_id=USER_ID,
+                             key="test",
+                             num_pages=3,
+                             render=self.render)
+
+    async def test_pages_wrap_around_and_are_rendered_once(self):
+        """Test the user flipping backwards from the first page reaches the
+        last, and revisited pages aren't rendered again.
+        """
+        for emoji in (Reactions.PREVIOUS_PAGE, Reactions.NEXT_PAGE, Reactions.PREVIOUS_PAGE):
+            await Paginator.flip(_reaction(self.message.id, USER_ID, emoji))
+
+        shown = [call.kwargs["embed"].description for call in self.message.edit.call_args_list]
+        self.assertEqual(["2", "0", "2"], shown)
+        self.assertEqual(2, self.render.await_count)
+
+    async def test_only_the_user_can_flip_pages(self):
+        """Test other users' reactions are ignored."""
+        await Paginator.flip(_reaction(self.message.id, USER_ID + 1, Reactions.NEXT_PAGE))
+        await Paginator.flip(_reaction(self.message.id, USER_ID, Reactions.TOMATO))
+
+        self.message.edit.assert_not_awaited()
+
+    async def test_flips_of_other_processes_books_are_relayed(self):
+        """Test a reaction in a private message to a book this process doesn't
+        have is relayed to the other processes, which flip their book.
+        """
+        with mock.patch.object(ShardCoordinator, "send") as send:
+            await Paginator.flip(_reaction(self.message.id + 1, USER_ID, Reactions.NEXT_PAGE))
+
+        send.assert_called_once_with(
+            PAGE_FLIP_TOPIC, (self.message.id + 1, USER_ID, Reactions.NEXT_PAGE))
+
+        await Paginator._on_flip_relayed(  # pylint: disable=protected-access
+            (self.message.id, USER_ID, Reactions.NEXT_PAGE))
+
+        self.assertEqual("1", self.message.edit.call_args.kwargs["embed"].description)
+
+    async def test_single_page_message_replaces_the_old_book(self):
+        """Test sending a single page with the same key stops the previous
+        message from flipping.
+        """
+        await Paginator.send(mock.AsyncMock(return_value=MockMessage(id=self.message.id + 1)),
+                             user_id=USER_ID,
+                             key="test",
+                             num_pages=1,
+                             render=self.render)
+
+        await Paginator.flip(_reaction(self.message.id, USER_ID, Reactions.NEXT_PAGE))
+
+        self.message.edit.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
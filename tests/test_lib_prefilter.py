@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from pombot.config import Config
+from pombot.lib.prefilter import CommandPrefilter
+from tests.helpers import mock_discord
+
+
+class TestCommandPrefilter(unittest.TestCase):
+    """Test the on_message prefilter."""
+    pom_channel = None
+
+    def setUp(self) -> None:
+        """Build the prefilter from a bot with a few commands in one guild
+        with a pom channel.
+        """
+        self.pom_channel = mock_discord.MockTextChannel(name="pom-bank")
+        guild = mock_discord.MockGuild(text_channels=[
+            self.pom_channel, mock_discord.MockTextChannel(name="general")])
+        bot = mock_discord.MockBot(
+            all_commands={"pom": None, "poms": None, "poms.show": None},
+            case_insensitive=True,
+            guilds=[guild],
+        )
+
+        patch = mock.patch.object(Config, "POM_CHANNEL_NAMES", ["pom-bank"])
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        CommandPrefilter.update_commands(bot)
+        CommandPrefilter.update_channels(bot)
+
+    @parameterized.expand([
+        ("!pom", True),
+        ("!POMS.show 10", True),
+        ("! poms", True),
+        ("!pomodoro", False),
+        ("!undo", False),
+        ("lol !pom", False),
+        ("just chatting", False),
+        ("", False),
+    ])
+    def test_only_commands_are_let_through(self, content, expected):
+        """Test messages are matched against the bot's command names."""
+        message = mock_discord.MockMessage(content=content, channel=self.pom_channel)
+
+        self.assertEqual(expected, CommandPrefilter.is_candidate(message))
+
+    def test_commands_outside_pom_channels_are_rejected(self):
+        """Test the channel is checked by ID."""
+        message = mock_discord.MockMessage(
+            content="!pom", channel=mock_discord.MockTextChannel(name="pom-bank"))
+
+        self.assertFalse(CommandPrefilter.is_candidate(message))
+
+
+if __name__ == "__main__":
+    unittest.main()
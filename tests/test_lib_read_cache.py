@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+from datetime import timedelta
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.lib.read_cache import ReadCache
+
+TABLE = "things"
+
+
+class _Reads:
+    """A memoized read which counts its round-trips."""
+    def __init__(self):
+        self.count = 0
+        self.release = asyncio.Event()
+
+    async def read(self, *args) -> list:
+        self.count += 1
+        count = self.count
+        await self.release.wait()
+        return [count, *args]
+
+
+class TestReadCache(IsolatedAsyncioTestCase):
+    """Test the single-flight memoization of reads."""
+    def setUp(self):
+        ReadCache.clear()
+        self.reads = _Reads()
+        self.read = ReadCache.memoize(ttl=timedelta(minutes=1), tables=[TABLE])(self.reads.read)
+
+    async def test_identical_reads_share_one_round_trip(self):
+        """Test concurrent and later identical reads are served by one read,
+        but different arguments aren't.
+        """
+        tasks = [asyncio.create_task(self.read("a")) for _ in range(3)]
+        other = asyncio.create_task(self.read("b"))
+        await asyncio.sleep(0)
+        self.reads.release.set()
+
+        results = await asyncio.gather(*tasks)
+        await other
+
+        self.assertEqual([[1, "a"]] * 3, results)
+        self.assertEqual([1, "a"], await self.read("a"))
+        self.assertEqual(2, self.reads.count)
+
+    async def test_writes_invalidate_cached_and_in_flight_reads(self):
+        """Test a read in flight during a write is neither joined nor cached,
+        and a cached read is forgotten.
+        """
+        in_flight = asyncio.create_task(self.read())
+        await asyncio.sleep(0)
+        ReadCache.invalidate(TABLE)
+        after_write = asyncio.create_task(self.read())
+        await asyncio.sleep(0)
+        self.reads.release.set()
+
+        self.assertEqual([1], await in_flight)
+        self.assertEqual([2], await after_write)
+        self.assertEqual([2], await self.read())
+
+        ReadCache.invalidate(TABLE)
+        self.assertEqual([3], await self.read())
+
+    async def test_callers_get_their_own_copy(self):
+        """Test modifying a result doesn't change what others get."""
+        self.reads.release.set()
+
+        (await self.read()).append("modified")
+        self.assertEqual([1], await self.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
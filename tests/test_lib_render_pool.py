@@ -0,0 +1,34 @@
+import threading
+import unittest
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.config import Config
+from pombot.lib.render_pool import RenderPool
+
+
+class TestRenderPool(IsolatedAsyncioTestCase):
+    """Test the offloading of large renders."""
+    async def test_only_large_renders_leave_the_event_loop(self):
+        """Test renders below the threshold run inline and the others run in
+        a worker thread.
+        """
+        get_thread = threading.get_ident
+
+        with mock.patch.object(Config, "RENDER_OFFLOAD_THRESHOLD", 10):
+            small = await RenderPool.run(get_thread, size=9)
+            large = await RenderPool.run(get_thread, size=10)
+
+        self.assertEqual(threading.get_ident(), small)
+        self.assertNotEqual(threading.get_ident(), large)
+
+    async def test_arguments_are_passed_through(self):
+        """Test positional and keyword arguments reach the render."""
+        with mock.patch.object(Config, "RENDER_OFFLOAD_THRESHOLD", 0):
+            result = await RenderPool.run(sorted, [3, 1, 2], size=3, reverse=True)
+
+        self.assertEqual([3, 2, 1], result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from parameterized import parameterized
+
+from pombot.config import Config
+from pombot.lib.shards import ShardCoordinator, distribute_shards
+
+
+class TestDistributeShards(unittest.TestCase):
+    """Test the assignment of shards to processes."""
+    @parameterized.expand([
+        (4, 2, [[0, 2], [1, 3]]),
+        (5, 2, [[0, 2, 4], [1, 3]]),
+        (2, 8, [[0], [1]]),
+        (3, 0, [[0, 1, 2]]),
+    ])
+    def test_every_shard_runs_exactly_once(self, shard_count, num_processes, expected):
+        """Test shards are spread round-robin over at most one process per
+        shard.
+        """
+        self.assertEqual(expected, distribute_shards(shard_count, num_processes))
+
+
+class TestShardCoordinator(IsolatedAsyncioTestCase):
+    """Test the handling of notifications from other shard processes."""
+    async def test_bursts_of_notifications_are_coalesced(self):
+        """Test that the subscriber runs once per burst."""
+        callback = mock.AsyncMock()
+        ShardCoordinator.subscribe("scoreboard", callback)
+
+        with mock.patch.object(Config, "SHARD_NOTIFY_DELAY", timedelta(milliseconds=10)):
+            for _ in range(5):
+                ShardCoordinator._dispatch("scoreboard")  # pylint: disable=protected-access
+
+            ShardCoordinator._dispatch("unknown")  # pylint: disable=protected-access
+            await asyncio.sleep(0.05)
+
+            ShardCoordinator._dispatch("scoreboard")  # pylint: disable=protected-access
+            await asyncio.sleep(0.05)
+
+        self.assertEqual(2, callback.await_count)
+
+    async def test_every_message_is_delivered(self):
+        """Test each message reaches the receiver of its topic with its
+        payload.
+        """
+        callback = mock.AsyncMock()
+        ShardCoordinator.receive("page_flip", callback)
+
+        for number in range(3):
+            ShardCoordinator._deliver("page_flip", number)  # pylint: disable=protected-access
+
+        ShardCoordinator._deliver("unknown", 3)  # pylint: disable=protected-access
+        await asyncio.sleep(0)
+
+        self.assertEqual([mock.call(0), mock.call(1), mock.call(2)], callback.await_args_list)
+
+    def test_each_process_gets_its_own_file(self):
+        """Test a configured path gets the process index when sharded."""
+        self.assertEqual(Path("/var/pombot/metrics.prom"),
+                         ShardCoordinator.get_process_path(Path("/var/pombot/metrics.prom")))
+
+        with mock.patch.object(ShardCoordinator, "_index", 1):
+            self.assertEqual(Path("/var/pombot/metrics.1.prom"),
+                             ShardCoordinator.get_process_path(Path("/var/pombot/metrics.prom")))
+            self.assertEqual(Path("snapshot.1"),
+                             ShardCoordinator.get_process_path(Path("snapshot")))
+
+
+if __name__ == "__main__":
+    unittest.main()
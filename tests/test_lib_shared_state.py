@@ -0,0 +1,117 @@
+import json
+import unittest
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.config import Config
+from pombot.lib.shared_state import SharedState
+from pombot.lib.storage import Storage
+from pombot.lib.types import SharedValue, UserWrite
+from pombot.lib.user_cache import UserCache
+
+
+class TestSharedState(IsolatedAsyncioTestCase):
+    """Test the sharing of values between bot processes."""
+    def setUp(self):
+        SharedState._values.clear()  # pylint: disable=protected-access
+        SharedState._versions.clear()  # pylint: disable=protected-access
+        SharedState._subscribers.clear()  # pylint: disable=protected-access
+        SharedState._user_write_id = None  # pylint: disable=protected-access
+        SharedState._user_write_ids.clear()  # pylint: disable=protected-access
+        UserCache.clear()
+
+    async def test_values_are_kept_locally_when_not_sharing(self):
+        """Test setting a value without SHARE_STATE doesn't use the DB."""
+        with mock.patch.object(Config, "SHARE_STATE", False), \
+             mock.patch.object(Storage, "set_shared_state") as set_shared_state:
+            await SharedState.set("goal_reached", True)
+
+        self.assertTrue(SharedState.get("goal_reached"))
+        set_shared_state.assert_not_called()
+
+    async def test_subscribers_only_see_changes_from_other_processes(self):
+        """Test polling applies each new version once and skips our own
+        writes.
+        """
+        callback = mock.AsyncMock()
+        SharedState.subscribe("scoreboard", callback)
+
+        rows = [
+            SharedValue("scoreboard", json.dumps({"Knight": 1}), 1, "other"),
+            SharedValue("goal_reached", json.dumps(True), 1, SharedState.ORIGIN),
+        ]
+
+        with mock.patch.object(Storage, "get_shared_state", return_value=rows):
+            await SharedState.poll()
+            await SharedState.poll()
+
+            rows[0] = SharedValue("scoreboard", json.dumps({"Knight": 2}), 2, "other")
+            await SharedState.poll()
+
+        self.assertEqual([mock.call({"Knight": 1}), mock.call({"Knight": 2})],
+                         callback.await_args_list)
+        self.assertEqual({"Knight": 2}, SharedState.get("scoreboard"))
+        self.assertIsNone(SharedState.get("goal_reached"))
+
+    async def test_user_writes_drop_only_that_users_values(self):
+        """Test polling drops the values cached for the users other processes
+        wrote to, and no others.
+        """
+        load = mock.AsyncMock(return_value="value")
+
+        with mock.patch.object(Storage, "get_user_writes", return_value=[]):
+            await SharedState.poll_user_writes()
+
+        for user_id in (1, 2, 3):
+            await UserCache.get(user_id, "key", load)
+
+        writes = [UserWrite(7, 1, "other"), UserWrite(8, 2, SharedState.ORIGIN)]
+
+        with mock.patch.object(Config, "USER_WRITES_OVERLAP", 5), \
+             mock.patch.object(Storage, "get_user_writes", return_value=writes) as get:
+            await SharedState.poll_user_writes()
+            get.assert_awaited_once_with(0)
+
+            await SharedState.poll_user_writes()
+            get.assert_awaited_with(3)
+
+        for user_id in (1, 2, 3):
+            await UserCache.get(user_id, "key", load)
+
+        self.assertEqual(4, load.await_count)
+
+    async def test_user_writes_committed_late_are_not_skipped(self):
+        """Test a write which shows up below the latest ID already seen still
+        drops that user's values, and only once.
+        """
+        load = mock.AsyncMock(return_value="value")
+
+        with mock.patch.object(Storage, "get_user_writes", return_value=[]):
+            await SharedState.poll_user_writes()
+
+        for user_id in (1, 2):
+            await UserCache.get(user_id, "key", load)
+
+        writes = [UserWrite(8, 2, "other")]
+
+        with mock.patch.object(Config, "USER_WRITES_OVERLAP", 5), \
+             mock.patch.object(Storage, "get_user_writes", return_value=writes) as get:
+            await SharedState.poll_user_writes()
+
+            writes.insert(0, UserWrite(7, 1, "other"))
+            await SharedState.poll_user_writes()
+            get.assert_awaited_with(3)
+
+            for user_id in (1, 2):
+                await UserCache.get(user_id, "key", load)
+
+            await SharedState.poll_user_writes()
+
+        for user_id in (1, 2):
+            await UserCache.get(user_id, "key", load)
+
+        self.assertEqual(4, load.await_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
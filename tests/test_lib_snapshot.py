@@ -0,0 +1,91 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.lib.pom_wars.action_totals import ActionTotals
+from pombot.lib.snapshot import Snapshot
+from pombot.lib.storage import Storage
+from pombot.lib.undo_stack import UndoStack
+from tests.helpers import mock_discord
+
+# pylint: disable=protected-access
+
+
+class TestSnapshot(IsolatedAsyncioTestCase):
+    """Test saving and restoring the in-memory state."""
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = Path(self.temp_dir.name) / "snapshot"
+        self.user = mock_discord.MockUser()
+        ActionTotals.restore({"watermark": 42, "totals": [["Knights", "defend", 3, 700]]})
+        UndoStack._stacks.clear()
+        UndoStack.push(self.user, [(1, 2), (2, 1)])
+
+        for name, value in (("get_last_pom_id", 2), ("get_users_with_poms_after", set())):
+            patcher = mock.patch.object(Storage, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        ActionTotals.clear()
+        UndoStack._stacks.clear()
+
+    async def test_snapshots_restore_the_saved_state(self):
+        """Test a restarted bot gets back the totals and undo stacks it saved."""
+        await Snapshot.save(self.path)
+        ActionTotals.clear()
+        UndoStack._stacks.clear()
+
+        with mock.patch.object(Storage, "get_last_action_id", return_value=50):
+            self.assertTrue(await Snapshot.load(self.path))
+
+        self.assertEqual(42, ActionTotals._watermark)
+        self.assertEqual({("Knights", "defend"): (3, 700)}, ActionTotals._settled)
+        self.assertEqual([(1, 2), (2, 1)], UndoStack.pop(self.user))
+
+    async def test_stacks_of_users_who_added_poms_since_are_dropped(self):
+        """Test a user who added poms after the snapshot gets no undo stack
+        back, since it no longer ends with their latest poms.
+        """
+        await Snapshot.save(self.path)
+        UndoStack._stacks.clear()
+
+        with mock.patch.object(Storage, "get_last_action_id", return_value=50), \
+             mock.patch.object(Storage, "get_users_with_poms_after",
+                               return_value={self.user.id}) as get_users:
+            self.assertTrue(await Snapshot.load(self.path))
+
+        get_users.assert_awaited_once_with(2)
+        self.assertIsNone(UndoStack.pop(self.user))
+
+    async def test_snapshots_past_the_last_action_keep_no_totals(self):
+        """Test the totals are not restored once the actions table has been
+        emptied since the snapshot.
+        """
+        await Snapshot.save(self.path)
+        ActionTotals.clear()
+
+        with mock.patch.object(Storage, "get_last_action_id", return_value=10):
+            await Snapshot.load(self.path)
+
+        self.assertEqual(0, ActionTotals._watermark)
+
+    async def test_unreadable_snapshots_are_ignored(self):
+        """Test a snapshot of another version or a damaged one restores
+        nothing.
+        """
+        await Snapshot.save(self.path)
+        data = self.path.read_bytes()
+
+        self.path.write_bytes(data[:4] + b"\xff\xff" + data[6:])
+        self.assertFalse(await Snapshot.load(self.path))
+
+        self.path.write_bytes(data[:-5])
+        self.assertFalse(await Snapshot.load(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import gc
+import unittest
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.lib.startup import Startup
+
+
+class TestStartup(IsolatedAsyncioTestCase):
+    """Test running startup phases which depend on each other."""
+    def setUp(self):
+        Startup._phases.clear()  # pylint: disable=protected-access
+        Startup._running.clear()  # pylint: disable=protected-access
+        Startup.durations.clear()
+
+    async def test_phases_wait_for_the_phases_they_depend_on(self):
+        """Test a phase waiting for another, before it even started, runs
+        after it, while independent phases run concurrently.
+        """
+        order = []
+
+        async def _phase(name: str, depends_on: str = None):
+            if depends_on:
+                await Startup.wait_for(depends_on)
+
+            order.append(f"{name} started")
+            await asyncio.sleep(0)
+            order.append(f"{name} finished")
+
+        await asyncio.gather(
+            Startup.run("caches", _phase("caches", depends_on="database")),
+            Startup.run("database", _phase("database")),
+            Startup.run("channels", _phase("channels")),
+        )
+
+        self.assertLess(order.index("database finished"), order.index("caches started"))
+        self.assertLess(order.index("channels started"), order.index("database finished"))
+        self.assertEqual({"caches", "database", "channels"}, set(Startup.durations))
+
+    async def test_waiting_for_a_failed_phase_fails(self):
+        """Test the error of a phase is raised by the phases waiting for it."""
+        async def _fail():
+            raise RuntimeError("no database")
+
+        waiter = asyncio.create_task(Startup.wait_for("database"))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(RuntimeError):
+            await Startup.run("database", _fail())
+
+        with self.assertRaises(RuntimeError):
+            await waiter
+
+    async def test_phases_run_once_unless_repeated(self):
+        """Test running a phase again, as on a reconnect, returns its first
+        result, unless it repeats or failed.
+        """
+        work = mock.AsyncMock(side_effect=[RuntimeError("no database"), 1, 2, 3])
+
+        with self.assertRaises(RuntimeError):
+            await Startup.run("database", work())
+
+        self.assertEqual(1, await Startup.run("database", work()))
+        self.assertEqual(1, await Startup.run("database", work()))
+        self.assertEqual(2, await Startup.run("scoreboard", work(), repeat=True))
+        self.assertEqual(3, await Startup.run("scoreboard", work(), repeat=True))
+        self.assertEqual(4, work.await_count)
+
+    async def test_waiting_after_a_failure_waits_for_the_next_run(self):
+        """Test a phase which failed before anyone waited neither logs its
+        error as never retrieved nor fails those waiting for its next run.
+        """
+        async def _fail():
+            raise RuntimeError("no database")
+
+        with self.assertRaises(RuntimeError):
+            await Startup.run("database", _fail())
+
+        exception_handler = mock.Mock()
+        asyncio.get_running_loop().set_exception_handler(exception_handler)
+        gc.collect()
+        exception_handler.assert_not_called()
+
+        waiter = asyncio.create_task(Startup.wait_for("database"))
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+
+        await Startup.run("database", asyncio.sleep(0))
+        await waiter
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+from datetime import timedelta
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.config import Config
+from pombot.lib.storage import Storage
+from pombot.lib.throttling import PomCoalescer, RateLimiter
+from tests.helpers import mock_discord
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test the per-user command rate limits."""
+    def setUp(self) -> None:
+        """Start every test with no buckets."""
+        RateLimiter._buckets = {}  # pylint: disable=protected-access
+
+    def test_burst_is_limited_per_user_and_command(self):
+        """Test a user can use up their burst, then is limited and notified
+        exactly once, without affecting other users or commands.
+        """
+        spammer, bystander = mock_discord.MockMember(), mock_discord.MockMember()
+        burst, _ = Config.COMMAND_RATE_LIMITS["attack"]
+
+        allowed = [RateLimiter.try_acquire(spammer, "attack") for _ in range(burst + 2)]
+
+        self.assertEqual([True] * burst + [False] * 2, allowed)
+        self.assertTrue(RateLimiter.should_notify(spammer, "attack"))
+        self.assertFalse(RateLimiter.should_notify(spammer, "attack"))
+        self.assertTrue(RateLimiter.try_acquire(bystander, "attack"))
+        self.assertTrue(RateLimiter.try_acquire(spammer, "poms"))
+
+
+class TestPomCoalescer(IsolatedAsyncioTestCase):
+    """Test merging of rapidly repeated !pom commands."""
+    async def test_rapid_poms_are_written_once(self):
+        """Test poms with the same user and description share one write."""
+        user, other_user = mock_discord.MockMember(), mock_discord.MockMember()
+
+        with mock.patch.object(Storage, "add_poms_to_user_session") as add_poms, \
+                mock.patch.object(Config, "POM_COALESCE_WINDOW", timedelta(milliseconds=20)):
+            await asyncio.gather(
+                PomCoalescer.add_poms_to_user_session(user, "hello", 1),
+                PomCoalescer.add_poms_to_user_session(user, "hello", 3),
+                PomCoalescer.add_poms_to_user_session(user, "world", 1),
+                PomCoalescer.add_poms_to_user_session(other_user, "hello", 1),
+            )
+
+        self.assertCountEqual([
+            mock.call(user, "hello", 4),
+            mock.call(user, "world", 1),
+            mock.call(other_user, "hello", 1),
+        ], add_poms.await_args_list)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import asyncio
+import unittest
+from unittest import mock
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from pombot.config import Config
+from pombot.lib.user_cache import UserCache
+
+USER_ID = 1234
+
+
+class TestUserCache(IsolatedAsyncioTestCase):
+    """Test the per-user read-through cache."""
+    def setUp(self):
+        UserCache.clear()
+
+    async def test_values_are_loaded_once_until_the_user_writes(self):
+        """Test a cached value is only loaded again after a write."""
+        load = mock.AsyncMock(return_value="value")
+
+        for _ in range(3):
+            self.assertEqual("value", await UserCache.get(USER_ID, "key", load))
+
+        UserCache.bump(USER_ID + 1)
+        await UserCache.get(USER_ID, "key", load)
+        self.assertEqual(1, load.await_count)
+
+        UserCache.bump(USER_ID)
+        await UserCache.get(USER_ID, "key", load)
+        self.assertEqual(2, load.await_count)
+
+    async def test_values_loaded_during_a_write_are_not_cached(self):
+        """Test a value loaded while its user wrote is loaded again next
+        time.
+        """
+        async def load_while_writing():
+            UserCache.bump(USER_ID)
+            await asyncio.sleep(0)
+            return "stale"
+
+        await UserCache.get(USER_ID, "key", load_while_writing)
+        self.assertEqual("fresh", await UserCache.get(USER_ID, "key",
+                                                      mock.AsyncMock(return_value="fresh")))
+
+    async def test_least_recently_used_users_are_evicted(self):
+        """Test users are evicted once their values exceed the size cap."""
+        load = mock.AsyncMock(return_value="value")
+
+        with mock.patch.object(Config, "USER_CACHE_SIZE", 10):
+            for user_id in range(3):
+                await UserCache.get(user_id, "key", load, size=lambda _: 5)
+
+            await UserCache.get(1, "key", load, size=lambda _: 5)
+            await UserCache.get(2, "key", load, size=lambda _: 5)
+            self.assertEqual(3, load.await_count)
+
+            await UserCache.get(0, "key", load, size=lambda _: 5)
+            self.assertEqual(4, load.await_count)
+
+
+if __name__ == "__main__":
+    unittest.main()